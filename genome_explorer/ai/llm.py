@@ -0,0 +1,213 @@
+"""Streaming chat backends for the genomics assistant."""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    cast,
+)
+
+from genome_explorer.core import config
+
+Message = Dict[str, str]
+
+SYSTEM_PROMPT = (
+    "You are Genome AI, a patient genomics tutor. Answer clearly and "
+    "concisely, and prefer the reference passages when they are relevant."
+)
+
+class ChatBackend(Protocol):
+    """Anything that can stream a chat completion token by token."""
+
+    def stream(
+        self, messages: List[Message], max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        ...
+
+class OpenAIBackend:
+    """Chat completions from the OpenAI API or a compatible server.
+
+    ``base_url`` (or ``AppConfig.openai_base_url``) can point at a local
+    OpenAI-compatible stub for testing.
+    """
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> None:
+        import openai  # noqa: F401 - fail early when the client is missing
+
+        self.model = model or config.openai_model
+        self.base_url = (
+            base_url or config.openai_base_url or os.environ.get("OPENAI_BASE_URL")
+        )
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not self.api_key and not self.base_url:
+            raise ValueError("OPENAI_API_KEY is not set")
+
+    async def stream(
+        self, messages: List[Message], max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        from openai import AsyncOpenAI
+
+        # A client per call: its connection pool belongs to this event loop
+        async with AsyncOpenAI(
+            api_key=self.api_key or "local", base_url=self.base_url
+        ) as client:
+            response = await client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+            )
+            async for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+class TemplateBackend:
+    """Offline backend that streams a locally composed answer word by word."""
+
+    def __init__(self, respond: Callable[[List[Message]], str]) -> None:
+        self.respond = respond
+
+    async def stream(
+        self, messages: List[Message], max_tokens: int, temperature: float
+    ) -> AsyncIterator[str]:
+        for word in self.respond(messages).split(" ")[:max_tokens]:
+            yield word + " "
+            await asyncio.sleep(0)
+
+_DONE = object()
+
+class ResponseStream:
+    """Runs a backend's async stream on a worker thread.
+
+    Tokens are handed to the Streamlit script thread through a queue, so
+    the page can render them as they arrive (e.g. with ``st.write_stream``)
+    and ``cancel()`` stops generation when a newer question supersedes it.
+    """
+
+    def __init__(
+        self,
+        backend: ChatBackend,
+        messages: List[Message],
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+    ) -> None:
+        self.backend = backend
+        self.messages = messages
+        self.max_tokens = max_tokens or config.max_tokens
+        self.temperature = config.temperature if temperature is None else temperature
+        self.started = time.perf_counter()
+        self.first_token_seconds: Optional[float] = None
+        self.cancelled = False
+        self.error: Optional[Exception] = None
+        self._parts: List[str] = []
+        self._queue: "queue.Queue[object]" = queue.Queue()
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            self._task = loop.create_task(self._produce())
+            loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+            # Set before the sentinel, so a consumer that has seen the end
+            # of the stream also sees ``done``
+            self._finished.set()
+            self._queue.put(_DONE)
+
+    async def _produce(self) -> None:
+        try:
+            async for token in self.backend.stream(
+                self.messages, self.max_tokens, self.temperature
+            ):
+                if self._cancel.is_set():
+                    break
+                self._queue.put(token)
+        except Exception as e:
+            self.error = e
+            self._queue.put(e)
+
+    def cancel(self) -> None:
+        """Stop generating; tokens already produced are kept."""
+        self.cancelled = True
+        self._cancel.set()
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # loop already closed
+
+    @property
+    def done(self) -> bool:
+        return self._finished.is_set()
+
+    @property
+    def completed(self) -> bool:
+        """Finished on its own: neither cancelled nor failed."""
+        return self.done and not self.cancelled and self.error is None
+
+    @property
+    def text(self) -> str:
+        """Everything produced so far, including tokens not yet iterated."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                self._queue.put(_DONE)
+                break
+            if isinstance(item, str):
+                self._parts.append(item)
+        return "".join(self._parts)
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            # Anything other than the sentinel or an error is a token
+            token = cast(str, item)
+            if self.first_token_seconds is None:
+                self.first_token_seconds = time.perf_counter() - self.started
+            self._parts.append(token)
+            yield token
+
+def build_messages(
+    query: str, context: List[str], history: Optional[List[Message]] = None
+) -> List[Message]:
+    """System prompt with retrieved passages, prior turns, then the question."""
+    system = SYSTEM_PROMPT
+    if context:
+        system += "\n\nReference passages:\n\n" + "\n\n".join(context)
+    return [
+        {"role": "system", "content": system},
+        *(history or []),
+        {"role": "user", "content": query},
+    ]
@@ -0,0 +1,152 @@
+"""Bounded chat memory with token budgeting and rolling summaries."""
+
+import re
+from collections.abc import Sequence
+from typing import Callable, List, Optional, Tuple, Union
+
+from genome_explorer.core import config
+
+ChatMessage = Tuple[str, str, str]
+Summarizer = Callable[[str, List[ChatMessage]], str]
+
+# Rough characters-per-token ratio when tiktoken is unavailable
+CHARS_PER_TOKEN = 4
+# Messages kept verbatim for rendering; older ones survive only in the summary
+MAX_MESSAGES = 200
+# Recent messages never folded into the summary
+KEEP_RECENT = 4
+# Longest excerpt of one message carried into the extractive summary
+SUMMARY_EXCERPT = 160
+
+def _load_tokenizer() -> Optional[Callable[[str], int]]:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        encoding = tiktoken.encoding_for_model(config.openai_model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text))
+
+_tokenizer = _load_tokenizer()
+
+def count_tokens(text: str) -> int:
+    """Tokens in ``text`` (exact with tiktoken, estimated otherwise)."""
+    if _tokenizer is not None:
+        return _tokenizer(text)
+    return max(1, -(-len(text) // CHARS_PER_TOKEN))
+
+def extractive_summary(summary: str, messages: List[ChatMessage]) -> str:
+    """Append the first sentence of each folded message to the summary."""
+    lines = [summary] if summary else []
+    for role, content, _ in messages:
+        first = re.split(r"(?<=[.!?])\s", content.strip(), maxsplit=1)[0]
+        if len(first) > SUMMARY_EXCERPT:
+            first = first[: SUMMARY_EXCERPT - 1] + "…"
+        lines.append(f"{'User' if role == 'user' else 'Assistant'}: {first}")
+    return "\n".join(lines)
+
+class ConversationMemory(Sequence):
+    """Chat history whose prompt context stays within a token budget.
+
+    Token counts are computed once per message as it is appended, so the
+    context size is a running total rather than a re-count of the whole
+    conversation. When the unsummarized turns plus the summary exceed
+    ``max_tokens``, the oldest turns are folded into the summary by
+    ``summarizer``, and the summary itself is trimmed to half the budget.
+    It behaves as a sequence of ``(role, content, timestamp)`` tuples.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_messages: int = MAX_MESSAGES,
+        keep_recent: int = KEEP_RECENT,
+        summarizer: Summarizer = extractive_summary,
+    ) -> None:
+        self.max_tokens = max_tokens or config.max_tokens
+        self.max_messages = max_messages
+        self.keep_recent = keep_recent
+        self.summarizer = summarizer
+        self.summary = ""
+        self.summary_tokens = 0
+        self._messages: List[ChatMessage] = []
+        self._tokens: List[int] = []
+        # Index of the first message not yet folded into the summary
+        self._unfolded = 0
+        self._unfolded_tokens = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[ChatMessage, List[ChatMessage]]:
+        return self._messages[index]
+
+    @property
+    def context_tokens(self) -> int:
+        """Tokens the summary and unsummarized turns add to a prompt."""
+        return self.summary_tokens + self._unfolded_tokens
+
+    def append(self, role: str, content: str, timestamp: str = "now") -> None:
+        """Add a message, folding old turns if the budget is exceeded."""
+        tokens = count_tokens(content)
+        self._messages.append((role, content, timestamp))
+        self._tokens.append(tokens)
+        self._unfolded_tokens += tokens
+        self._fold()
+
+        # Only messages already folded into the summary are dropped
+        excess = min(len(self._messages) - self.max_messages, self._unfolded)
+        if excess > 0:
+            del self._messages[:excess]
+            del self._tokens[:excess]
+            self._unfolded -= excess
+            self.dropped += excess
+
+    def _fold(self) -> None:
+        last_foldable = len(self._messages) - self.keep_recent
+        # The summary grows as turns fold in, so repeat until within budget
+        while self.context_tokens > self.max_tokens and self._unfolded < last_foldable:
+            end = self._unfolded
+            tokens = self.context_tokens
+            while end < last_foldable and tokens > self.max_tokens:
+                tokens -= self._tokens[end]
+                end += 1
+            folded = self._messages[self._unfolded : end]
+            self._unfolded_tokens -= sum(self._tokens[self._unfolded : end])
+            self._unfolded = end
+            self.summary = self._trim_summary(self.summarizer(self.summary, folded))
+            self.summary_tokens = count_tokens(self.summary) if self.summary else 0
+
+    def _trim_summary(self, summary: str) -> str:
+        budget = self.max_tokens // 2
+        lines = summary.split("\n")
+        while len(lines) > 1 and count_tokens("\n".join(lines)) > budget:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def prompt_messages(self) -> List[dict]:
+        """OpenAI-style messages: the summary, then unsummarized turns."""
+        messages = []
+        if self.summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Summary of the earlier conversation:\n{self.summary}",
+                }
+            )
+        for role, content, _ in self._messages[self._unfolded :]:
+            messages.append({"role": role, "content": content})
+        return messages
+
+    def page(self, number: int, page_size: int) -> List[ChatMessage]:
+        """Messages on one page, counting back from the newest (page 0)."""
+        end = len(self._messages) - number * page_size
+        return self._messages[max(0, end - page_size) : max(0, end)]
+
+    def num_pages(self, page_size: int) -> int:
+        return max(1, -(-len(self._messages) // page_size))
@@ -1,9 +1,32 @@
 """AI-powered genomics assistant page."""
 
 import streamlit as st
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-from genome_explorer.core import get_state, set_state
+from genome_explorer.ai.llm import (
+    ChatBackend,
+    OpenAIBackend,
+    ResponseStream,
+    TemplateBackend,
+    build_messages,
+)
+from genome_explorer.ai.memory import ConversationMemory
+from genome_explorer.ai.response_cache import ResponseCache
+from genome_explorer.ai.retrieval import (
+    EmbeddingIndex,
+    documents_from_modules,
+    load_encoder,
+    load_or_build_embedding_index,
+    load_reference_documents,
+)
+from genome_explorer.core import config, get_state, profiled, registry, set_state
+from genome_explorer.education.pages.learning_hub import SAMPLE_MODULES
+
+# Passages below this cosine similarity are not shown as context
+MIN_SIMILARITY = 0.2
+
+# Chat messages rendered per history page
+PAGE_SIZE = 20
 
 def render_chat_message(
     message: Tuple[str, str, str]
@@ -19,18 +42,156 @@ def render_chat_message(
         st.markdown(content)
     st.markdown("---")
 
+@st.cache_resource(show_spinner="Indexing reference material...")
+def get_retrieval_index() -> Optional[EmbeddingIndex]:
+    """Embedding index over the learning modules and reference text."""
+    documents = documents_from_modules(SAMPLE_MODULES) + load_reference_documents()
+    try:
+        return load_or_build_embedding_index(documents, load_encoder())
+    except ImportError:
+        return None
+
+@st.cache_resource
+def get_response_cache() -> ResponseCache:
+    """Answer cache shared by every session."""
+    try:
+        encoder = load_encoder()
+    except ImportError:
+        encoder = None
+    return ResponseCache(encoder)
+
+def retrieve_context(query: str, k: int = 3) -> List[Tuple[str, str]]:
+    """(title, passage) pairs relevant to a query."""
+    index = get_retrieval_index()
+    if index is None:
+        return []
+    return [
+        (doc.title, doc.text)
+        for doc, score in index.search(query, load_encoder(), k)
+        if score >= MIN_SIMILARITY
+    ]
+
+def compose_local_answer(query: str, context: List[Tuple[str, str]]) -> str:
+    """Offline answer built from the retrieved passages."""
+    if not context:
+        return f"Here's what I know about {query}..."
+    passages = "\n\n".join(f"**{title}**: {text}" for title, text in context)
+    return f"Here's what I know about {query}:\n\n{passages}"
+
+def get_chat_backend(query: str, context: List[Tuple[str, str]]) -> ChatBackend:
+    """Configured LLM backend, falling back to the offline answer."""
+    if config.llm_backend == "openai":
+        try:
+            return OpenAIBackend()
+        except (ImportError, ValueError):
+            pass
+    return TemplateBackend(lambda messages: compose_local_answer(query, context))
+
+def get_conversation() -> ConversationMemory:
+    """This session's chat memory, upgrading a plain message list."""
+    history = get_state("chat_history")
+    if not isinstance(history, ConversationMemory):
+        memory = ConversationMemory()
+        for role, content, timestamp in history or []:
+            memory.append(role, content, timestamp)
+        set_state("chat_history", memory)
+        history = memory
+    return history
+
+def stream_ai_response(query: str) -> ResponseStream:
+    """Start generating an answer; iterate the result for tokens."""
+    # Answers to follow-ups depend on the conversation, so only opening
+    # questions are shared through the cache
+    history = get_conversation().prompt_messages()
+    cached = get_response_cache().get(query)[0] if not history else None
+    if cached is not None:
+        # Replay the stored answer through the same streaming path
+        set_state("active_response_cacheable", False)
+        return ResponseStream(TemplateBackend(lambda messages: cached), [])
+    
+    context = retrieve_context(query)
+    messages = build_messages(
+        query,
+        [f"{title}: {text}" for title, text in context],
+        history=history,
+    )
+    backend = get_chat_backend(query, context)
+    # Offline fallback answers must not outlive a configured API key
+    set_state(
+        "active_response_cacheable",
+        not history and not isinstance(backend, TemplateBackend),
+    )
+    return ResponseStream(backend, messages)
+
 def get_ai_response(query: str) -> str:
     """Get AI response for genomics query."""
-    # TODO: Implement AI response generation
-    return f"Here's what I know about {query}..."
+    return "".join(stream_ai_response(query))
+
+def finish_active_response() -> None:
+    """Record the streaming answer, cancelling it if still running."""
+    stream = get_state("active_response")
+    if stream is None:
+        return
+    if not stream.done:
+        stream.cancel()
+    set_state("active_response", None)
+    
+    text = stream.text
+    if stream.error is not None and stream.messages:
+        # Answer offline rather than leave the question unanswered
+        query = stream.messages[-1]["content"]
+        text = compose_local_answer(query, retrieve_context(query))
+    elif stream.cancelled:
+        text += " …"
+    elif stream.completed and text.strip() and get_state("active_response_cacheable"):
+        get_response_cache().put(stream.messages[-1]["content"], text.rstrip())
+    get_conversation().append("assistant", text, "now")
 
 def render_chat_history() -> None:
-    """Render chat history."""
-    chat_history = get_state("chat_history", [])
+    """Render one page of chat history, newest page first."""
+    memory = get_conversation()
     
-    for message in chat_history:
+    page = 0
+    num_pages = memory.num_pages(PAGE_SIZE)
+    if num_pages > 1:
+        page = st.number_input(
+            f"History page (0 = latest of {num_pages})",
+            min_value=0,
+            max_value=num_pages - 1,
+            value=0,
+            step=1,
+        )
+    if memory.dropped and page == num_pages - 1:
+        st.caption(f"{memory.dropped} earlier messages are kept only as a summary.")
+    
+    for message in memory.page(page, PAGE_SIZE):
         render_chat_message(message)
 
+def render_model_stats() -> None:
+    """Render shared model and answer cache statistics."""
+    answers = get_response_cache().stats()
+    with st.sidebar.expander("Answer Cache"):
+        hit_rate = answers["hit_rate"]
+        st.metric("Hit rate", f"{hit_rate:.0%}" if hit_rate is not None else "n/a")
+        st.caption(
+            f"{answers['entries']} answers, {answers['exact_hits']} exact and "
+            f"{answers['semantic_hits']} similar-question hits, "
+            f"{answers['misses']} misses"
+        )
+    
+    stats = registry.stats()
+    with st.sidebar.expander("Model Cache"):
+        hit_rate = stats["hit_rate"]
+        st.metric("Hit rate", f"{hit_rate:.0%}" if hit_rate is not None else "n/a")
+        st.metric("Memory", f"{stats['total_size'] / 1e6:,.0f} MB")
+        for key, entry in stats["resources"].items():
+            status = "loaded" if entry["loaded"] else "evicted"
+            st.caption(
+                f"{key}: {status}, {entry['hits']} hits, "
+                f"{entry['misses']} loads ({entry['load_seconds']:.1f}s)"
+            )
+
+@profiled
 def render() -> None:
     """Render the AI assistant page."""
     st.title("Genomics AI Assistant")
@@ -48,16 +209,28 @@ def render() -> None:
         
         # Process input
         if user_input:
-            # Add user message to history
-            chat_history = get_state("chat_history", [])
-            chat_history.append(("user", user_input, "now"))
+            # A new question supersedes an answer that is still streaming
+            finish_active_response()
             
-            # Get AI response
-            response = get_ai_response(user_input)
-            chat_history.append(("assistant", response, "now"))
-            
-            # Update state
-            set_state("chat_history", chat_history)
+            # Stream the AI response as tokens arrive; the prompt carries
+            # earlier turns, so the question joins the history afterwards
+            stream = stream_ai_response(user_input)
+            get_conversation().append("user", user_input, "now")
+            set_state("active_response", stream)
+            placeholder = st.empty()
+            try:
+                with placeholder.container():
+                    render_chat_message(("user", user_input, "now"))
+                    st.markdown("**🧬 Genome AI** (now)")
+                    st.write_stream(stream)
+            except Exception as e:
+                st.error(
+                    f"The assistant backend failed ({type(e).__name__}: {e}); "
+                    "showing an offline answer instead."
+                )
+            finally:
+                placeholder.empty()
+                finish_active_response()
             
             # Clear input
             st.session_state.user_query = ""
@@ -67,4 +240,6 @@ def render() -> None:
     
     # Clear chat button
     if st.button("Clear Chat"):
-        set_state("chat_history", []) 
\ No newline at end of file
+        set_state("chat_history", [])
+    
+    render_model_stats() 
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Disk-backed semantic cache of assistant answers."""
+
+import json
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from genome_explorer.ai.retrieval import Encoder
+from genome_explorer.core import config
+
+ENTRIES_FILE = "entries.json"
+VECTORS_FILE = "vectors.npy"
+# Seconds between writes of LRU timestamps refreshed by hits
+FLUSH_INTERVAL = 30
+
+@dataclass
+class CachedResponse:
+    """One cached answer."""
+    key: str
+    query: str
+    answer: str
+    created: float
+    last_used: float
+
+def normalize_query(text: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a question."""
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return " ".join(text.split())
+
+class ResponseCache:
+    """Answers keyed on normalized question text and embedding similarity.
+
+    A lookup first tries the exact normalized text, then the most similar
+    cached question if its cosine similarity reaches ``threshold``. Entries
+    expire after ``ttl`` seconds and the least recently used are evicted
+    beyond ``max_entries``. Entries and their unit-normalized vectors are
+    kept in memory and persisted under ``cache_dir/responses``.
+    """
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        threshold: Optional[float] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        self.encoder = encoder
+        self.threshold = (
+            config.response_cache_similarity if threshold is None else threshold
+        )
+        self.ttl = config.cache_ttl if ttl is None else ttl
+        self.max_entries = max_entries or config.response_cache_entries
+        self.directory = Path(cache_dir or config.cache_dir) / "responses"
+        self.counts = {"exact": 0, "semantic": 0, "miss": 0}
+        self._lock = threading.Lock()
+        self._last_flush = time.time()
+        self._entries: List[CachedResponse] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.directory / ENTRIES_FILE) as handle:
+                self._entries = [CachedResponse(**e) for e in json.load(handle)]
+            if (self.directory / VECTORS_FILE).exists():
+                self._vectors = np.load(self.directory / VECTORS_FILE)
+        except (OSError, ValueError, TypeError):
+            self._entries, self._vectors = [], None
+        if self.encoder is None:
+            self._vectors = None
+        elif self._vectors is None or len(self._vectors) != len(self._entries):
+            # Vectors are missing or out of step with the entries; rebuild
+            self._vectors = (
+                np.vstack([self._embed(e.key) for e in self._entries])
+                if self._entries
+                else None
+            )
+        self._keys = {entry.key: i for i, entry in enumerate(self._entries)}
+
+    def _save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f"{ENTRIES_FILE}.tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump([asdict(e) for e in self._entries], handle)
+        if self._vectors is not None:
+            with open(self.directory / f"{VECTORS_FILE}.tmp", "wb") as handle:
+                np.save(handle, self._vectors)
+            (self.directory / f"{VECTORS_FILE}.tmp").replace(
+                self.directory / VECTORS_FILE
+            )
+        else:
+            (self.directory / VECTORS_FILE).unlink(missing_ok=True)
+        tmp_path.replace(self.directory / ENTRIES_FILE)
+        self._last_flush = time.time()
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if self.encoder is None:
+            return None
+        vector = np.asarray(self.encoder([text])[0], dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def _remove(self, indices: List[int]) -> None:
+        drop = set(indices)
+        keep = [i for i in range(len(self._entries)) if i not in drop]
+        self._entries = [self._entries[i] for i in keep]
+        if self._vectors is not None:
+            self._vectors = self._vectors[keep]
+        self._keys = {entry.key: i for i, entry in enumerate(self._entries)}
+
+    def _expire(self, now: float) -> None:
+        expired = [i for i, e in enumerate(self._entries) if now - e.created > self.ttl]
+        if expired:
+            self._remove(expired)
+
+    def get(self, query: str) -> Tuple[Optional[str], str]:
+        """Cached answer and how it matched (``exact``/``semantic``/``miss``)."""
+        key = normalize_query(query)
+        vector = None
+        if key not in self._keys:
+            # Embed outside the lock; only needed when the text misses
+            vector = self._embed(key)
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            index, kind = self._keys.get(key), "exact"
+            if index is None and vector is not None and self._vectors is not None:
+                scores = self._vectors @ vector
+                best = int(np.argmax(scores)) if len(scores) else -1
+                if best >= 0 and scores[best] >= self.threshold:
+                    index, kind = best, "semantic"
+            if index is None:
+                self.counts["miss"] += 1
+                return None, "miss"
+
+            entry = self._entries[index]
+            entry.last_used = now
+            self.counts[kind] += 1
+            if now - self._last_flush > FLUSH_INTERVAL:
+                self._save()
+            return entry.answer, kind
+
+    def put(self, query: str, answer: str) -> None:
+        """Store an answer, evicting least recently used entries if full."""
+        key = normalize_query(query)
+        vector = self._embed(key)
+        now = time.time()
+        with self._lock:
+            if key in self._keys:
+                self._remove([self._keys[key]])
+            self._entries.append(CachedResponse(key, query, answer, now, now))
+            if vector is not None:
+                rows = self._vectors if self._vectors is not None else np.zeros(
+                    (0, len(vector)), dtype=np.float32
+                )
+                self._vectors = np.vstack((rows, vector[None, :]))
+            self._keys[key] = len(self._entries) - 1
+            self._expire(now)
+            if len(self._entries) > self.max_entries:
+                order = np.argsort([e.last_used for e in self._entries], kind="stable")
+                self._remove(order[: len(self._entries) - self.max_entries].tolist())
+            self._save()
+
+    def clear(self) -> None:
+        """Drop every entry, on disk as well."""
+        with self._lock:
+            self._entries, self._vectors, self._keys = [], None, {}
+            self._save()
+
+    def stats(self) -> Dict[str, object]:
+        """Lookup counts and hit rate since this process started."""
+        with self._lock:
+            lookups = sum(self.counts.values())
+            hits = self.counts["exact"] + self.counts["semantic"]
+            return {
+                "entries": len(self._entries),
+                "lookups": lookups,
+                "exact_hits": self.counts["exact"],
+                "semantic_hits": self.counts["semantic"],
+                "misses": self.counts["miss"],
+                "hit_rate": hits / lookups if lookups else None,
+            }
@@ -0,0 +1,221 @@
+"""Embedding retrieval over educational and reference text."""
+
+import hashlib
+import json
+import re
+import shutil
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from genome_explorer.core import EducationModule, config, registry
+
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.npy"
+REFERENCE_SUFFIXES = (".md", ".txt")
+# Reference files are split into passages of roughly this many characters
+PASSAGE_CHARS = 1200
+
+Encoder = Callable[[List[str]], np.ndarray]
+
+@dataclass
+class Document:
+    """A passage that can be retrieved for a question."""
+    id: str
+    title: str
+    text: str
+    source: str
+
+def documents_from_modules(modules: Iterable[EducationModule]) -> List[Document]:
+    """One passage per education module."""
+    return [
+        Document(
+            id=f"module:{m.id}",
+            title=m.title,
+            text=f"{m.title}. {m.description}\n\n{m.content}",
+            source="education",
+        )
+        for m in modules
+    ]
+
+def split_passages(text: str, max_chars: int = PASSAGE_CHARS) -> List[str]:
+    """Group blank-line separated paragraphs into passages."""
+    passages: List[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) > max_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return passages
+
+def load_reference_documents(directory: Optional[Path] = None) -> List[Document]:
+    """Passages from the ``.md``/``.txt`` files under ``data_dir/reference``."""
+    directory = Path(directory or config.data_dir / "reference")
+    if not directory.is_dir():
+        return []
+    documents = []
+    for path in sorted(directory.rglob("*")):
+        if path.suffix not in REFERENCE_SUFFIXES:
+            continue
+        text = path.read_text(encoding="utf-8", errors="replace")
+        for i, passage in enumerate(split_passages(text)):
+            documents.append(
+                Document(
+                    id=f"{path.relative_to(directory)}#{i}",
+                    title=path.stem.replace("_", " ").title(),
+                    text=passage,
+                    source=str(path.relative_to(directory)),
+                )
+            )
+    return documents
+
+def load_encoder(model_name: Optional[str] = None) -> Encoder:
+    """Sentence-transformers encoder from the shared resource registry."""
+    from sentence_transformers import SentenceTransformer
+
+    model_name = model_name or config.embedding_model
+    model = registry.get(
+        f"sentence-transformers:{model_name}",
+        lambda: SentenceTransformer(model_name),
+    )
+
+    def encode(texts: List[str]) -> np.ndarray:
+        return model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+
+    return encode
+
+def corpus_key(documents: List[Document], model_name: str) -> str:
+    """Content hash of a corpus and the model that embeds it."""
+    digest = hashlib.sha256(model_name.encode())
+    for doc in documents:
+        digest.update(b"\0" + doc.id.encode() + b"\0" + doc.text.encode())
+    return digest.hexdigest()[:32]
+
+def embedding_index_dir(key: str, cache_dir: Optional[Path] = None) -> Path:
+    """Directory holding the vectors for one corpus."""
+    safe_key = re.sub(r"[^A-Za-z0-9._-]", "_", key)
+    return Path(cache_dir or config.cache_dir) / "embeddings" / safe_key
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+class EmbeddingIndex:
+    """Unit-normalized document vectors in a memory-mapped float32 matrix.
+
+    Vectors are normalized at build time, so cosine similarity for a whole
+    corpus is one matrix-vector product against the mapped file.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        with open(self.directory / META_FILE) as handle:
+            meta = json.load(handle)
+        self.model_name: str = meta["model"]
+        self.documents = [Document(**doc) for doc in meta["documents"]]
+        self.vectors = np.load(self.directory / VECTORS_FILE, mmap_mode="r")
+
+    @classmethod
+    def open(cls, directory: Path) -> Optional["EmbeddingIndex"]:
+        """Open a built index, or None if it does not exist."""
+        if not (Path(directory) / META_FILE).exists():
+            return None
+        return cls(directory)
+
+    @classmethod
+    def build(
+        cls,
+        documents: List[Document],
+        encoder: Encoder,
+        directory: Path,
+        model_name: str,
+        batch_size: Optional[int] = None,
+    ) -> "EmbeddingIndex":
+        """Embed documents ``batch_size`` at a time into a new index."""
+        batch_size = batch_size or config.batch_size
+        directory = Path(directory)
+        scratch = directory.with_name(f".{directory.name}.{uuid.uuid4().hex}")
+        scratch.mkdir(parents=True)
+
+        vectors = None
+        for offset in range(0, len(documents), batch_size):
+            batch = [doc.text for doc in documents[offset : offset + batch_size]]
+            embedded = _normalize(encoder(batch))
+            if vectors is None:
+                vectors = open_memmap(
+                    scratch / VECTORS_FILE,
+                    mode="w+",
+                    dtype=np.float32,
+                    shape=(len(documents), embedded.shape[1]),
+                )
+            vectors[offset : offset + len(batch)] = embedded
+        if vectors is None:
+            np.save(scratch / VECTORS_FILE, np.zeros((0, 0), dtype=np.float32))
+        else:
+            vectors.flush()
+            del vectors
+
+        with open(scratch / META_FILE, "w") as handle:
+            json.dump(
+                {"model": model_name, "documents": [asdict(d) for d in documents]},
+                handle,
+            )
+        if directory.exists():
+            shutil.rmtree(directory)
+        scratch.rename(directory)
+        return cls(directory)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def search_vectors(
+        self, queries: np.ndarray, k: int = 3
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-``k`` document indices and cosine scores for each query row."""
+        queries = _normalize(np.atleast_2d(queries))
+        k = min(k, len(self))
+        if k == 0:
+            empty = np.zeros((len(queries), 0))
+            return empty.astype(np.int64), empty.astype(np.float32)
+        scores = queries @ self.vectors.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return (
+            np.take_along_axis(top, order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1),
+        )
+
+    def search(
+        self, query: str, encoder: Encoder, k: int = 3
+    ) -> List[Tuple[Document, float]]:
+        """Documents most similar to a question, best first."""
+        indices, scores = self.search_vectors(encoder([query]), k)
+        return [
+            (self.documents[i], float(s)) for i, s in zip(indices[0], scores[0])
+        ]
+
+def load_or_build_embedding_index(
+    documents: List[Document],
+    encoder: Encoder,
+    model_name: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+) -> EmbeddingIndex:
+    """Open the index for this exact corpus, embedding it only once."""
+    model_name = model_name or config.embedding_model
+    directory = embedding_index_dir(corpus_key(documents, model_name), cache_dir)
+    index = EmbeddingIndex.open(directory)
+    if index is None:
+        index = EmbeddingIndex.build(documents, encoder, directory, model_name)
+    return index
@@ -3,13 +3,22 @@
 import streamlit as st
 from typing import Literal
 
+from genome_explorer.core.caching import get_profiler, render_profile, timed
 from genome_explorer.core.config import AppConfig
+from genome_explorer.core.pages import page_registry
 from genome_explorer.core.session import init_session_state
-from genome_explorer.visualization.pages import genome_viewer
-from genome_explorer.ai.pages import ai_assistant
-from genome_explorer.simulation.pages import simulation_lab
-from genome_explorer.reports.pages import genome_reports
-from genome_explorer.education.pages import learning_hub
+
+# Page modules are imported the first time each page is opened, so heavy
+# dependencies (plotly, pandas, transformers/torch) stay off the startup path
+PAGES = {
+    "Visualizer": "genome_explorer.visualization.pages.genome_viewer",
+    "AI Assistant": "genome_explorer.ai.pages.ai_assistant",
+    "Simulation Lab": "genome_explorer.simulation.pages.simulation_lab",
+    "Reports": "genome_explorer.reports.pages.genome_reports",
+    "Learning": "genome_explorer.education.pages.learning_hub",
+}
+for page_name, module_path in PAGES.items():
+    page_registry.register(page_name, module_path)
 
 # App configuration
 st.set_page_config(
@@ -29,27 +38,34 @@ def render_sidebar() -> Literal["Visualizer", "AI Assistant", "Simulation Lab",
     
     return st.sidebar.radio(
         "Navigation",
-        options=["Visualizer", "AI Assistant", "Simulation Lab", "Reports", "Learning"],
+        options=list(PAGES),
         index=0,
     )
 
+def render_page_metrics() -> None:
+    """Render import times of the pages loaded in this process."""
+    with st.sidebar.expander("Page Load Times"):
+        for row in page_registry.metrics():
+            if row["loaded"]:
+                st.text(f"{row['import_seconds'] * 1000:8.1f} ms  {row['page']}")
+            else:
+                st.text(f"{'not loaded':>11}  {row['page']}")
+
 def main():
     """Main application entry point."""
+    get_profiler().begin()
+    
     # Navigation
     page = render_sidebar()
     
-    # Page routing
-    if page == "Visualizer":
-        genome_viewer.render()
-    elif page == "AI Assistant":
-        ai_assistant.render()
-    elif page == "Simulation Lab":
-        simulation_lab.render()
-    elif page == "Reports":
-        genome_reports.render()
-    else:
-        learning_hub.render()
+    # Page routing; the first visit to a page imports its module
+    with timed(f"import {page}", "import"):
+        page_registry.load(page)
+    page_registry.render(page)
 
+    render_profile()
+    render_page_metrics()
+    
     # Footer
     st.sidebar.markdown("---")
     st.sidebar.markdown(
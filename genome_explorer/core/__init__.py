@@ -1,6 +1,7 @@
 """Core functionality for Genome Explorer AI."""
 
 from genome_explorer.core.config import AppConfig, config
+from genome_explorer.core.resources import ResourceRegistry, registry
 from genome_explorer.core.session import (
     init_session_state,
     get_state,
@@ -15,6 +16,7 @@ from genome_explorer.core.types import (
     GenomeFeature,
     MutationEvent,
     SimulationState,
+    SimulationParams,
     EducationModule,
     ChromosomeID,
     Position,
@@ -22,10 +24,80 @@ from genome_explorer.core.types import (
     GenomeCoordinate,
     FeatureMap,
 )
+from genome_explorer.core.caching import (
+    Memoized,
+    RerunProfiler,
+    get_profiler,
+    hash_value,
+    memoize,
+    profiled,
+    render_profile,
+    timed,
+)
+from genome_explorer.core.pages import PageRegistry, page_registry
+from genome_explorer.core.datasets import (
+    DatasetLease,
+    DatasetStore,
+    dataset_store,
+)
+from genome_explorer.core.jobs import (
+    Job,
+    JobCancelled,
+    JobContext,
+    JobManager,
+    JobStatus,
+    collect_job,
+    job_manager,
+    poll_jobs,
+)
+from genome_explorer.core.bam import (
+    AlignmentRecord,
+    BamReader,
+    BlockCache,
+)
+from genome_explorer.core.intervals import (
+    IntervalIndex,
+    interval_index_dir,
+    load_or_build_index,
+)
+from genome_explorer.core.regions import RegionSet
+from genome_explorer.core.seqstats import (
+    WindowStats,
+    genome_window_stats,
+    kmer_label,
+    kmer_spectrum,
+)
+from genome_explorer.core.parsers import (
+    HashingReader,
+    SequenceRecord,
+    SequenceStats,
+    detect_format,
+    file_digest,
+    parse_fasta,
+    parse_fastq,
+    scan_fasta,
+    scan_fastq,
+    summarize_contigs,
+)
+from genome_explorer.core.twobit import (
+    TwoBitGenome,
+    TwoBitWriter,
+    open_packed_genome,
+    pack_fasta,
+    packed_genome_dir,
+)
+from genome_explorer.core.vcf import (
+    VariantTable,
+    load_vcf,
+    parse_vcf,
+    variant_table_dir,
+)
 
 __all__ = [
     "AppConfig",
     "config",
+    "ResourceRegistry",
+    "registry",
     "init_session_state",
     "get_state",
     "set_state",
@@ -37,10 +109,62 @@ __all__ = [
     "GenomeFeature",
     "MutationEvent",
     "SimulationState",
+    "SimulationParams",
     "EducationModule",
     "ChromosomeID",
     "Position",
     "Sequence",
     "GenomeCoordinate",
     "FeatureMap",
+    "Memoized",
+    "RerunProfiler",
+    "get_profiler",
+    "hash_value",
+    "memoize",
+    "profiled",
+    "render_profile",
+    "timed",
+    "PageRegistry",
+    "page_registry",
+    "DatasetLease",
+    "DatasetStore",
+    "dataset_store",
+    "Job",
+    "JobCancelled",
+    "JobContext",
+    "JobManager",
+    "JobStatus",
+    "collect_job",
+    "job_manager",
+    "poll_jobs",
+    "AlignmentRecord",
+    "BamReader",
+    "BlockCache",
+    "IntervalIndex",
+    "interval_index_dir",
+    "load_or_build_index",
+    "RegionSet",
+    "WindowStats",
+    "genome_window_stats",
+    "kmer_label",
+    "kmer_spectrum",
+    "HashingReader",
+    "SequenceRecord",
+    "SequenceStats",
+    "detect_format",
+    "file_digest",
+    "parse_fasta",
+    "parse_fastq",
+    "scan_fasta",
+    "scan_fastq",
+    "summarize_contigs",
+    "TwoBitGenome",
+    "TwoBitWriter",
+    "open_packed_genome",
+    "pack_fasta",
+    "packed_genome_dir",
+    "VariantTable",
+    "load_vcf",
+    "parse_vcf",
+    "variant_table_dir",
 ]
@@ -0,0 +1,444 @@
+"""Indexed random access to BAM alignments over BGZF blocks."""
+
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from genome_explorer.core.config import config
+from genome_explorer.core.types import GenomeRegion
+
+BGZF_MAGIC = b"\x1f\x8b\x08\x04"
+BGZF_HEADER_SIZE = 12
+
+# BAI is CSI with a fixed 16 kbp finest bin and six levels
+BAI_MIN_SHIFT = 14
+BAI_DEPTH = 5
+
+# CIGAR operations that consume reference bases: M, D, N, =, X
+REFERENCE_OPS = np.array([1, 0, 1, 1, 0, 0, 0, 1, 1], dtype=bool)
+# CIGAR operations that are aligned bases: M, =, X
+ALIGNED_OPS = np.array([1, 0, 0, 0, 0, 0, 0, 1, 1], dtype=bool)
+CIGAR_OPS = "MIDNSHP=X"
+FLAG_UNMAPPED = 0x4
+
+ALIGNMENT_HEADER = struct.Struct("<iiBBHHHiiii")
+SPAN_BATCH = 100_000
+
+@dataclass
+class AlignmentRecord:
+    """A single aligned read (0-based, half-open reference span)."""
+    reference: str
+    start: int
+    end: int
+    name: str
+    flag: int
+    mapq: int
+    cigar: np.ndarray
+
+    @property
+    def cigar_string(self) -> str:
+        """CIGAR in SAM text form."""
+        return "".join(f"{op >> 4}{CIGAR_OPS[op & 0xF]}" for op in self.cigar)
+
+class BlockCache:
+    """Thread-safe LRU of decompressed BGZF blocks, bounded in bytes."""
+
+    def __init__(self, max_bytes: Optional[int] = None) -> None:
+        self.max_bytes = config.bam_cache_bytes if max_bytes is None else max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._blocks: "OrderedDict[Tuple[str, int], Tuple[bytes, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int]) -> Optional[Tuple[bytes, int]]:
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is None:
+                self.misses += 1
+                return None
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return block
+
+    def put(self, key: Tuple[str, int], block: Tuple[bytes, int]) -> None:
+        with self._lock:
+            if key in self._blocks:
+                return
+            self._blocks[key] = block
+            self.size += len(block[0])
+            while self.size > self.max_bytes and len(self._blocks) > 1:
+                _, (data, _) = self._blocks.popitem(last=False)
+                self.size -= len(data)
+
+def read_bgzf_block(handle: BinaryIO, coffset: int) -> Tuple[bytes, int]:
+    """Decompress the BGZF block at ``coffset``; returns (data, next offset)."""
+    handle.seek(coffset)
+    header = handle.read(BGZF_HEADER_SIZE)
+    if len(header) < BGZF_HEADER_SIZE:
+        return b"", coffset
+    if header[:4] != BGZF_MAGIC:
+        raise ValueError(f"Not a BGZF block at offset {coffset}")
+    extra_len = struct.unpack_from("<H", header, 10)[0]
+    extra = handle.read(extra_len)
+
+    block_size = None
+    pos = 0
+    while pos + 4 <= len(extra):
+        si1, si2, sub_len = extra[pos], extra[pos + 1], struct.unpack_from("<H", extra, pos + 2)[0]
+        if si1 == 66 and si2 == 67:
+            block_size = struct.unpack_from("<H", extra, pos + 4)[0] + 1
+        pos += 4 + sub_len
+    if block_size is None:
+        raise ValueError(f"BGZF block at offset {coffset} lacks a BC subfield")
+
+    payload = handle.read(block_size - BGZF_HEADER_SIZE - extra_len)
+    data = zlib.decompress(payload[:-8], wbits=-15)
+    return data, coffset + block_size
+
+class BgzfReader:
+    """Seekable reader over BGZF virtual offsets, backed by a block cache."""
+
+    def __init__(self, path: Path, cache: Optional[BlockCache] = None) -> None:
+        self.path = Path(path)
+        self.cache = cache or BlockCache()
+        self._handle = open(self.path, "rb")
+        self._key = str(self.path.resolve())
+        self._lock = threading.Lock()
+        self.seek(0)
+
+    def _block(self, coffset: int) -> Tuple[bytes, int]:
+        block = self.cache.get((self._key, coffset))
+        if block is None:
+            with self._lock:
+                block = read_bgzf_block(self._handle, coffset)
+            self.cache.put((self._key, coffset), block)
+        return block
+
+    def seek(self, voffset: int) -> None:
+        """Move to a virtual offset (compressed offset << 16 | within-block)."""
+        self._coffset = voffset >> 16
+        self._data, self._next = self._block(self._coffset)
+        self._within = voffset & 0xFFFF
+
+    def tell(self) -> int:
+        """Current virtual offset."""
+        if self._within >= len(self._data) and self._next != self._coffset:
+            return self._next << 16
+        return (self._coffset << 16) | self._within
+
+    def read(self, size: int) -> bytes:
+        """Read ``size`` uncompressed bytes, crossing blocks as needed."""
+        parts = []
+        while size > 0:
+            if self._within >= len(self._data):
+                if self._next == self._coffset:
+                    break  # end of file
+                self.seek(self._next << 16)
+                continue
+            part = self._data[self._within : self._within + size]
+            self._within += len(part)
+            size -= len(part)
+            parts.append(part)
+        return b"".join(parts)
+
+    def close(self) -> None:
+        self._handle.close()
+
+def aligned_blocks(
+    starts: np.ndarray, cigars: List[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Expand reads into their aligned (M/=/X) reference blocks."""
+    if not cigars:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    ops = np.concatenate(cigars)
+    n_ops = np.array([len(c) for c in cigars], dtype=np.int64)
+    read = np.repeat(np.arange(len(cigars)), n_ops)
+    codes = ops & 0xF
+    lengths = (ops >> 4).astype(np.int64) * REFERENCE_OPS[codes]
+    # Reference offset of each op within its read; reads without ops
+    # (n_cigar == 0) never appear in ``read`` so are never looked up
+    consumed = np.cumsum(lengths) - lengths
+    first_op = np.cumsum(n_ops) - n_ops
+    offsets = consumed - consumed[first_op[read]]
+    block_starts = np.asarray(starts, dtype=np.int64)[read] + offsets
+    aligned = ALIGNED_OPS[codes] & (lengths > 0)
+    return block_starts[aligned], (block_starts + lengths)[aligned]
+
+def region_to_bins(beg: int, end: int, min_shift: int, depth: int) -> List[int]:
+    """All bins overlapping ``[beg, end)`` in the CSI/BAI binning scheme."""
+    end -= 1
+    bins = []
+    shift = min_shift + depth * 3
+    offset = 0
+    for level in range(depth + 1):
+        bins.extend(range(offset + (beg >> shift), offset + (end >> shift) + 1))
+        shift -= 3
+        offset += 1 << (level * 3)
+    return bins
+
+@dataclass
+class ReferenceIndex:
+    """Bins, chunks and linear offsets for one reference sequence."""
+    bins: Dict[int, np.ndarray]
+    linear: np.ndarray
+    loffsets: Dict[int, int]
+
+@dataclass
+class AlignmentIndex:
+    """Parsed BAI or CSI index."""
+    min_shift: int
+    depth: int
+    references: List[ReferenceIndex]
+
+    def chunks(self, ref_id: int, beg: int, end: int) -> List[Tuple[int, int]]:
+        """Merged virtual-offset chunks that may hold reads in ``[beg, end)``."""
+        if ref_id >= len(self.references):
+            return []
+        ref = self.references[ref_id]
+        if len(ref.linear):
+            window = min(beg >> self.min_shift, len(ref.linear) - 1)
+            min_offset = int(ref.linear[window])
+        else:
+            finest = ((1 << (self.depth * 3)) - 1) // 7 + (beg >> self.min_shift)
+            min_offset = ref.loffsets.get(finest, 0)
+
+        candidates = [
+            ref.bins[b] for b in region_to_bins(beg, end, self.min_shift, self.depth)
+            if b in ref.bins
+        ]
+        if not candidates:
+            return []
+        chunks = np.concatenate(candidates)
+        chunks = chunks[chunks[:, 1] > min_offset]
+        chunks = chunks[np.argsort(chunks[:, 0], kind="stable")]
+
+        merged: List[Tuple[int, int]] = []
+        for chunk_beg, chunk_end in chunks.tolist():
+            chunk_beg = max(chunk_beg, min_offset)
+            if merged and chunk_beg >> 16 <= merged[-1][1] >> 16:
+                # Chunks touching the same block are read as one span
+                merged[-1] = (merged[-1][0], max(merged[-1][1], chunk_end))
+            else:
+                merged.append((chunk_beg, chunk_end))
+        return merged
+
+def _parse_bins(
+    data: bytes, pos: int, n_bin: int, has_loffset: bool, pseudo_bin: int
+) -> Tuple[Dict[int, np.ndarray], Dict[int, int], int]:
+    bins: Dict[int, np.ndarray] = {}
+    loffsets: Dict[int, int] = {}
+    for _ in range(n_bin):
+        bin_id = struct.unpack_from("<I", data, pos)[0]
+        pos += 4
+        if has_loffset:
+            loffsets[bin_id] = struct.unpack_from("<Q", data, pos)[0]
+            pos += 8
+        n_chunk = struct.unpack_from("<i", data, pos)[0]
+        pos += 4
+        chunks = np.frombuffer(data, dtype="<u8", count=2 * n_chunk, offset=pos)
+        pos += 16 * n_chunk
+        if bin_id != pseudo_bin:
+            bins[bin_id] = chunks.reshape(n_chunk, 2).astype(np.int64)
+    return bins, loffsets, pos
+
+def read_bai(path: Path) -> AlignmentIndex:
+    """Parse a ``.bai`` index."""
+    data = Path(path).read_bytes()
+    if data[:4] != b"BAI\x01":
+        raise ValueError(f"Not a BAI index: {path}")
+    pseudo_bin = ((1 << ((BAI_DEPTH + 1) * 3)) - 1) // 7 + 1
+    n_ref = struct.unpack_from("<i", data, 4)[0]
+    pos = 8
+    references = []
+    for _ in range(n_ref):
+        n_bin = struct.unpack_from("<i", data, pos)[0]
+        bins, _, pos = _parse_bins(data, pos + 4, n_bin, False, pseudo_bin)
+        n_intv = struct.unpack_from("<i", data, pos)[0]
+        linear = np.frombuffer(data, dtype="<u8", count=n_intv, offset=pos + 4)
+        pos += 4 + 8 * n_intv
+        references.append(ReferenceIndex(bins, linear.astype(np.int64), {}))
+    return AlignmentIndex(BAI_MIN_SHIFT, BAI_DEPTH, references)
+
+def read_csi(path: Path) -> AlignmentIndex:
+    """Parse a BGZF-compressed ``.csi`` index."""
+    blocks = []
+    with open(path, "rb") as handle:
+        coffset = 0
+        while True:
+            block, next_offset = read_bgzf_block(handle, coffset)
+            if next_offset == coffset:
+                break
+            blocks.append(block)
+            coffset = next_offset
+    data = b"".join(blocks)
+    if data[:4] != b"CSI\x01":
+        raise ValueError(f"Not a CSI index: {path}")
+    min_shift, depth, l_aux = struct.unpack_from("<iii", data, 4)
+    pos = 16 + l_aux
+    pseudo_bin = ((1 << ((depth + 1) * 3)) - 1) // 7 + 1
+    n_ref = struct.unpack_from("<i", data, pos)[0]
+    pos += 4
+    references = []
+    for _ in range(n_ref):
+        n_bin = struct.unpack_from("<i", data, pos)[0]
+        bins, loffsets, pos = _parse_bins(data, pos + 4, n_bin, True, pseudo_bin)
+        references.append(ReferenceIndex(bins, np.zeros(0, dtype=np.int64), loffsets))
+    return AlignmentIndex(min_shift, depth, references)
+
+class BamReader:
+    """Region queries against an indexed BAM file.
+
+    Only the BGZF blocks named by the index for a region are decompressed,
+    and decompressed blocks are kept in a shared, byte-bounded LRU so
+    repeated pans over nearby loci avoid re-inflating data.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        index_path: Optional[Path] = None,
+        cache: Optional[BlockCache] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.index = self._load_index(index_path)
+        self.bgzf = BgzfReader(self.path, cache)
+        self.references, self.lengths = self._read_header()
+        self._ref_ids = {name: i for i, name in enumerate(self.references)}
+
+    def _load_index(self, index_path: Optional[Path]) -> AlignmentIndex:
+        candidates = (
+            [Path(index_path)]
+            if index_path
+            else [
+                Path(f"{self.path}.bai"),
+                self.path.with_suffix(".bai"),
+                Path(f"{self.path}.csi"),
+            ]
+        )
+        for candidate in candidates:
+            if candidate.exists():
+                if candidate.suffix == ".csi":
+                    return read_csi(candidate)
+                return read_bai(candidate)
+        raise FileNotFoundError(f"No .bai or .csi index found for {self.path}")
+
+    def _read_header(self) -> Tuple[List[str], List[int]]:
+        self.bgzf.seek(0)
+        if self.bgzf.read(4) != b"BAM\x01":
+            raise ValueError(f"Not a BAM file: {self.path}")
+        l_text = struct.unpack("<i", self.bgzf.read(4))[0]
+        self.bgzf.read(l_text)
+        n_ref = struct.unpack("<i", self.bgzf.read(4))[0]
+        names, lengths = [], []
+        for _ in range(n_ref):
+            l_name = struct.unpack("<i", self.bgzf.read(4))[0]
+            names.append(self.bgzf.read(l_name)[:-1].decode("ascii"))
+            lengths.append(struct.unpack("<i", self.bgzf.read(4))[0])
+        return names, lengths
+
+    def _records(self, ref_id: int, beg: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+        """Raw overlapping records as (bytes, start, end)."""
+        for chunk_beg, chunk_end in self.index.chunks(ref_id, beg, end):
+            self.bgzf.seek(chunk_beg)
+            while self.bgzf.tell() < chunk_end:
+                size_bytes = self.bgzf.read(4)
+                if len(size_bytes) < 4:
+                    return
+                record = self.bgzf.read(struct.unpack("<i", size_bytes)[0])
+                rec_ref, rec_pos, l_name, _, _, n_cigar, flag = ALIGNMENT_HEADER.unpack_from(record)[:7]
+                if rec_ref != ref_id or rec_pos >= end:
+                    break
+                if flag & FLAG_UNMAPPED:
+                    continue
+                cigar = np.frombuffer(record, dtype="<u4", count=n_cigar, offset=32 + l_name)
+                span = int((cigar >> 4)[REFERENCE_OPS[cigar & 0xF]].sum()) if n_cigar else 1
+                if rec_pos + span > beg:
+                    yield record, rec_pos, rec_pos + span
+
+    def _ref_id(self, chromosome: str) -> int:
+        if chromosome not in self._ref_ids:
+            raise KeyError(f"Unknown reference: {chromosome}")
+        return self._ref_ids[chromosome]
+
+    def fetch(self, region: GenomeRegion) -> Iterator[AlignmentRecord]:
+        """Alignments overlapping a region."""
+        ref_id = self._ref_id(region.chromosome)
+        for record, start, end in self._records(ref_id, region.start, region.end):
+            _, _, l_name, mapq, _, n_cigar, flag = ALIGNMENT_HEADER.unpack_from(record)[:7]
+            yield AlignmentRecord(
+                reference=region.chromosome,
+                start=start,
+                end=end,
+                name=record[32 : 32 + l_name - 1].decode("ascii"),
+                flag=flag,
+                mapq=mapq,
+                cigar=np.frombuffer(record, dtype="<u4", count=n_cigar, offset=32 + l_name),
+            )
+
+    def fetch_spans(self, region: GenomeRegion) -> Dict[str, np.ndarray]:
+        """Overlapping alignments as start/end/flag/mapq arrays."""
+        ref_id = self._ref_id(region.chromosome)
+        starts, ends, flags, mapqs = [], [], [], []
+        for record, start, end in self._records(ref_id, region.start, region.end):
+            _, _, _, mapq, _, _, flag = ALIGNMENT_HEADER.unpack_from(record)[:7]
+            starts.append(start)
+            ends.append(end)
+            flags.append(flag)
+            mapqs.append(mapq)
+        return {
+            "start": np.array(starts, dtype=np.int64),
+            "end": np.array(ends, dtype=np.int64),
+            "flag": np.array(flags, dtype=np.uint16),
+            "mapq": np.array(mapqs, dtype=np.uint8),
+        }
+
+    def span_batches(
+        self,
+        chromosome: str,
+        batch_size: int = SPAN_BATCH,
+        blocks: bool = False,
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Reference spans of one chromosome's reads, in start-ordered batches.
+
+        With ``blocks=True`` reads are split into their aligned blocks, so
+        deletions and spliced introns do not count towards coverage.
+        """
+        ref_id = self._ref_id(chromosome)
+        starts: List[int] = []
+        ends: List[int] = []
+        cigars: List[np.ndarray] = []
+        records = self._records(ref_id, 0, self.lengths[ref_id])
+        while True:
+            record = next(records, None)
+            if record is not None:
+                data, start, end = record
+                starts.append(start)
+                ends.append(end)
+                if blocks:
+                    l_name, n_cigar = data[8], struct.unpack_from("<H", data, 12)[0]
+                    cigars.append(
+                        np.frombuffer(data, dtype="<u4", count=n_cigar, offset=32 + l_name)
+                    )
+            if starts and (record is None or len(starts) == batch_size):
+                if blocks:
+                    yield aligned_blocks(np.array(starts), cigars)
+                else:
+                    yield np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+                starts, ends, cigars = [], [], []
+            if record is None:
+                return
+
+    def count(self, region: GenomeRegion) -> int:
+        """Number of alignments overlapping a region."""
+        ref_id = self._ref_id(region.chromosome)
+        return sum(1 for _ in self._records(ref_id, region.start, region.end))
+
+    def close(self) -> None:
+        self.bgzf.close()
@@ -0,0 +1,298 @@
+"""Rerun-aware memoization and per-rerun timing for Streamlit pages."""
+
+import dataclasses
+import enum
+import functools
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    ParamSpec,
+    Tuple,
+    TypeVar,
+)
+
+import numpy as np
+import streamlit as st
+
+from genome_explorer.core.config import config
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+PROFILE_STATE_KEY = "rerun_profile"
+# Reruns whose totals are kept for comparison
+PROFILE_HISTORY = 20
+
+class UnhashableArgument(TypeError):
+    """Raised when a cached function receives a value it cannot key on."""
+
+def _update(hasher: "hashlib._Hash", value: Any) -> None:
+    """Feed a stable, type-tagged encoding of ``value`` into ``hasher``."""
+    if value is None or isinstance(value, (bool, int, float, complex, str)):
+        hasher.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        hasher.update(b"bytes:%d;" % len(value))
+        hasher.update(value)
+    elif hasattr(value, "__cache_key__"):
+        hasher.update(f"key:{type(value).__qualname__};".encode())
+        _update(hasher, value.__cache_key__())
+    elif isinstance(value, np.ndarray):
+        # Only set on memmaps that still view the mapped file
+        mapping = getattr(value, "_mmap", None)
+        if isinstance(value, np.memmap) and value.filename and mapping is not None:
+            # Mapped files are identified by path and modification time, and
+            # a view by where its first element sits in the mapping
+            stat = Path(value.filename).stat()
+            start = np.frombuffer(mapping, dtype=np.uint8).ctypes.data
+            position = value.ctypes.data - start
+            _update(
+                hasher,
+                ("memmap", value.filename, stat.st_mtime_ns, value.offset, position),
+            )
+            _update(hasher, (str(value.dtype), value.shape, value.strides))
+        else:
+            hasher.update(f"ndarray:{value.dtype.str}:{value.shape};".encode())
+            if value.dtype.hasobject:
+                _update(hasher, value.tolist())
+            else:
+                hasher.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, np.generic):
+        _update(hasher, value.item())
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        hasher.update(f"dataclass:{type(value).__qualname__};".encode())
+        for field in dataclasses.fields(value):
+            hasher.update(field.name.encode())
+            _update(hasher, getattr(value, field.name))
+    elif isinstance(value, enum.Enum):
+        _update(hasher, (type(value).__qualname__, value.value))
+    elif isinstance(value, (Path, datetime, date)):
+        _update(hasher, (type(value).__name__, str(value)))
+    elif isinstance(value, dict):
+        hasher.update(b"dict:%d;" % len(value))
+        entries = sorted((hash_value(k), v) for k, v in value.items())
+        for key_digest, item in entries:
+            hasher.update(key_digest.encode())
+            _update(hasher, item)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}:{len(value)};".encode())
+        for item in value:
+            _update(hasher, item)
+    elif isinstance(value, (set, frozenset)):
+        hasher.update(b"set:%d;" % len(value))
+        for digest in sorted(hash_value(item) for item in value):
+            hasher.update(digest.encode())
+    else:
+        try:
+            hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            raise UnhashableArgument(
+                f"Cannot build a cache key from {type(value).__qualname__}; "
+                "define __cache_key__() on it"
+            ) from e
+
+def hash_value(value: Any) -> str:
+    """Content hash of a value, understanding dataclasses and NumPy arrays."""
+    hasher = hashlib.sha256()
+    _update(hasher, value)
+    return hasher.hexdigest()
+
+class RerunProfiler:
+    """Timings of render functions and cache lookups for one script run."""
+
+    def __init__(self) -> None:
+        self.records: List[Tuple[str, str, float]] = []
+        self.history: Deque[float] = deque(maxlen=PROFILE_HISTORY)
+        self.started = time.perf_counter()
+
+    def begin(self) -> None:
+        """Start a new rerun, keeping the previous total in ``history``."""
+        if self.records:
+            self.history.append(self.elapsed)
+        self.records = []
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def record(self, name: str, kind: str, seconds: float) -> None:
+        self.records.append((name, kind, seconds))
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-name call counts and total seconds, slowest first."""
+        rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for name, kind, seconds in self.records:
+            row = rows.setdefault(
+                (name, kind), {"name": name, "kind": kind, "calls": 0, "seconds": 0.0}
+            )
+            row["calls"] += 1
+            row["seconds"] += seconds
+        return sorted(rows.values(), key=lambda row: -row["seconds"])
+
+_fallback_profiler = RerunProfiler()
+
+def get_profiler() -> RerunProfiler:
+    """This session's profiler (a process-wide one outside Streamlit)."""
+    try:
+        profiler: Optional[RerunProfiler] = st.session_state.get(PROFILE_STATE_KEY)
+        if profiler is None:
+            profiler = RerunProfiler()
+            st.session_state[PROFILE_STATE_KEY] = profiler
+        return profiler
+    except Exception:
+        return _fallback_profiler
+
+@contextmanager
+def timed(name: str, kind: str = "render") -> Iterator[None]:
+    """Time a block and record it in the rerun profile."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_profiler().record(name, kind, time.perf_counter() - started)
+
+def profiled(func: Callable[P, R]) -> Callable[P, R]:
+    """Record every call of ``func`` in the rerun profile."""
+
+    @functools.wraps(func)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        with timed(f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+class _MemoStore:
+    """Thread-safe LRU of results with a time-to-live."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class Memoized(Generic[P, R]):
+    """A function wrapped by ``memoize``, with its cache controls."""
+
+    def __init__(
+        self, func: Callable[P, R], store: Callable[[], _MemoStore], name: str
+    ) -> None:
+        functools.update_wrapper(self, func)
+        self._func = func
+        self._store = store
+        self._name = name
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        started = time.perf_counter()
+        key = hash_value((args, kwargs))
+        hit, value = self._store().get(key)
+        get_profiler().record(
+            self._name,
+            "cache hit" if hit else "cache miss",
+            time.perf_counter() - started,
+        )
+        if hit:
+            result: R = value
+            return result
+        with timed(self._name, "compute"):
+            result = self._func(*args, **kwargs)
+        self._store().put(key, result)
+        return result
+
+    def cache_clear(self) -> None:
+        """Drop every cached result (this session's, for session scope)."""
+        self._store().clear()
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit and miss counts of the cache in use."""
+        store = self._store()
+        return {"hits": store.hits, "misses": store.misses}
+
+def memoize(
+    ttl: Optional[float] = None,
+    max_entries: int = 32,
+    scope: str = "process",
+) -> Callable[[Callable[P, R]], Memoized[P, R]]:
+    """Cache a function's results across reruns, keyed on hashed arguments.
+
+    ``scope="process"`` shares results between sessions, so cached values
+    must not be mutated by callers; ``scope="session"`` keeps a separate
+    cache per browser session. Lookups and computations are recorded in
+    the rerun profile.
+    """
+    if scope not in ("process", "session"):
+        raise ValueError(f"Unknown cache scope: {scope}")
+    ttl = config.cache_ttl if ttl is None else ttl
+
+    def decorator(func: Callable[P, R]) -> Memoized[P, R]:
+        name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        shared = _MemoStore(max_entries, ttl)
+        state_key = f"memoize:{func.__module__}.{func.__qualname__}"
+
+        def store() -> _MemoStore:
+            if scope == "process":
+                return shared
+            try:
+                if state_key not in st.session_state:
+                    st.session_state[state_key] = _MemoStore(max_entries, ttl)
+                session_store: _MemoStore = st.session_state[state_key]
+                return session_store
+            except Exception:
+                return shared
+
+        return Memoized(func, store, name)
+
+    return decorator
+
+def render_profile() -> None:
+    """Render this rerun's timings in a sidebar expander."""
+    profiler = get_profiler()
+    with st.sidebar.expander("Rerun Profile"):
+        st.caption(f"This rerun: {profiler.elapsed * 1000:,.0f} ms")
+        if profiler.history:
+            st.caption(
+                "Previous reruns (ms): "
+                + ", ".join(f"{s * 1000:,.0f}" for s in list(profiler.history)[-5:])
+            )
+        for row in profiler.summary():
+            st.text(
+                f"{row['seconds'] * 1000:8.1f} ms  {row['calls']:>3}×  "
+                f"{row['kind']:<10} {row['name']}"
+            )
@@ -15,7 +15,10 @@ class AppConfig:
     
     # AI/ML Settings
     openai_model: str = "gpt-4-turbo-preview"
+    openai_base_url: Optional[str] = None  # OpenAI-compatible server
+    llm_backend: str = "openai"  # or "local" for offline answers
     embedding_model: str = "all-MiniLM-L6-v2"
+    model_memory_bytes: int = 4 * 1024 * 1024 * 1024  # shared across sessions
     max_tokens: int = 4096
     temperature: float = 0.7
     
@@ -28,6 +31,13 @@ class AppConfig:
     cache_ttl: int = 3600  # 1 hour
     batch_size: int = 32
     num_workers: int = 4
+    history_spill_bytes: int = 256 * 1024 * 1024  # spill sim events to disk
+    bam_cache_bytes: int = 64 * 1024 * 1024  # decompressed BGZF blocks
+    response_cache_entries: int = 5000
+    response_cache_similarity: float = 0.92  # cosine threshold for reuse
+    dataset_store_bytes: int = 8 * 1024 * 1024 * 1024  # parsed uploads on disk
+    job_workers: int = 2  # background jobs running at once per server
+    job_poll_seconds: float = 1.0  # rerun interval while a job is running
     
     @classmethod
     def from_env(cls) -> "AppConfig":
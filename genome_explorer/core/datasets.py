@@ -0,0 +1,248 @@
+"""Content-addressed store of parsed uploads, shared by every session."""
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from genome_explorer.core.config import config
+
+# Written last when a dataset is built; directories without it are partial
+READY_FILE = "dataset.json"
+
+@dataclass
+class DatasetInfo:
+    """One stored dataset and the number of live leases on it."""
+    key: str
+    directory: Path
+    size: int
+    created: float
+    last_used: float
+    name: str = ""
+    refs: int = 0
+
+class DatasetLease:
+    """A session's hold on a dataset, which keeps it from being evicted.
+
+    Keep the lease in session state: it is released by ``release()`` or
+    when the session (and so the lease) is garbage collected.
+    """
+
+    def __init__(self, store: "DatasetStore", info: DatasetInfo) -> None:
+        self.key = info.key
+        self.directory = info.directory
+        self.name = info.name
+        self._finalizer = weakref.finalize(self, store._release, info.key)
+
+    @property
+    def released(self) -> bool:
+        return not self._finalizer.alive
+
+    def release(self) -> None:
+        self._finalizer()
+
+def _tree_size(directory: Path) -> int:
+    return sum(path.stat().st_size for path in directory.rglob("*") if path.is_file())
+
+class DatasetStore:
+    """One parsed copy on disk per unique upload, keyed by content hash.
+
+    ``acquire`` builds a dataset the first time its key is seen (other
+    sessions asking for the same key meanwhile wait for that build) and
+    afterwards only hands out leases; the files are memory-mapped
+    read-only by whoever opens them, so every session shares the same
+    page cache. Datasets nobody holds a lease on are evicted, least
+    recently used first, while the store exceeds ``max_bytes``.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        self.root = Path(cache_dir or config.cache_dir) / "datasets"
+        self.max_bytes = config.dataset_store_bytes if max_bytes is None else max_bytes
+        self.evictions = 0
+        self._datasets: Dict[str, DatasetInfo] = {}
+        # Re-entrant: a lease finalizer may run during garbage collection
+        # while this thread already holds the lock
+        self._lock = threading.RLock()
+        self._building: Dict[str, threading.Lock] = {}
+        self._scanned = False
+
+    def directory(self, key: str) -> Path:
+        safe_key = re.sub(r"[^A-Za-z0-9._-]", "_", key)
+        return self.root / safe_key
+
+    def _read_ready(self, directory: Path) -> Optional[DatasetInfo]:
+        """The dataset in ``directory``, or None if it was never finished."""
+        ready = directory / READY_FILE
+        try:
+            meta = json.loads(ready.read_text())
+            last_used = ready.stat().st_mtime
+        except (OSError, ValueError):
+            return None
+        return DatasetInfo(
+            key=meta["key"],
+            directory=directory,
+            size=meta["size"],
+            created=meta["created"],
+            last_used=last_used,
+            name=meta.get("name", ""),
+        )
+
+    def _scan(self) -> None:
+        """Pick up datasets built by an earlier server process."""
+        if self._scanned:
+            return
+        self._scanned = True
+        if not self.root.exists():
+            return
+        for directory in self.root.iterdir():
+            if not directory.is_dir():
+                continue
+            info = self._read_ready(directory)
+            if info is None:
+                # Interrupted build or staging area
+                shutil.rmtree(directory, ignore_errors=True)
+                continue
+            self._datasets[info.key] = info
+
+    def _lease(self, info: DatasetInfo) -> DatasetLease:
+        info.refs += 1
+        info.last_used = time.time()
+        # The marker's mtime carries the LRU order across restarts
+        os.utime(info.directory / READY_FILE)
+        return DatasetLease(self, info)
+
+    def _use(self, key: str) -> Optional[DatasetLease]:
+        info = self._datasets.get(key)
+        return self._lease(info) if info is not None else None
+
+    def acquire(
+        self, key: str, build: Callable[[Path], None], name: str = ""
+    ) -> DatasetLease:
+        """Lease the dataset for ``key``, calling ``build(directory)`` if absent.
+
+        ``build`` writes its files into an empty staging directory, which is
+        renamed into place once it returns, so a crashed or failed build
+        never leaves a half-written dataset behind.
+        """
+        with self._lock:
+            self._scan()
+            lease = self._use(key)
+            if lease is not None:
+                return lease
+            build_lock = self._building.setdefault(key, threading.Lock())
+
+        with build_lock:
+            try:
+                with self._lock:
+                    lease = self._use(key)
+                    if lease is not None:
+                        return lease
+                info = self._read_ready(self.directory(key)) or self._build(
+                    key, build, name
+                )
+                # Registered before the build lock is dropped, so a later
+                # caller finds the dataset instead of building it again
+                with self._lock:
+                    self._datasets[key] = info
+                    lease = self._lease(info)
+                    self._evict_to_budget()
+                return lease
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+
+    def _build(
+        self, key: str, build: Callable[[Path], None], name: str
+    ) -> DatasetInfo:
+        staging = self.root / f".staging-{uuid.uuid4().hex}"
+        staging.mkdir(parents=True)
+        try:
+            build(staging)
+            size = _tree_size(staging)
+            now = time.time()
+            meta = {"key": key, "name": name, "size": size, "created": now}
+            (staging / READY_FILE).write_text(json.dumps(meta))
+            directory = self.directory(key)
+            # Only the remains of an interrupted build are ever replaced;
+            # a finished dataset is reused by acquire instead
+            if directory.exists() and not (directory / READY_FILE).exists():
+                shutil.rmtree(directory, ignore_errors=True)
+            staging.rename(directory)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        return DatasetInfo(key, directory, size, now, now, name)
+
+    def _release(self, key: str) -> None:
+        with self._lock:
+            info = self._datasets.get(key)
+            if info is not None and info.refs > 0:
+                info.refs -= 1
+            self._evict_to_budget()
+
+    @property
+    def total_size(self) -> int:
+        """Bytes on disk across stored datasets."""
+        return sum(info.size for info in self._datasets.values())
+
+    def _evict_to_budget(self) -> None:
+        total = self.total_size
+        idle = sorted(
+            (info for info in self._datasets.values() if info.refs == 0),
+            key=lambda info: info.last_used,
+        )
+        for info in idle:
+            if total <= self.max_bytes:
+                break
+            self._drop(info.key)
+            total -= info.size
+
+    def _drop(self, key: str) -> None:
+        info = self._datasets.pop(key, None)
+        if info is None:
+            return
+        shutil.rmtree(info.directory, ignore_errors=True)
+        self.evictions += 1
+
+    def evict(self, key: str) -> bool:
+        """Delete one dataset now, unless a session still holds it."""
+        with self._lock:
+            self._scan()
+            info = self._datasets.get(key)
+            if info is None or info.refs > 0:
+                return False
+            self._drop(key)
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-dataset size and lease counts plus totals."""
+        with self._lock:
+            self._scan()
+            datasets: List[Dict[str, Any]] = [
+                {
+                    "key": info.key,
+                    "name": info.name,
+                    "size": info.size,
+                    "refs": info.refs,
+                    "last_used": info.last_used,
+                }
+                for info in self._datasets.values()
+            ]
+            return {
+                "datasets": datasets,
+                "total_size": self.total_size,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+# Global store, shared by all sessions in this server process
+dataset_store = DatasetStore()
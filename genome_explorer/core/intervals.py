@@ -0,0 +1,291 @@
+"""Sorted-array interval index for genomic feature overlap queries."""
+
+import hashlib
+import json
+import re
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from genome_explorer.core.config import config
+from genome_explorer.core.types import GenomeFeature, GenomeRegion
+
+META_FILE = "meta.json"
+FEATURES_FILE = "features.json"
+ARRAY_NAMES = (
+    "starts",
+    "ends",
+    "ids",
+    "bins",
+    "by_start",
+    "by_start_ids",
+    "by_end",
+    "by_end_ids",
+    "chrom_offsets",
+)
+
+def interval_index_dir(key: str, cache_dir: Optional[Path] = None) -> Path:
+    """Directory holding a persisted interval index."""
+    safe_key = re.sub(r"[^A-Za-z0-9._-]", "_", key)
+    return Path(cache_dir or config.cache_dir) / "intervals" / safe_key
+
+def _expand_ranges(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten ``[lo[i], hi[i])`` ranges into (range number, position) pairs."""
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(lo)), counts)
+    first = np.cumsum(counts) - counts
+    return owner, lo[owner] + np.arange(total) - first[owner]
+
+class IntervalIndex:
+    """Per-chromosome index over half-open ``[start, end)`` intervals.
+
+    Intervals are grouped into power-of-two length classes and sorted by
+    start within each class. Within a class every interval is at most
+    ``max_len`` long, so the overlap candidates for a query ``[qs, qe)`` are
+    exactly those with ``qs - max_len < start < qe`` — two binary searches
+    per class followed by a vectorized end filter, i.e. O(log n + k).
+    """
+
+    def __init__(
+        self,
+        chromosomes: List[str],
+        arrays: Dict[str, np.ndarray],
+        features: Optional[List[GenomeFeature]] = None,
+        features_path: Optional[Path] = None,
+    ) -> None:
+        self.chromosomes = chromosomes
+        self._codes = {name: code for code, name in enumerate(chromosomes)}
+        # Sorted by (chromosome, length class, start); ``bins`` rows are
+        # (chromosome code, first, last, longest interval) per class
+        self.starts: np.ndarray = arrays["starts"]
+        self.ends: np.ndarray = arrays["ends"]
+        self.ids: np.ndarray = arrays["ids"]
+        self.bins: np.ndarray = arrays["bins"]
+        # Per-chromosome start and end orders, for nearest-interval searches
+        self.by_start: np.ndarray = arrays["by_start"]
+        self.by_start_ids: np.ndarray = arrays["by_start_ids"]
+        self.by_end: np.ndarray = arrays["by_end"]
+        self.by_end_ids: np.ndarray = arrays["by_end_ids"]
+        self.chrom_offsets: np.ndarray = arrays["chrom_offsets"]
+        self._features = features
+        self._features_path = features_path
+
+    @classmethod
+    def build(
+        cls,
+        chroms: Iterable[str],
+        starts: Iterable[int],
+        ends: Iterable[int],
+        features: Optional[List[GenomeFeature]] = None,
+    ) -> "IntervalIndex":
+        """Build an index from parallel chromosome/start/end sequences.
+
+        Interval ``i`` is reported by queries as id ``i``.
+        """
+        chrom_names, chrom_codes = np.unique(
+            np.asarray(list(chroms), dtype=str), return_inverse=True
+        )
+        chrom_codes = chrom_codes.astype(np.int64).ravel()
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        if np.any(ends < starts):
+            raise ValueError("Interval end must not precede its start")
+        ids = np.arange(len(starts), dtype=np.int64)
+        lengths = ends - starts
+        length_class = np.floor(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+
+        # One bin per (chromosome, length class), sorted by start inside
+        order = np.lexsort((starts, length_class, chrom_codes))
+        sorted_codes = chrom_codes[order]
+        changes = np.diff(sorted_codes) != 0
+        changes |= np.diff(length_class[order]) != 0
+        bin_starts = np.flatnonzero(np.concatenate(([len(order) > 0], changes)))
+        bin_ends = np.append(bin_starts[1:], len(order))
+        bins = np.zeros((len(bin_starts), 4), dtype=np.int64)
+        if len(bin_starts):
+            bins[:, 0] = sorted_codes[bin_starts]
+            bins[:, 1] = bin_starts
+            bins[:, 2] = bin_ends
+            bins[:, 3] = np.maximum.reduceat(lengths[order], bin_starts)
+
+        start_order = np.lexsort((starts, chrom_codes))
+        end_order = np.lexsort((ends, chrom_codes))
+        chrom_offsets = np.searchsorted(
+            chrom_codes[start_order], np.arange(len(chrom_names) + 1)
+        ).astype(np.int64)
+
+        arrays = {
+            "starts": starts[order],
+            "ends": ends[order],
+            "ids": ids[order],
+            "bins": bins,
+            "by_start": starts[start_order],
+            "by_start_ids": ids[start_order],
+            "by_end": ends[end_order],
+            "by_end_ids": ids[end_order],
+            "chrom_offsets": chrom_offsets,
+        }
+        return cls(list(chrom_names), arrays, features)
+
+    @classmethod
+    def from_regions(cls, regions: List[GenomeRegion]) -> "IntervalIndex":
+        """Build an index over ``GenomeRegion`` objects."""
+        return cls.build(
+            [r.chromosome for r in regions],
+            [r.start for r in regions],
+            [r.end for r in regions],
+        )
+
+    @classmethod
+    def from_features(cls, features: List[GenomeFeature]) -> "IntervalIndex":
+        """Build an index that can return the ``GenomeFeature`` objects."""
+        return cls.build(
+            [f.region.chromosome for f in features],
+            [f.region.start for f in features],
+            [f.region.end for f in features],
+            features,
+        )
+
+    @property
+    def features(self) -> Optional[List[GenomeFeature]]:
+        """Feature payload, loaded from disk on first access."""
+        if self._features is None and self._features_path is not None:
+            with open(self._features_path) as handle:
+                self._features = [
+                    GenomeFeature(
+                        **{**item, "region": GenomeRegion(**item["region"])}
+                    )
+                    for item in json.load(handle)
+                ]
+        return self._features
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlaps_batch(
+        self, chrom: str, starts: Iterable[int], ends: Iterable[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Overlaps for many query intervals on one chromosome.
+
+        Returns ``(query_index, interval_id)`` pairs ordered by query and
+        then by interval start.
+        """
+        query_starts = np.asarray(starts, dtype=np.int64)
+        query_ends = np.asarray(ends, dtype=np.int64)
+        code = self._codes.get(chrom)
+        if code is None:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        hits_query, hits_pos = [], []
+        for _, lo_bin, hi_bin, max_len in self.bins[self.bins[:, 0] == code]:
+            class_starts = self.starts[lo_bin:hi_bin]
+            lo = np.searchsorted(class_starts, query_starts - max_len, side="right")
+            hi = np.searchsorted(class_starts, query_ends, side="left")
+            owner, pos = _expand_ranges(lo, hi)
+            pos += lo_bin
+            keep = self.ends[pos] > query_starts[owner]
+            hits_query.append(owner[keep])
+            hits_pos.append(pos[keep])
+
+        if not hits_query:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        query_index = np.concatenate(hits_query)
+        positions = np.concatenate(hits_pos)
+        order = np.lexsort((self.starts[positions], query_index))
+        return query_index[order], self.ids[positions[order]]
+
+    def overlaps(self, region: GenomeRegion) -> np.ndarray:
+        """Ids of intervals overlapping a region, ordered by start."""
+        _, ids = self.overlaps_batch(region.chromosome, [region.start], [region.end])
+        return ids
+
+    def overlapping_features(self, region: GenomeRegion) -> List[GenomeFeature]:
+        """Features overlapping a region (index must carry features)."""
+        if self.features is None:
+            raise ValueError("Index was built without a feature payload")
+        return [self.features[i] for i in self.overlaps(region)]
+
+    def nearest(self, chrom: str, pos: int) -> Optional[int]:
+        """Id of the interval closest to ``pos`` (overlapping wins)."""
+        code = self._codes.get(chrom)
+        if code is None:
+            return None
+        lo, hi = self.chrom_offsets[code], self.chrom_offsets[code + 1]
+        if lo == hi:
+            return None
+
+        covering = self.overlaps(GenomeRegion(chrom, pos, pos + 1))
+        if len(covering):
+            return int(covering[0])
+
+        by_end = self.by_end[lo:hi]
+        by_start = self.by_start[lo:hi]
+        before = np.searchsorted(by_end, pos, side="right") - 1
+        after = np.searchsorted(by_start, pos, side="right")
+        best: Optional[Tuple[int, int]] = None
+        if before >= 0:
+            best = (pos - int(by_end[before]) + 1, int(self.by_end_ids[lo + before]))
+        if after < hi - lo:
+            candidate = (int(by_start[after]) - pos, int(self.by_start_ids[lo + after]))
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+        return best[1] if best else None
+
+    def save(self, directory: Path) -> None:
+        """Persist arrays (as .npy) and any feature payload to a directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAY_NAMES:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        if self.features is not None:
+            with open(directory / FEATURES_FILE, "w") as handle:
+                json.dump([asdict(f) for f in self.features], handle)
+        # Written last so a partial save is never picked up by load()
+        with open(directory / META_FILE, "w") as handle:
+            json.dump({"chromosomes": self.chromosomes}, handle)
+
+    @classmethod
+    def load(cls, directory: Path) -> "IntervalIndex":
+        """Open a persisted index; arrays are memory-mapped, not read."""
+        directory = Path(directory)
+        with open(directory / META_FILE) as handle:
+            meta = json.load(handle)
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in ARRAY_NAMES
+        }
+        features_path = directory / FEATURES_FILE
+        return cls(
+            meta["chromosomes"],
+            arrays,
+            features_path=features_path if features_path.exists() else None,
+        )
+
+def features_key(features: List[GenomeFeature]) -> str:
+    """Content hash of a feature list."""
+    digest = hashlib.sha256()
+    for feature in features:
+        digest.update(json.dumps(asdict(feature), sort_keys=True).encode() + b"\0")
+    return digest.hexdigest()[:16]
+
+def load_or_build_index(
+    key: str,
+    features: List[GenomeFeature],
+    cache_dir: Optional[Path] = None,
+) -> IntervalIndex:
+    """Load a cached index for ``key``, building and saving it on first use.
+
+    The cache directory includes a hash of ``features``, so a changed
+    feature list under the same key builds a new index.
+    """
+    directory = interval_index_dir(f"{key}-{features_key(features)}", cache_dir)
+    if (directory / META_FILE).exists():
+        return IntervalIndex.load(directory)
+    index = IntervalIndex.from_features(features)
+    index.save(directory)
+    return index
@@ -0,0 +1,316 @@
+"""Background jobs for long simulations and report builds."""
+
+import dataclasses
+import enum
+import json
+import pickle
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import streamlit as st
+
+from genome_explorer.core.caching import hash_value
+from genome_explorer.core.config import config
+from genome_explorer.core.session import clear_state, get_state
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+FINISHED = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been asked to stop."""
+
+@dataclass
+class Job:
+    """Status of one submitted job; ``progress`` runs from 0 to 1."""
+    id: str
+    kind: str
+    status: JobStatus = JobStatus.QUEUED
+    progress: float = 0.0
+    message: str = ""
+    created: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status not in FINISHED
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+class JobContext:
+    """Handed to a running job to report progress and notice cancellation."""
+
+    def __init__(self, job: Job, lock: threading.Lock, cancel: threading.Event) -> None:
+        self._job = job
+        self._lock = lock
+        self._cancel = cancel
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def progress(self, fraction: float, message: Optional[str] = None) -> None:
+        """Record progress; raises ``JobCancelled`` if the job was cancelled."""
+        with self._lock:
+            self._job.progress = min(max(float(fraction), 0.0), 1.0)
+            if message is not None:
+                self._job.message = message
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+class JobManager:
+    """Runs jobs on a bounded thread pool shared by every session.
+
+    At most ``max_workers`` jobs run at once in this server process; the
+    rest wait in the pool's queue. Jobs submitted with a ``key`` get a
+    deterministic id, so submitting the same work again (from another
+    rerun, or a refreshed browser tab) attaches to the existing job instead
+    of starting a second one. Status and results are written under
+    ``cache_dir/jobs/`` and finished jobs expire after ``ttl`` seconds;
+    completed results outlive a server restart until then.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        self.max_workers = max_workers or config.job_workers
+        self.cache_dir = Path(cache_dir or config.cache_dir) / "jobs"
+        self.ttl = config.cache_ttl if ttl is None else ttl
+        self._jobs: Dict[str, Job] = {}
+        self._cancel: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        # Created on first submit so importing the module starts no threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="job"
+            )
+        return self._executor
+
+    def _meta_path(self, job_id: str) -> Path:
+        return self.cache_dir / f"{job_id}.json"
+
+    def _result_path(self, job_id: str) -> Path:
+        return self.cache_dir / f"{job_id}.pkl"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+
+    def _save(self, job: Job) -> None:
+        record = dataclasses.asdict(job)
+        record["status"] = job.status.value
+        self._write(self._meta_path(job.id), json.dumps(record).encode())
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        """A completed job from an earlier server process, if still fresh."""
+        try:
+            record = json.loads(self._meta_path(job_id).read_text())
+        except (OSError, ValueError):
+            return None
+        job = Job(**{**record, "status": JobStatus(record["status"])})
+        # Jobs that were still running when the server stopped are lost
+        if job.status != JobStatus.COMPLETED or not self._result_path(job_id).exists():
+            return None
+        if time.time() - (job.finished or 0) > self.ttl:
+            return None
+        return job
+
+    def submit(
+        self,
+        kind: str,
+        func: Callable[..., Any],
+        *args: Any,
+        key: Any = None,
+        **kwargs: Any,
+    ) -> str:
+        """Queue ``func(context, *args, **kwargs)`` and return the job id.
+
+        With a ``key``, an active or completed job of the same kind and key
+        is reused; failed and cancelled ones are run again.
+        """
+        if key is not None:
+            job_id = hash_value((kind, key))[:16]
+        else:
+            job_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._prune(time.time())
+            existing = self._jobs.get(job_id) or (
+                self._load(job_id) if key is not None else None
+            )
+            if existing is not None and existing.status not in (
+                JobStatus.FAILED,
+                JobStatus.CANCELLED,
+            ):
+                self._jobs[job_id] = existing
+                return job_id
+            job = Job(id=job_id, kind=kind, created=time.time())
+            cancel = threading.Event()
+            self._jobs[job_id] = job
+            self._cancel[job_id] = cancel
+            self._save(job)
+            context = JobContext(job, self._lock, cancel)
+            self._pool().submit(self._run, job, context, func, args, kwargs)
+        return job_id
+
+    def _run(
+        self,
+        job: Job,
+        context: JobContext,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ) -> None:
+        with self._lock:
+            if context.cancelled:
+                job.status = JobStatus.CANCELLED
+                job.finished = time.time()
+                self._save(job)
+                return
+            job.status = JobStatus.RUNNING
+            job.started = time.time()
+        try:
+            result = func(context, *args, **kwargs)
+            self._write(
+                self._result_path(job.id),
+                pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            status, error = JobStatus.COMPLETED, None
+        except JobCancelled:
+            status, error = JobStatus.CANCELLED, None
+        except Exception as e:
+            status, error = JobStatus.FAILED, f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        with self._lock:
+            job.status = status
+            job.error = error
+            job.finished = time.time()
+            if status == JobStatus.COMPLETED:
+                job.progress = 1.0
+            self._save(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A snapshot of the job's status, or ``None`` if it is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                job = self._load(job_id)
+                if job is not None:
+                    self._jobs[job_id] = job
+            return dataclasses.replace(job) if job else None
+
+    def result(self, job_id: str) -> Any:
+        """The result of a completed job, read back from disk."""
+        job = self.get(job_id)
+        if job is None or job.status != JobStatus.COMPLETED:
+            raise KeyError(f"No completed job {job_id}")
+        with open(self._result_path(job_id), "rb") as handle:
+            return pickle.load(handle)
+
+    def cancel(self, job_id: str) -> None:
+        """Ask a job to stop at its next progress report (or before it starts)."""
+        with self._lock:
+            cancel = self._cancel.get(job_id)
+            if cancel is not None:
+                cancel.set()
+
+    def jobs(self, kind: Optional[str] = None) -> List[Job]:
+        """Snapshots of known jobs, newest first."""
+        with self._lock:
+            found = [
+                dataclasses.replace(job)
+                for job in self._jobs.values()
+                if kind is None or job.kind == kind
+            ]
+        return sorted(found, key=lambda job: -job.created)
+
+    def _prune(self, now: float) -> None:
+        """Forget finished jobs older than the TTL and delete their files."""
+        for job_id, job in list(self._jobs.items()):
+            if job.active or now - (job.finished or now) <= self.ttl:
+                continue
+            del self._jobs[job_id]
+            self._cancel.pop(job_id, None)
+            self._meta_path(job_id).unlink(missing_ok=True)
+            self._result_path(job_id).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status, for monitoring."""
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status.value] = counts.get(job.status.value, 0) + 1
+        return {"max_workers": self.max_workers, "jobs": counts}
+
+# Global job manager, shared by all sessions in this server process
+job_manager = JobManager()
+
+def collect_job(
+    state_key: str, label: str, manager: Optional[JobManager] = None
+) -> Any:
+    """Show the progress of the session's job stored under ``state_key``.
+
+    While the job runs this draws a progress bar and a cancel button and
+    returns ``None``. Once it finishes the key is cleared and the result
+    is returned (failures and cancellations are reported instead).
+    """
+    manager = manager or job_manager
+    job_id = get_state(state_key)
+    if not job_id:
+        return None
+    job = manager.get(job_id)
+    if job is None:
+        clear_state([state_key])
+        return None
+    if job.active:
+        text = f"{label}: {job.message or job.status.value}"
+        st.progress(job.progress, text=text)
+        if st.button("Cancel", key=f"cancel_{state_key}"):
+            manager.cancel(job_id)
+        return None
+    clear_state([state_key])
+    if job.status == JobStatus.COMPLETED:
+        return manager.result(job_id)
+    if job.status == JobStatus.FAILED:
+        st.error(f"{label} failed: {job.error}")
+    else:
+        st.info(f"{label} cancelled.")
+    return None
+
+def poll_jobs(state_keys: Iterable[str], manager: Optional[JobManager] = None) -> None:
+    """Rerun the page shortly while any of the session's jobs is running.
+
+    Call this last in ``render`` so the whole page has been drawn before
+    the script sleeps.
+    """
+    manager = manager or job_manager
+    for state_key in state_keys:
+        job_id = get_state(state_key)
+        job = manager.get(job_id) if job_id else None
+        if job is not None and job.active:
+            time.sleep(config.job_poll_seconds)
+            st.rerun()
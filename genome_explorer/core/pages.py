@@ -0,0 +1,72 @@
+"""Lazily imported page modules with import-time metrics."""
+
+import importlib
+import threading
+import time
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Dict, List, Optional
+
+@dataclass
+class PageEntry:
+    """A navigable page and its import statistics."""
+    name: str
+    module_path: str
+    module: Optional[ModuleType] = None
+    import_seconds: Optional[float] = None
+    renders: int = 0
+
+class PageRegistry:
+    """Maps navigation labels to page modules, importing each on first use.
+
+    The registry lives in this module rather than in the Streamlit script,
+    so it survives reruns and its metrics cover the whole server process.
+    """
+
+    def __init__(self) -> None:
+        self._pages: Dict[str, PageEntry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, module_path: str) -> None:
+        """Add a page; re-registering the same module is a no-op."""
+        with self._lock:
+            entry = self._pages.get(name)
+            if entry is None or entry.module_path != module_path:
+                self._pages[name] = PageEntry(name, module_path)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._pages)
+
+    def load(self, name: str) -> ModuleType:
+        """The page's module, imported (and timed) the first time."""
+        entry = self._pages[name]
+        if entry.module is None:
+            with self._lock:
+                if entry.module is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(entry.module_path)
+                    entry.import_seconds = time.perf_counter() - started
+                    entry.module = module
+        return entry.module
+
+    def render(self, name: str) -> None:
+        """Import the page if needed and call its ``render()``."""
+        module = self.load(name)
+        self._pages[name].renders += 1
+        module.render()
+
+    def metrics(self) -> List[Dict[str, object]]:
+        """Import time and render count of every page."""
+        return [
+            {
+                "page": entry.name,
+                "loaded": entry.module is not None,
+                "import_seconds": entry.import_seconds,
+                "renders": entry.renders,
+            }
+            for entry in self._pages.values()
+        ]
+
+# Global registry instance, shared by all sessions in this server process
+page_registry = PageRegistry()
@@ -0,0 +1,301 @@
+"""Streaming parsers for FASTA/FASTQ genome files."""
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import PurePath
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+
+from genome_explorer.core.types import GenomeFormat, GenomeRegion, Sequence
+
+# Bytes read from the upload buffer per iteration
+CHUNK_SIZE = 1 << 20
+
+FORMAT_ALIASES = {
+    "fa": GenomeFormat.FASTA,
+    "fna": GenomeFormat.FASTA,
+    "fasta": GenomeFormat.FASTA,
+    "fq": GenomeFormat.FASTQ,
+    "fastq": GenomeFormat.FASTQ,
+    "bam": GenomeFormat.BAM,
+    "vcf": GenomeFormat.VCF,
+    "bed": GenomeFormat.BED,
+}
+
+# Line terminators and padding that may appear inside sequence data
+SEQUENCE_WHITESPACE = b"\r\n \t"
+
+# Called with (bytes_read, total_bytes); total is None when unknown
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+@dataclass
+class SequenceRecord:
+    """A single FASTA/FASTQ record."""
+    id: str
+    sequence: Sequence
+    description: str = ""
+    quality: Optional[str] = None
+
+@dataclass
+class SequenceStats:
+    """Base composition of a contig (FASTA) or a read set (FASTQ)."""
+    name: str
+    length: int = 0
+    gc_count: int = 0
+    n_count: int = 0
+    records: int = 1
+
+    @property
+    def gc_content(self) -> float:
+        """GC fraction over called (non-N) bases."""
+        called = self.length - self.n_count
+        return self.gc_count / called if called > 0 else 0.0
+
+    def to_region(self) -> GenomeRegion:
+        """Region spanning the whole contig."""
+        return GenomeRegion(
+            chromosome=self.name,
+            start=0,
+            end=self.length,
+            features={"gc_content": f"{self.gc_content:.4f}"},
+        )
+
+def detect_format(filename: str) -> GenomeFormat:
+    """Infer the genome format from a file name."""
+    suffixes = [s.lstrip(".").lower() for s in PurePath(filename).suffixes]
+    if suffixes and suffixes[-1] in ("gz", "bgz"):
+        suffixes.pop()
+    if not suffixes or suffixes[-1] not in FORMAT_ALIASES:
+        raise ValueError(f"Unsupported genome file: {filename}")
+    return FORMAT_ALIASES[suffixes[-1]]
+
+def stream_size(stream: BinaryIO) -> Optional[int]:
+    """Best-effort total size of a binary stream."""
+    size = getattr(stream, "size", None)
+    if isinstance(size, int):
+        return size
+    if stream.seekable():
+        pos = stream.tell()
+        end = stream.seek(0, 2)
+        stream.seek(pos)
+        return end - pos
+    return None
+
+class HashingReader:
+    """Binary stream wrapper that hashes bytes as they are read.
+
+    Lets a single streaming pass both parse an upload and compute its
+    content digest.
+    """
+
+    def __init__(self, stream: BinaryIO, algorithm: str = "sha256") -> None:
+        self.stream = stream
+        self.size = stream_size(stream)
+        self._hash = hashlib.new(algorithm)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self._hash.update(data)
+        return data
+
+    def seekable(self) -> bool:
+        return False
+
+    def hexdigest(self) -> str:
+        """Digest of everything read so far."""
+        return self._hash.hexdigest()
+
+def file_digest(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> str:
+    """SHA-256 of a stream's remaining contents, read in chunks."""
+    reader = HashingReader(stream)
+    for _ in iter_chunks(reader, chunk_size, progress):
+        pass
+    return reader.hexdigest()
+
+def iter_chunks(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[bytes]:
+    """Read a binary stream in fixed-size chunks."""
+    total = stream_size(stream) if progress else None
+    bytes_read = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        bytes_read += len(chunk)
+        if progress:
+            progress(bytes_read, total)
+        yield chunk
+
+def iter_lines(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[bytes]:
+    """Yield lines (without terminators) from a chunked binary stream."""
+    tail = b""
+    for chunk in iter_chunks(stream, chunk_size, progress):
+        lines = (tail + chunk).split(b"\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if tail:
+        yield tail.rstrip(b"\r")
+
+def _split_header(header: bytes) -> Tuple[str, str]:
+    """Split a header line into record id and description."""
+    text = header.decode("utf-8", errors="replace").strip()
+    name, _, description = text.partition(" ")
+    return name, description.strip()
+
+def parse_fasta(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[SequenceRecord]:
+    """Lazily parse FASTA records from a binary stream.
+
+    Each yielded record holds its full sequence; use ``scan_fasta`` when only
+    contig statistics are needed.
+    """
+    header: Optional[bytes] = None
+    parts: List[bytes] = []
+    for line in iter_lines(stream, chunk_size, progress):
+        if line.startswith(b">"):
+            if header is not None:
+                name, description = _split_header(header)
+                yield SequenceRecord(name, b"".join(parts).decode("ascii"), description)
+            header, parts = line[1:], []
+        elif line:
+            if header is None:
+                raise ValueError("FASTA sequence data found before first header")
+            parts.append(line.strip())
+    if header is not None:
+        name, description = _split_header(header)
+        yield SequenceRecord(name, b"".join(parts).decode("ascii"), description)
+
+def parse_fastq(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[SequenceRecord]:
+    """Lazily parse four-line FASTQ records from a binary stream."""
+    lines = (line for line in iter_lines(stream, chunk_size, progress) if line)
+    for header in lines:
+        if not header.startswith(b"@"):
+            raise ValueError(f"Malformed FASTQ header: {header[:50]!r}")
+        sequence = next(lines, None)
+        separator = next(lines, None)
+        quality = next(lines, None)
+        if quality is None or separator is None or not separator.startswith(b"+"):
+            raise ValueError("Truncated FASTQ record")
+        name, description = _split_header(header[1:])
+        yield SequenceRecord(
+            name,
+            sequence.decode("ascii"),
+            description,
+            quality.decode("ascii"),
+        )
+
+def count_bases(stats: SequenceStats, segment: bytes) -> None:
+    """Add the bases of a raw (multi-line) sequence segment to stats.
+
+    Whitespace is skipped exactly as ``TwoBitWriter.write`` skips it, so
+    scanned and packed statistics agree.
+    """
+    stats.length += len(segment) - sum(map(segment.count, SEQUENCE_WHITESPACE))
+    stats.gc_count += (
+        segment.count(b"G")
+        + segment.count(b"C")
+        + segment.count(b"g")
+        + segment.count(b"c")
+    )
+    stats.n_count += segment.count(b"N") + segment.count(b"n")
+
+def iter_fasta_segments(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[Tuple[str, bytes]]:
+    """Yield ``(contig, raw_segment)`` pairs from a FASTA stream.
+
+    Works on whole chunks rather than lines, so memory is bounded by
+    ``chunk_size`` regardless of contig length. Segments still contain line
+    terminators; each contig starts with an empty segment.
+    """
+    contig: Optional[str] = None
+    pending_header: Optional[bytes] = None
+
+    for chunk in iter_chunks(stream, chunk_size, progress):
+        pos = 0
+        if pending_header is not None:
+            newline = chunk.find(b"\n")
+            if newline == -1:
+                pending_header += chunk
+                continue
+            contig, _ = _split_header(pending_header + chunk[:newline])
+            pending_header = None
+            yield contig, b""
+            pos = newline + 1
+
+        while pos < len(chunk):
+            marker = chunk.find(b">", pos)
+            segment = chunk[pos:] if marker == -1 else chunk[pos:marker]
+            if segment.strip():
+                if contig is None:
+                    raise ValueError("FASTA sequence data found before first header")
+                yield contig, segment
+            if marker == -1:
+                break
+            newline = chunk.find(b"\n", marker)
+            if newline == -1:
+                pending_header = chunk[marker + 1:]
+                break
+            contig, _ = _split_header(chunk[marker + 1:newline])
+            yield contig, b""
+            pos = newline + 1
+
+    if pending_header is not None:
+        contig, _ = _split_header(pending_header)
+        yield contig, b""
+
+def scan_fasta(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> List[SequenceStats]:
+    """Compute per-contig length and GC content in a single pass."""
+    contigs: List[SequenceStats] = []
+    for name, segment in iter_fasta_segments(stream, chunk_size, progress):
+        if not segment:
+            contigs.append(SequenceStats(name))
+        else:
+            count_bases(contigs[-1], segment)
+    return contigs
+
+def scan_fastq(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> SequenceStats:
+    """Aggregate read count, base count and GC content over a FASTQ file."""
+    stats = SequenceStats("reads", records=0)
+    for record in parse_fastq(stream, chunk_size, progress):
+        stats.records += 1
+        count_bases(stats, record.sequence.encode("ascii"))
+    return stats
+
+def summarize_contigs(contigs: List[SequenceStats]) -> SequenceStats:
+    """Combine per-contig statistics into a genome-wide total."""
+    total = SequenceStats("genome", records=0)
+    for contig in contigs:
+        total.length += contig.length
+        total.gc_count += contig.gc_count
+        total.n_count += contig.n_count
+        total.records += contig.records
+    return total
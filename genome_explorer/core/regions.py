@@ -0,0 +1,313 @@
+"""Vectorized set operations over many genomic regions, like bedtools."""
+
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from genome_explorer.core.intervals import IntervalIndex, _expand_ranges
+from genome_explorer.core.types import GenomeFeature, GenomeRegion
+from genome_explorer.core.vcf import open_vcf_stream
+
+# Chromosome code and position are packed into one sortable int64 key;
+# positions must stay below this span (about 10^12 bases)
+KEY_SPAN = 1 << 40
+
+STRAND_CODES = {"+": 1, "-": -1, None: 0, ".": 0}
+STRAND_NAMES = {1: "+", -1: "-", 0: None}
+
+class RegionSet:
+    """Half-open ``[start, end)`` regions held as parallel NumPy arrays.
+
+    Chromosomes are stored as integer codes into ``chromosomes`` and strands
+    as +1/-1/0. Operations sort once and then work on whole arrays; no
+    Python object is created per region until ``to_regions`` is called.
+    Set operations ignore strand; ``intersect`` and ``subtract`` keep the
+    strand of the regions they cut.
+    """
+
+    def __init__(
+        self,
+        chromosomes: List[str],
+        chroms: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        strands: Optional[np.ndarray] = None,
+    ) -> None:
+        self.chromosomes = list(chromosomes)
+        self.chroms = np.asarray(chroms, dtype=np.int32)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.ends = np.asarray(ends, dtype=np.int64)
+        if strands is None:
+            strands = np.zeros(len(self.starts), dtype=np.int8)
+        self.strands = np.asarray(strands, dtype=np.int8)
+        if np.any(self.ends < self.starts):
+            raise ValueError("Region end must not precede its start")
+
+    @classmethod
+    def from_arrays(
+        cls,
+        chroms: Iterable[str],
+        starts: Iterable[int],
+        ends: Iterable[int],
+        strands: Optional[Iterable[Optional[str]]] = None,
+    ) -> "RegionSet":
+        """Build a set from chromosome names and coordinates."""
+        names, codes = np.unique(np.asarray(list(chroms), dtype=str), return_inverse=True)
+        strand_codes = None
+        if strands is not None:
+            strand_codes = np.array(
+                [STRAND_CODES.get(s, 0) for s in strands], dtype=np.int8
+            )
+        return cls(
+            names.tolist(),
+            codes.ravel(),
+            np.asarray(starts, dtype=np.int64),
+            np.asarray(ends, dtype=np.int64),
+            strand_codes,
+        )
+
+    @classmethod
+    def from_regions(cls, regions: List[GenomeRegion]) -> "RegionSet":
+        return cls.from_arrays(
+            [r.chromosome for r in regions],
+            [r.start for r in regions],
+            [r.end for r in regions],
+            [r.strand for r in regions],
+        )
+
+    @classmethod
+    def from_features(cls, features: List[GenomeFeature]) -> "RegionSet":
+        return cls.from_regions([f.region for f in features])
+
+    @classmethod
+    def from_lengths(cls, lengths: Dict[str, int]) -> "RegionSet":
+        """One region spanning each whole chromosome."""
+        return cls(
+            list(lengths),
+            np.arange(len(lengths)),
+            np.zeros(len(lengths), dtype=np.int64),
+            np.fromiter(lengths.values(), dtype=np.int64, count=len(lengths)),
+        )
+
+    @classmethod
+    def read_bed(cls, source: Union[str, Path, BinaryIO]) -> "RegionSet":
+        """Read the first three columns (and strand, if present) of a BED file."""
+        # Imported here so loading the core package does not pull in pandas
+        import pandas as pd
+
+        if isinstance(source, (str, Path)):
+            with open(source, "rb") as handle:
+                return cls.read_bed(handle)
+
+        # Skip track/browser/comment lines, then hand the rest to pandas
+        stream = open_vcf_stream(source)
+        while True:
+            line = stream.readline()
+            if not line.startswith((b"track", b"browser", b"#")):
+                stream.seek(-len(line), 1)
+                break
+        if not line.strip():
+            return cls([], np.zeros(0), np.zeros(0), np.zeros(0))
+        fields = line.count(b"\t") + 1
+
+        table = pd.read_csv(
+            stream,
+            sep="\t",
+            header=None,
+            usecols=[column for column in (0, 1, 2, 5) if column < fields],
+            dtype={0: str},
+        )
+        strands = None
+        if fields > 5:
+            strands = table[5].map({"+": 1, "-": -1}).fillna(0).to_numpy(np.int8)
+        names, codes = np.unique(table[0].to_numpy(str), return_inverse=True)
+        return cls(
+            names.tolist(),
+            codes.ravel(),
+            table[1].to_numpy(np.int64),
+            table[2].to_numpy(np.int64),
+            strands,
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __repr__(self) -> str:
+        return f"RegionSet({len(self)} regions on {len(self.chromosomes)} chromosomes)"
+
+    def __cache_key__(self) -> tuple:
+        return (self.chromosomes, self.chroms, self.starts, self.ends, self.strands)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.ends - self.starts
+
+    def to_regions(self) -> List[GenomeRegion]:
+        return [
+            GenomeRegion(self.chromosomes[code], int(start), int(end), STRAND_NAMES[strand])
+            for code, start, end, strand in zip(
+                self.chroms.tolist(),
+                self.starts.tolist(),
+                self.ends.tolist(),
+                self.strands.tolist(),
+            )
+        ]
+
+    def to_features(self, feature_type: str = "region") -> List[GenomeFeature]:
+        """Features with ``chrom:start-end`` ids and no attributes."""
+        return [
+            GenomeFeature(
+                id=f"{region.chromosome}:{region.start}-{region.end}",
+                type=feature_type,
+                region=region,
+                attributes={},
+            )
+            for region in self.to_regions()
+        ]
+
+    def to_interval_index(self) -> IntervalIndex:
+        """Overlap index whose ids are positions in this set."""
+        names = np.asarray(self.chromosomes, dtype=str)[self.chroms]
+        return IntervalIndex.build(names, self.starts, self.ends)
+
+    def _recoded(self, chromosomes: List[str]) -> np.ndarray:
+        """This set's chromosome codes in another chromosome vocabulary."""
+        lookup = {name: code for code, name in enumerate(chromosomes)}
+        mapping = np.array([lookup[name] for name in self.chromosomes], dtype=np.int32)
+        return mapping[self.chroms] if len(mapping) else self.chroms
+
+    def _take(self, order: np.ndarray) -> "RegionSet":
+        return RegionSet(
+            self.chromosomes,
+            self.chroms[order],
+            self.starts[order],
+            self.ends[order],
+            self.strands[order],
+        )
+
+    def sort(self) -> "RegionSet":
+        """Regions ordered by chromosome name, start and end."""
+        rank = np.argsort(np.argsort(np.asarray(self.chromosomes, dtype=str)))
+        return self._take(np.lexsort((self.ends, self.starts, rank[self.chroms])))
+
+    def _keys(self, chroms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        offset = chroms.astype(np.int64) * KEY_SPAN
+        return offset + self.starts, offset + self.ends
+
+    def merge(self, distance: int = 0) -> "RegionSet":
+        """Union of overlapping regions (and those within ``distance`` bases).
+
+        After sorting by packed (chromosome, start) keys, a running maximum
+        of the end keys tells whether each region starts a new cluster; the
+        chromosome offset in the key stops clusters crossing chromosomes.
+        """
+        if not len(self):
+            return RegionSet(self.chromosomes, self.chroms, self.starts, self.ends)
+        start_keys, end_keys = self._keys(self.chroms)
+        order = np.lexsort((end_keys, start_keys))
+        start_keys, end_keys = start_keys[order], end_keys[order]
+        reach = np.maximum.accumulate(end_keys)
+        new_cluster = np.ones(len(order), dtype=bool)
+        new_cluster[1:] = start_keys[1:] > reach[:-1] + distance
+        first = np.flatnonzero(new_cluster)
+        last = np.append(first[1:], len(order)) - 1
+        return RegionSet(
+            self.chromosomes,
+            (start_keys[first] // KEY_SPAN).astype(np.int32),
+            start_keys[first] % KEY_SPAN,
+            reach[last] % KEY_SPAN,
+        )
+
+    def _clip_to(self, other: "RegionSet") -> "RegionSet":
+        """Pieces of each region of ``self`` covered by ``other``."""
+        names = list(dict.fromkeys(self.chromosomes + other.chromosomes))
+        merged = other.merge()
+        other_starts, other_ends = merged._keys(merged._recoded(names))
+        order = np.argsort(other_starts, kind="stable")
+        other_starts, other_ends = other_starts[order], other_ends[order]
+
+        own_chroms = self._recoded(names)
+        starts, ends = self._keys(own_chroms)
+        # Merged regions are disjoint, so the overlapping ones are contiguous
+        lo = np.searchsorted(other_ends, starts, side="right")
+        hi = np.searchsorted(other_starts, ends, side="left")
+        owner, pos = _expand_ranges(lo, hi)
+        piece_starts = np.maximum(starts[owner], other_starts[pos])
+        piece_ends = np.minimum(ends[owner], other_ends[pos])
+        keep = piece_ends > piece_starts
+        owner = owner[keep]
+        return RegionSet(
+            names,
+            own_chroms[owner],
+            piece_starts[keep] % KEY_SPAN,
+            piece_ends[keep] % KEY_SPAN,
+            self.strands[owner],
+        )
+
+    def intersect(self, other: "RegionSet") -> "RegionSet":
+        """Parts of each region that ``other`` also covers."""
+        return self._clip_to(other)
+
+    def _gaps(
+        self,
+        lengths: Optional[Dict[str, int]] = None,
+        chromosomes: Iterable[str] = (),
+    ) -> "RegionSet":
+        """Uncovered stretches of each chromosome; open-ended without lengths."""
+        names = list(
+            dict.fromkeys(self.chromosomes + list(chromosomes) + list(lengths or {}))
+        )
+        merged = self.merge()
+        chroms = merged._recoded(names)
+        order = np.lexsort((merged.starts, chroms))
+        chroms, starts, ends = chroms[order], merged.starts[order], merged.ends[order]
+
+        if lengths is None:
+            limits = np.full(len(names), KEY_SPAN - 1, dtype=np.int64)
+        else:
+            limits = np.array([lengths.get(name, 0) for name in names], dtype=np.int64)
+        # Each chromosome contributes one gap more than it has regions:
+        # before the first, between neighbours, and after the last
+        all_codes = np.arange(len(names), dtype=np.int32)
+        gap_chroms = np.concatenate((all_codes, chroms))
+        gap_starts = np.concatenate((np.zeros(len(names), dtype=np.int64), ends))
+        next_chrom = np.concatenate((chroms, all_codes))
+        next_start = np.minimum(np.concatenate((starts, limits)), limits[next_chrom])
+        # Pair each gap start with the following region start on its chromosome
+        first_order = np.lexsort((gap_starts, gap_chroms))
+        end_order = np.lexsort((next_start, next_chrom))
+        gap_chroms = gap_chroms[first_order]
+        gap_starts = gap_starts[first_order]
+        gap_ends = next_start[end_order]
+        keep = gap_ends > gap_starts
+        return RegionSet(names, gap_chroms[keep], gap_starts[keep], gap_ends[keep])
+
+    def subtract(self, other: "RegionSet") -> "RegionSet":
+        """Parts of each region that ``other`` does not cover."""
+        return self._clip_to(other._gaps(chromosomes=self.chromosomes))
+
+    def complement(self, lengths: Dict[str, int]) -> "RegionSet":
+        """Stretches of each chromosome (of the given lengths) not covered."""
+        return self._gaps(lengths)
+
+    def windows(self, size: int, step: Optional[int] = None) -> "RegionSet":
+        """Tile each region with ``size``-base windows every ``step`` bases.
+
+        Windows at the end of a region are clipped to it, like
+        ``bedtools makewindows``; use ``from_lengths`` to tile whole
+        chromosomes.
+        """
+        step = step or size
+        if size <= 0 or step <= 0:
+            raise ValueError("Window size and step must be positive")
+        counts = -(-self.lengths // step)
+        owner, offsets = _expand_ranges(np.zeros(len(self), dtype=np.int64), counts)
+        starts = self.starts[owner] + offsets * step
+        return RegionSet(
+            self.chromosomes,
+            self.chroms[owner],
+            starts,
+            np.minimum(starts + size, self.ends[owner]),
+            self.strands[owner],
+        )
@@ -0,0 +1,162 @@
+"""Process-wide registry for models and other heavy shared resources."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from genome_explorer.core.config import config
+
+@dataclass
+class ResourceStats:
+    """Usage counters for one resource key."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    load_seconds: float = 0.0
+    size: int = 0
+
+@dataclass
+class _Entry:
+    value: Any
+    size: int
+    last_used: float
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a resource, in bytes."""
+    parameters = getattr(value, "parameters", None)
+    if callable(parameters):
+        # torch modules (transformers, sentence-transformers)
+        try:
+            return sum(p.numel() * p.element_size() for p in parameters())
+        except (AttributeError, TypeError):
+            pass
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+class ResourceRegistry:
+    """Thread-safe, lazily loaded cache shared by every session.
+
+    Each key is loaded once, on first use, even when several sessions ask
+    for it at the same time. Entries idle for longer than ``ttl`` seconds
+    are dropped, and least recently used entries are evicted while the
+    total estimated size exceeds ``memory_budget``.
+    """
+
+    def __init__(
+        self, memory_budget: Optional[int] = None, ttl: Optional[int] = None
+    ) -> None:
+        self.memory_budget = (
+            config.model_memory_bytes if memory_budget is None else memory_budget
+        )
+        self.ttl = config.cache_ttl if ttl is None else ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._stats: Dict[str, ResourceStats] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+
+    def get(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        size: Optional[int] = None,
+    ) -> Any:
+        """Return the resource for ``key``, calling ``loader`` on a miss."""
+        with self._lock:
+            self._expire(time.monotonic())
+            value = self._lookup(key)
+            if value is not None:
+                return value
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Load outside the registry lock so other keys stay available
+        with key_lock:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    return value
+                stats = self._stats.setdefault(key, ResourceStats())
+                stats.misses += 1
+
+            started = time.perf_counter()
+            value = loader()
+            elapsed = time.perf_counter() - started
+            entry_size = estimate_size(value) if size is None else size
+
+            with self._lock:
+                stats.load_seconds += elapsed
+                stats.size = entry_size
+                self._entries[key] = _Entry(value, entry_size, time.monotonic())
+                self._evict_to_budget(keep=key)
+                self._loading.pop(key, None)
+        return value
+
+    def _lookup(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.last_used = time.monotonic()
+        self._entries.move_to_end(key)
+        self._stats.setdefault(key, ResourceStats()).hits += 1
+        return entry.value
+
+    def _expire(self, now: float) -> None:
+        for key in [k for k, e in self._entries.items() if now - e.last_used > self.ttl]:
+            self._drop(key)
+
+    def _evict_to_budget(self, keep: str) -> None:
+        while self.total_size > self.memory_budget:
+            victim = next((k for k in self._entries if k != keep), None)
+            if victim is None:
+                break
+            self._drop(victim)
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key)
+        self._stats[key].evictions += 1
+
+    @property
+    def total_size(self) -> int:
+        """Estimated bytes held by loaded resources."""
+        return sum(entry.size for entry in self._entries.values())
+
+    def evict(self, key: str) -> None:
+        """Drop one resource if it is loaded."""
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def clear(self) -> None:
+        """Drop every loaded resource (statistics are kept)."""
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-key counters plus totals and the overall hit rate."""
+        with self._lock:
+            hits = sum(s.hits for s in self._stats.values())
+            misses = sum(s.misses for s in self._stats.values())
+            return {
+                "resources": {
+                    key: {
+                        "loaded": key in self._entries,
+                        "hits": s.hits,
+                        "misses": s.misses,
+                        "evictions": s.evictions,
+                        "load_seconds": s.load_seconds,
+                        "size": s.size,
+                    }
+                    for key, s in self._stats.items()
+                },
+                "total_size": self.total_size,
+                "memory_budget": self.memory_budget,
+                "hit_rate": hits / (hits + misses) if hits + misses else None,
+            }
+
+# Global registry instance, shared by all sessions in this server process
+registry = ResourceRegistry()
@@ -0,0 +1,223 @@
+"""Sliding-window sequence statistics over packed genomes."""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from genome_explorer.core.config import config
+from genome_explorer.core.twobit import TwoBitGenome
+
+# Base codes used by the statistics; everything else counts as N
+A, C, G, T, N = range(5)
+BASE_CODES = np.full(256, N, dtype=np.uint8)
+for _code, _base in enumerate(b"ACGT"):
+    BASE_CODES[_base] = BASE_CODES[_base | 0x20] = _code
+
+# Bases fetched per step while scanning a chromosome
+SCAN_CHUNK = 1 << 22
+DEFAULT_WINDOW = 10_000
+DEFAULT_K = 4
+# Largest k whose spectrum (4**k counters) is kept
+MAX_K = 12
+
+def encode_bases(bases: np.ndarray) -> np.ndarray:
+    """ASCII bases (a uint8 array) as codes A=0, C=1, G=2, T=3, other=4."""
+    return BASE_CODES[bases]
+
+def block_counts(codes: np.ndarray, block: int) -> np.ndarray:
+    """Count of each base code (rows A, C, G, T) in consecutive blocks.
+
+    The sequence is padded to whole blocks and viewed as a 2-D array, so
+    each base is counted with one comparison and one row sum.
+    """
+    nblocks = -(-len(codes) // block)
+    padded = np.full(nblocks * block, N, dtype=np.uint8)
+    padded[: len(codes)] = codes
+    blocks = padded.reshape(nblocks, block)
+    return np.stack([(blocks == base).sum(axis=1) for base in (A, C, G, T)])
+
+def window_sums(
+    block_totals: np.ndarray, block: int, window: int, step: int, count: int
+) -> np.ndarray:
+    """Sums over ``count`` windows starting every ``step`` from per-block totals.
+
+    ``block`` must divide both ``window`` and ``step``; one cumulative sum
+    over the blocks then serves every window. Windows running past the end
+    are clipped.
+    """
+    totals = np.zeros(block_totals.shape[:-1] + (block_totals.shape[-1] + 1,), np.int64)
+    np.cumsum(block_totals, axis=-1, out=totals[..., 1:])
+    starts = np.arange(count, dtype=np.int64) * (step // block)
+    ends = np.minimum(starts + window // block, block_totals.shape[-1])
+    return totals[..., ends] - totals[..., starts]
+
+def kmer_codes(codes: np.ndarray, k: int) -> np.ndarray:
+    """Integer code of the k-mer starting at each position (-1 if it has an N).
+
+    The k-mers are read through a strided ``sliding_window_view``, never
+    copied out as strings; each column adds one base in base 4.
+    """
+    if len(codes) < k:
+        return np.zeros(0, dtype=np.int64)
+    view = sliding_window_view(codes, k)
+    kmers = np.zeros(len(view), dtype=np.int64)
+    invalid = np.zeros(len(view), dtype=bool)
+    for column in range(k):
+        bases = view[:, column]
+        kmers = kmers * 4 + (bases & 3)
+        invalid |= bases == N
+    kmers[invalid] = -1
+    return kmers
+
+def kmer_spectrum(codes: np.ndarray, k: int = DEFAULT_K) -> np.ndarray:
+    """Counts of every k-mer (indexed by its base-4 code) in a sequence."""
+    kmers = kmer_codes(codes, k)
+    return np.bincount(kmers[kmers >= 0], minlength=4**k)
+
+def kmer_label(code: int, k: int) -> str:
+    """The k-mer string for a base-4 code."""
+    return "".join("ACGT"[(code >> (2 * (k - 1 - i))) & 3] for i in range(k))
+
+def base_window_stats(
+    codes: np.ndarray, window: int, step: int, count: int
+) -> Dict[str, np.ndarray]:
+    """GC content, GC skew, CpG observed/expected and entropy per window.
+
+    ``codes`` must start at a window start. Bases are counted once per
+    block of ``gcd(window, step)`` bases and the blocks summed per window,
+    so the cost is linear in the sequence length whatever the window
+    size. Windows with no called bases (or no C/G for the ratios) are NaN.
+    """
+    block = math.gcd(window, step)
+    # A CpG is marked at its C
+    cpg = np.zeros(len(codes), dtype=bool)
+    cpg[:-1] = (codes[:-1] == C) & (codes[1:] == G)
+    nblocks = -(-len(codes) // block)
+    cpg_blocks = np.bincount(np.flatnonzero(cpg) // block, minlength=nblocks)
+
+    counts = window_sums(block_counts(codes, block), block, window, step, count)
+    cpg_counts = window_sums(cpg_blocks, block, window, step, count)
+    starts = np.arange(count, dtype=np.int64) * step
+    ends = np.minimum(starts + window, len(codes))
+    widths = ends - starts
+    # Both bases of a CpG must lie inside the window
+    cpg_counts -= cpg[ends - 1]
+
+    called = counts.sum(axis=0)
+    c_count, g_count = counts[C], counts[G]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fractions = counts / called
+        gc = (c_count + g_count) / called
+        gc_skew = (g_count - c_count) / (g_count + c_count)
+        cpg_oe = cpg_counts * called / (c_count * g_count)
+        entropy = -np.where(fractions > 0, fractions * np.log2(fractions), 0).sum(axis=0)
+    entropy[called == 0] = np.nan
+    cpg_oe[c_count * g_count == 0] = np.nan
+    return {
+        "gc": gc,
+        "gc_skew": gc_skew,
+        "cpg_oe": cpg_oe,
+        "entropy": entropy,
+        "n_fraction": 1 - called / np.maximum(widths, 1),
+    }
+
+@dataclass
+class WindowStats:
+    """Per-window statistics of one chromosome and its k-mer spectrum."""
+    chromosome: str
+    window: int
+    step: int
+    starts: np.ndarray
+    gc: np.ndarray
+    gc_skew: np.ndarray
+    cpg_oe: np.ndarray
+    entropy: np.ndarray
+    n_fraction: np.ndarray
+    kmer_counts: np.ndarray
+    k: int
+
+def chromosome_window_stats(
+    genome_dir: str,
+    chrom: str,
+    window: int = DEFAULT_WINDOW,
+    step: Optional[int] = None,
+    k: int = DEFAULT_K,
+    chunk_size: int = SCAN_CHUNK,
+) -> WindowStats:
+    """Scan one chromosome of a packed genome in bounded-memory chunks.
+
+    Takes the genome directory rather than a ``TwoBitGenome`` so it can
+    run in a worker process, which maps the files itself.
+    """
+    genome = TwoBitGenome(Path(genome_dir))
+    step = step or window
+    length = genome.lengths[chrom]
+    total_windows = -(-length // step) if length else 0
+    # Each chunk starts a whole number of windows and reads past its end
+    # far enough to finish its last window and k-mer
+    chunk_windows = max(1, chunk_size // step)
+    overlap = max(window - step, k - 1, 1)
+
+    parts: Dict[str, List[np.ndarray]] = {}
+    spectrum = np.zeros(4**k, dtype=np.int64)
+    for first in range(0, total_windows, chunk_windows):
+        count = min(chunk_windows, total_windows - first)
+        start = first * step
+        end = min(start + count * step + overlap, length)
+        codes = encode_bases(genome.fetch(chrom, start, end, soft_mask=False))
+        for name, values in base_window_stats(codes, window, step, count).items():
+            parts.setdefault(name, []).append(values)
+        owned = min(count * step, length - start)
+        kmers = kmer_codes(codes, k)[:owned]
+        spectrum += np.bincount(kmers[kmers >= 0], minlength=4**k)
+
+    def joined(name: str) -> np.ndarray:
+        return np.concatenate(parts[name]) if name in parts else np.zeros(0)
+
+    return WindowStats(
+        chromosome=chrom,
+        window=window,
+        step=step,
+        starts=np.arange(total_windows, dtype=np.int64) * step,
+        gc=joined("gc"),
+        gc_skew=joined("gc_skew"),
+        cpg_oe=joined("cpg_oe"),
+        entropy=joined("entropy"),
+        n_fraction=joined("n_fraction"),
+        kmer_counts=spectrum,
+        k=k,
+    )
+
+def genome_window_stats(
+    genome: TwoBitGenome,
+    window: int = DEFAULT_WINDOW,
+    step: Optional[int] = None,
+    k: int = DEFAULT_K,
+    num_workers: Optional[int] = None,
+) -> Dict[str, WindowStats]:
+    """Window statistics for every chromosome, one worker process per chromosome."""
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    if window <= 0 or (step is not None and step <= 0):
+        raise ValueError("Window size and step must be positive")
+    directory = str(genome.directory)
+    chroms = list(genome.lengths)
+    num_workers = min(num_workers or config.num_workers, len(chroms))
+    if num_workers <= 1:
+        return {
+            chrom: chromosome_window_stats(directory, chrom, window, step, k)
+            for chrom in chroms
+        }
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        # Longest chromosomes first so they do not finish last
+        ordered = sorted(chroms, key=lambda chrom: -genome.lengths[chrom])
+        futures = {
+            chrom: pool.submit(chromosome_window_stats, directory, chrom, window, step, k)
+            for chrom in ordered
+        }
+        return {chrom: futures[chrom].result() for chrom in chroms}
@@ -19,8 +19,7 @@ def init_session_state() -> None:
     # AI/ML state
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
-    if "model_cache" not in st.session_state:
-        st.session_state.model_cache = {}
+    # Models are shared process-wide through core.resources.registry
     
     # Simulation state
     if "simulation_params" not in st.session_state:
@@ -28,6 +27,8 @@ def init_session_state() -> None:
             "mutation_rate": 0.001,
             "population_size": 100,
             "generations": 10,
+            "seed": 0,
+            "fitness_model": "multiplicative",
         }
     
     # Education progress
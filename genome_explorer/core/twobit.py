@@ -0,0 +1,280 @@
+"""Memory-mapped 2-bit packed sequence store."""
+
+import json
+import re
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from genome_explorer.core.config import config
+from genome_explorer.core.parsers import (
+    CHUNK_SIZE,
+    SEQUENCE_WHITESPACE,
+    ProgressCallback,
+    SequenceStats,
+    iter_fasta_segments,
+)
+from genome_explorer.core.types import GenomeRegion
+
+# UCSC 2bit base order: T=0, C=1, A=2, G=3
+BASES = b"TCAG"
+INDEX_FILE = "index.json"
+
+# ASCII byte -> 2-bit code; anything outside ACGT is stored as an N run
+ENCODE_TABLE = np.zeros(256, dtype=np.uint8)
+VALID_BASES = np.zeros(256, dtype=bool)
+for _code, _base in enumerate(BASES):
+    for _byte in (_base, _base | 0x20):
+        ENCODE_TABLE[_byte] = _code
+        VALID_BASES[_byte] = True
+
+# Packed byte -> its four ASCII bases, most significant bits first
+DECODE_TABLE = np.frombuffer(BASES, dtype=np.uint8)[
+    (np.arange(256, dtype=np.uint8)[:, None] >> np.array([6, 4, 2, 0])) & 3
+]
+
+def packed_genome_dir(key: str, cache_dir: Optional[Path] = None) -> Path:
+    """Directory holding the packed copy of a genome."""
+    safe_key = re.sub(r"[^A-Za-z0-9._-]", "_", key)
+    return Path(cache_dir or config.cache_dir) / "twobit" / safe_key
+
+class _RunTracker:
+    """Accumulates [start, end) runs of a boolean mask across chunks."""
+
+    def __init__(self) -> None:
+        self.starts: List[np.ndarray] = []
+        self.ends: List[np.ndarray] = []
+        self._last_end = -1
+
+    def add(self, mask: np.ndarray, offset: int) -> None:
+        """Record runs of ``mask`` which starts at sequence ``offset``."""
+        edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1) + offset
+        ends = np.flatnonzero(edges == -1) + offset
+        if not len(starts):
+            return
+        if starts[0] == self._last_end:
+            # Continue the run that touched the previous chunk boundary
+            self.ends[-1][-1] = ends[0]
+            starts, ends = starts[1:], ends[1:]
+        if len(starts):
+            self.starts.append(starts)
+            self.ends.append(ends)
+        self._last_end = int(self.ends[-1][-1])
+
+    def to_array(self) -> np.ndarray:
+        """Runs as an ``(n, 2)`` int64 array of starts and ends."""
+        if not self.starts:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.stack(
+            [np.concatenate(self.starts), np.concatenate(self.ends)], axis=1
+        ).astype(np.int64)
+
+class TwoBitWriter:
+    """Streams sequences into a packed on-disk genome directory."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index: Dict[str, Dict[str, int]] = {}
+        self._name: Optional[str] = None
+        self._next_id = 0
+
+    def begin(self, name: str) -> None:
+        """Start a new sequence, finishing the previous one.
+
+        Raises ValueError if a sequence with the same name was already
+        written.
+        """
+        self._finish()
+        if name in self.index:
+            raise ValueError(f"Duplicate sequence name: {name}")
+        file_id = self._next_id
+        self._next_id += 1
+        self._name = name
+        self._file = open(self.directory / f"{file_id}.2bit", "wb")
+        self._leftover = np.zeros(0, dtype=np.uint8)
+        self._n_runs = _RunTracker()
+        self._mask_runs = _RunTracker()
+        self.index[name] = {"id": file_id, "length": 0, "gc_count": 0, "n_count": 0}
+
+    def write(self, segment: bytes) -> None:
+        """Append raw sequence bytes (line terminators are ignored)."""
+        raw = segment.translate(None, SEQUENCE_WHITESPACE)
+        bases = np.frombuffer(raw, dtype=np.uint8)
+        if not len(bases):
+            return
+        entry = self.index[self._name]
+        offset = entry["length"]
+
+        invalid = ~VALID_BASES[bases]
+        self._n_runs.add(invalid, offset)
+        self._mask_runs.add(bases >= ord("a"), offset)
+
+        codes = ENCODE_TABLE[bases]
+        entry["length"] += len(bases)
+        entry["n_count"] += int(np.count_nonzero(invalid))
+        entry["gc_count"] += int(np.count_nonzero((codes & 1) & ~invalid))
+
+        codes = np.concatenate((self._leftover, codes))
+        usable = len(codes) - len(codes) % 4
+        self._file.write(self._pack(codes[:usable]).tobytes())
+        self._leftover = codes[usable:]
+
+    def close(self) -> "TwoBitGenome":
+        """Finish writing and open the result for reading."""
+        self._finish()
+        with open(self.directory / INDEX_FILE, "w") as handle:
+            json.dump({"chromosomes": self.index}, handle)
+        return TwoBitGenome(self.directory)
+
+    @staticmethod
+    def _pack(codes: np.ndarray) -> np.ndarray:
+        return (codes[0::4] << 6) | (codes[1::4] << 4) | (codes[2::4] << 2) | codes[3::4]
+
+    def _finish(self) -> None:
+        if self._name is None:
+            return
+        if len(self._leftover):
+            padded = np.zeros(4, dtype=np.uint8)
+            padded[: len(self._leftover)] = self._leftover
+            self._file.write(self._pack(padded).tobytes())
+        self._file.close()
+        file_id = self.index[self._name]["id"]
+        np.save(self.directory / f"{file_id}.nruns.npy", self._n_runs.to_array())
+        np.save(self.directory / f"{file_id}.mask.npy", self._mask_runs.to_array())
+        self._name = None
+
+class TwoBitGenome:
+    """Read-only, memory-mapped view of a packed genome.
+
+    Nothing is read until a region is fetched, and then only the packed
+    bytes covering that region are touched.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        with open(self.directory / INDEX_FILE) as handle:
+            self.index: Dict[str, Dict[str, int]] = json.load(handle)["chromosomes"]
+        self._maps: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def lengths(self) -> Dict[str, int]:
+        """Sequence lengths by chromosome."""
+        return {name: entry["length"] for name, entry in self.index.items()}
+
+    def contig_stats(self) -> List[SequenceStats]:
+        """Per-contig composition recorded while packing."""
+        return [
+            SequenceStats(
+                name,
+                length=entry["length"],
+                gc_count=entry["gc_count"],
+                n_count=entry["n_count"],
+            )
+            for name, entry in self.index.items()
+        ]
+
+    def _open(self, chrom: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if chrom not in self._maps:
+            if chrom not in self.index:
+                raise KeyError(f"Unknown chromosome: {chrom}")
+            file_id = self.index[chrom]["id"]
+            packed_path = self.directory / f"{file_id}.2bit"
+            packed = (
+                np.memmap(packed_path, dtype=np.uint8, mode="r")
+                if packed_path.stat().st_size
+                else np.zeros(0, dtype=np.uint8)
+            )
+            self._maps[chrom] = (
+                packed,
+                np.load(self.directory / f"{file_id}.nruns.npy", mmap_mode="r"),
+                np.load(self.directory / f"{file_id}.mask.npy", mmap_mode="r"),
+            )
+        return self._maps[chrom]
+
+    def _clip(self, chrom: str, start: int, end: int) -> Tuple[int, int]:
+        length = self.index[chrom]["length"] if chrom in self.index else 0
+        start, end = max(0, start), min(end, length)
+        if end < start:
+            end = start
+        return start, end
+
+    def packed_view(self, chrom: str, start: int, end: int) -> Tuple[np.ndarray, int]:
+        """Zero-copy slice of packed bytes covering ``[start, end)``.
+
+        Returns the memmap slice and the offset of ``start`` within its first
+        byte's four bases.
+        """
+        packed, _, _ = self._open(chrom)
+        start, end = self._clip(chrom, start, end)
+        return packed[start // 4 : (end + 3) // 4], start % 4
+
+    def fetch(
+        self, chrom: str, start: int, end: int, soft_mask: bool = True
+    ) -> np.ndarray:
+        """Bases of ``[start, end)`` as a uint8 ASCII array.
+
+        Only the packed bytes overlapping the region are decoded. N runs are
+        restored, and soft-masked runs are lowercased unless ``soft_mask`` is
+        False.
+        """
+        _, n_runs, mask_runs = self._open(chrom)
+        view, shift = self.packed_view(chrom, start, end)
+        start, end = self._clip(chrom, start, end)
+        bases = DECODE_TABLE[view].ravel()[shift : shift + end - start]
+
+        n_mask = _runs_mask(n_runs, start, end)
+        if n_mask is not None:
+            bases[n_mask] = ord("N")
+        if soft_mask:
+            lower = _runs_mask(mask_runs, start, end)
+            if lower is not None:
+                bases[lower] |= 0x20
+        return bases
+
+    def fetch_region(self, region: GenomeRegion, soft_mask: bool = True) -> np.ndarray:
+        """Bases covered by a ``GenomeRegion``."""
+        return self.fetch(region.chromosome, region.start, region.end, soft_mask)
+
+    def fetch_sequence(self, chrom: str, start: int, end: int) -> str:
+        """Bases of ``[start, end)`` as a Python string."""
+        return self.fetch(chrom, start, end).tobytes().decode("ascii")
+
+def _runs_mask(runs: np.ndarray, start: int, end: int) -> Optional[np.ndarray]:
+    """Boolean mask of ``[start, end)`` covered by sorted, disjoint runs."""
+    if not len(runs):
+        return None
+    first = np.searchsorted(runs[:, 1], start, side="right")
+    last = np.searchsorted(runs[:, 0], end, side="left")
+    if first >= last:
+        return None
+    overlapping = runs[first:last]
+    delta = np.zeros(end - start + 1, dtype=np.int32)
+    np.add.at(delta, np.clip(overlapping[:, 0] - start, 0, end - start), 1)
+    np.add.at(delta, np.clip(overlapping[:, 1] - start, 0, end - start), -1)
+    return np.cumsum(delta[:-1]) > 0
+
+def pack_fasta(
+    stream: BinaryIO,
+    key: str,
+    cache_dir: Optional[Path] = None,
+    chunk_size: int = CHUNK_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> TwoBitGenome:
+    """Stream a FASTA file into the packed store under ``cache_dir``."""
+    writer = TwoBitWriter(packed_genome_dir(key, cache_dir))
+    for name, segment in iter_fasta_segments(stream, chunk_size, progress):
+        if not segment:
+            writer.begin(name)
+        else:
+            writer.write(segment)
+    return writer.close()
+
+def open_packed_genome(key: str, cache_dir: Optional[Path] = None) -> Optional[TwoBitGenome]:
+    """Open a previously packed genome, or None if it does not exist."""
+    directory = packed_genome_dir(key, cache_dir)
+    if not (directory / INDEX_FILE).exists():
+        return None
+    return TwoBitGenome(directory)
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, TypedDict, Union
 from datetime import datetime
 
 class GenomeFormat(str, Enum):
@@ -58,6 +58,14 @@ class SimulationState:
     fitness_scores: Dict[str, float]
     timestamp: datetime
 
+class SimulationParams(TypedDict):
+    """Simulation settings chosen in the Simulation Lab sidebar."""
+    mutation_rate: float
+    population_size: int
+    generations: int
+    seed: int
+    fitness_model: str
+
 @dataclass
 class EducationModule:
     """An educational module."""
@@ -76,4 +84,5 @@ ChromosomeID = str
 Position = int
 Sequence = str
 GenomeCoordinate = Tuple[ChromosomeID, Position]
+# Exact-coordinate lookup only; use IntervalIndex for overlap queries
 FeatureMap = Dict[GenomeCoordinate, List[GenomeFeature]] 
\ No newline at end of file
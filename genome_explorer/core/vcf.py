@@ -0,0 +1,299 @@
+"""Streaming VCF loader with a memory-mapped columnar cache."""
+
+import gzip
+import json
+import re
+import shutil
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+from genome_explorer.core.config import config
+from genome_explorer.core.parsers import ProgressCallback, stream_size
+
+META_FILE = "meta.json"
+BATCH_SIZE = 200_000
+DEFAULT_INFO_FIELDS = ("DP", "AF", "MQ")
+
+# Variant type codes stored in the ``type`` column
+SNP, MNP, INSERTION, DELETION, OTHER = range(5)
+VARIANT_TYPES = {
+    SNP: "SNP",
+    MNP: "MNP",
+    INSERTION: "insertion",
+    DELETION: "deletion",
+    OTHER: "other",
+}
+
+# Lowercase byte codes for transition/transversion classification
+PURINES = np.frombuffer(b"ag", dtype=np.uint8)
+PYRIMIDINES = np.frombuffer(b"ct", dtype=np.uint8)
+
+VCF_COLUMNS = ["CHROM", "POS", "ID", "REF", "ALT", "QUAL", "FILTER", "INFO"]
+
+def variant_table_dir(digest: str, cache_dir: Optional[Path] = None) -> Path:
+    """Directory holding the columnar copy of a VCF."""
+    safe_key = re.sub(r"[^A-Za-z0-9._-]", "_", digest)
+    return Path(cache_dir or config.cache_dir) / "variants" / safe_key
+
+def open_vcf_stream(stream: BinaryIO) -> BinaryIO:
+    """Transparently decompress gzip/BGZF input (BGZF is multi-member gzip)."""
+    magic = stream.read(2)
+    stream.seek(-len(magic), 1)
+    if magic == b"\x1f\x8b":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    return stream
+
+class _StringColumn:
+    """Arrow-style variable-length strings: one byte buffer plus offsets."""
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.lengths: List[np.ndarray] = []
+
+    def extend(self, values: "pd.Series") -> None:
+        encoded = values.str.encode("ascii")
+        self.chunks.append(b"".join(encoded))
+        self.lengths.append(encoded.str.len().to_numpy(dtype=np.int64))
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        lengths = np.concatenate(self.lengths) if self.lengths else np.zeros(0, np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        data = np.frombuffer(b"".join(self.chunks), dtype=np.uint8)
+        return {"data": data, "offsets": offsets}
+
+def _classify(ref_len: np.ndarray, alt: "pd.Series") -> np.ndarray:
+    """Variant type code from REF length and the first ALT allele."""
+    first_alt = alt.str.split(",", n=1).str[0]
+    alt_len = first_alt.str.len().to_numpy(dtype=np.int64)
+    symbolic = first_alt.str.contains(r"[<\[\]*.]", regex=True).to_numpy(dtype=bool)
+    types = np.full(len(alt), MNP, dtype=np.uint8)
+    types[(ref_len == 1) & (alt_len == 1)] = SNP
+    types[alt_len > ref_len] = INSERTION
+    types[alt_len < ref_len] = DELETION
+    types[symbolic] = OTHER
+    return types
+
+def parse_vcf(
+    stream: BinaryIO,
+    directory: Path,
+    info_fields: Sequence[str] = DEFAULT_INFO_FIELDS,
+    batch_size: int = BATCH_SIZE,
+    progress: Optional[ProgressCallback] = None,
+) -> "VariantTable":
+    """Stream a (possibly gzipped) VCF into column files in ``directory``.
+
+    Records are converted in batches by pandas' C parser; only the batch
+    being converted is held as text.
+    """
+    # Imported here so loading the core package does not pull in pandas
+    import pandas as pd
+
+    total = stream_size(stream) if progress else None
+    raw = stream
+    stream = open_vcf_stream(stream)
+    header_lines = 0
+    while True:
+        line = stream.readline()
+        if not line:
+            break
+        header_lines += 1
+        if line.startswith(b"#CHROM"):
+            break
+        if not line.startswith(b"#"):
+            raise ValueError("VCF header is missing the #CHROM line")
+
+    chrom_codes: Dict[str, int] = {}
+    dtypes = {
+        "chrom": np.int32,
+        "pos": np.int64,
+        "qual": np.float32,
+        "pass": bool,
+        "type": np.uint8,
+        "n_alleles": np.uint8,
+    }
+    columns: Dict[str, List[np.ndarray]] = {name: [] for name in dtypes}
+    info_columns: Dict[str, List[np.ndarray]] = {name: [] for name in info_fields}
+    ref_column, alt_column = _StringColumn(), _StringColumn()
+
+    batches = pd.read_csv(
+        stream,
+        sep="\t",
+        header=None,
+        names=VCF_COLUMNS,
+        usecols=range(len(VCF_COLUMNS)),
+        dtype={
+            "CHROM": str,
+            "POS": np.int64,
+            "REF": str,
+            "ALT": str,
+            "FILTER": str,
+            "INFO": str,
+        },
+        na_values={"QUAL": ["."]},
+        keep_default_na=False,
+        chunksize=batch_size,
+        engine="c",
+    )
+    for batch in batches:
+        for name in batch["CHROM"].unique():
+            chrom_codes.setdefault(name, len(chrom_codes))
+        columns["chrom"].append(batch["CHROM"].map(chrom_codes).to_numpy(np.int32))
+        columns["pos"].append(batch["POS"].to_numpy(np.int64))
+        columns["qual"].append(batch["QUAL"].to_numpy(np.float32))
+        columns["pass"].append(batch["FILTER"].isin(["PASS", "."]).to_numpy(bool))
+        ref_len = batch["REF"].str.len().to_numpy(np.int64)
+        columns["type"].append(_classify(ref_len, batch["ALT"]))
+        columns["n_alleles"].append(
+            (batch["ALT"].str.count(",") + 1).to_numpy(np.uint8)
+        )
+        for name in info_fields:
+            values = batch["INFO"].str.extract(rf"(?:^|;){re.escape(name)}=([^;,]*)")[0]
+            info_columns[name].append(
+                pd.to_numeric(values, errors="coerce").to_numpy(np.float32)
+            )
+        ref_column.extend(batch["REF"])
+        alt_column.extend(batch["ALT"])
+        if progress and hasattr(raw, "tell"):
+            progress(raw.tell(), total)
+
+    # Write into a scratch directory and rename, so readers never see a
+    # half-written table
+    directory = Path(directory)
+    scratch = directory.with_name(f".{directory.name}.{uuid.uuid4().hex}")
+    scratch.mkdir(parents=True)
+    arrays = {
+        name: np.concatenate(parts) if parts else np.zeros(0, dtypes[name])
+        for name, parts in columns.items()
+    }
+    arrays.update(
+        {
+            f"info_{name}": np.concatenate(parts) if parts else np.zeros(0, np.float32)
+            for name, parts in info_columns.items()
+        }
+    )
+    for prefix, column in (("ref", ref_column), ("alt", alt_column)):
+        arrays.update(
+            {f"{prefix}_{key}": value for key, value in column.arrays().items()}
+        )
+    for name, array in arrays.items():
+        np.save(scratch / f"{name}.npy", array)
+    with open(scratch / META_FILE, "w") as handle:
+        json.dump(
+            {
+                "chromosomes": list(chrom_codes),
+                "columns": list(arrays),
+                "info_fields": list(info_fields),
+                "header_lines": header_lines,
+            },
+            handle,
+        )
+    if directory.exists():
+        shutil.rmtree(directory)
+    scratch.rename(directory)
+    return VariantTable(directory)
+
+class VariantTable:
+    """Memory-mapped variant columns; opening costs only a metadata read."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        with open(self.directory / META_FILE) as handle:
+            meta = json.load(handle)
+        self.chromosomes: List[str] = meta["chromosomes"]
+        self.info_fields: List[str] = meta["info_fields"]
+        self._names: List[str] = meta["columns"]
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def open(cls, directory: Path) -> Optional["VariantTable"]:
+        """Open a cached table, or None if it does not exist."""
+        if not (Path(directory) / META_FILE).exists():
+            return None
+        return cls(directory)
+
+    def column(self, name: str) -> np.ndarray:
+        """A single column, memory-mapped on first access."""
+        if name not in self._columns:
+            if name not in self._names:
+                raise KeyError(f"Unknown variant column: {name}")
+            self._columns[name] = np.load(self.directory / f"{name}.npy", mmap_mode="r")
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self.column("pos"))
+
+    def allele(self, which: str, index: int) -> str:
+        """REF (``which="ref"``) or ALT string of one record."""
+        offsets = self.column(f"{which}_offsets")
+        data = self.column(f"{which}_data")
+        return data[offsets[index] : offsets[index + 1]].tobytes().decode("ascii")
+
+    def mask(
+        self,
+        chromosome: Optional[str] = None,
+        min_quality: Optional[float] = None,
+        pass_only: bool = False,
+        variant_type: Optional[int] = None,
+    ) -> np.ndarray:
+        """Boolean row filter built from column comparisons."""
+        keep = np.ones(len(self), dtype=bool)
+        if chromosome is not None:
+            if chromosome not in self.chromosomes:
+                return np.zeros(len(self), dtype=bool)
+            keep &= self.column("chrom") == self.chromosomes.index(chromosome)
+        if min_quality:
+            # Missing QUAL (NaN) fails any threshold
+            keep &= self.column("qual") >= min_quality
+        if pass_only:
+            keep &= self.column("pass")
+        if variant_type is not None:
+            keep &= self.column("type") == variant_type
+        return keep
+
+    def transition_mask(self) -> np.ndarray:
+        """SNPs that are transitions (A<->G, C<->T)."""
+        ref = self.column("ref_data")[self.column("ref_offsets")[:-1]] | 0x20
+        alt = self.column("alt_data")[self.column("alt_offsets")[:-1]] | 0x20
+        purine_pair = np.isin(ref, PURINES) & np.isin(alt, PURINES)
+        pyrimidine_pair = np.isin(ref, PYRIMIDINES) & np.isin(alt, PYRIMIDINES)
+        return (self.column("type") == SNP) & (purine_pair | pyrimidine_pair)
+
+    def summary(self, keep: Optional[np.ndarray] = None) -> Dict[str, object]:
+        """Vectorized counts over the (optionally filtered) records."""
+        if keep is None:
+            keep = np.ones(len(self), dtype=bool)
+        types = np.bincount(self.column("type")[keep], minlength=len(VARIANT_TYPES))
+        per_chrom = np.bincount(
+            self.column("chrom")[keep], minlength=len(self.chromosomes)
+        )
+        transitions = int(np.count_nonzero(self.transition_mask() & keep))
+        transversions = int(types[SNP]) - transitions
+        quality = self.column("qual")[keep]
+        called = quality[~np.isnan(quality)]
+        return {
+            "total_variants": int(np.count_nonzero(keep)),
+            "by_type": {VARIANT_TYPES[code]: int(n) for code, n in enumerate(types)},
+            "by_chromosome": dict(zip(self.chromosomes, per_chrom.tolist())),
+            "ts_tv_ratio": transitions / transversions if transversions else None,
+            "mean_quality": float(called.mean()) if len(called) else None,
+        }
+
+def load_vcf(
+    stream: BinaryIO,
+    digest: str,
+    cache_dir: Optional[Path] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> VariantTable:
+    """Open the cached columns for ``digest``, parsing the VCF only once."""
+    directory = variant_table_dir(digest, cache_dir)
+    table = VariantTable.open(directory)
+    if table is None:
+        table = parse_vcf(stream, directory, progress=progress)
+    return table
@@ -6,6 +6,7 @@ from typing import Dict, List, Optional
 from genome_explorer.core import (
     EducationModule,
     get_state,
+    profiled,
     set_state,
 )
 
@@ -92,6 +93,7 @@ def render_module_quiz(module: EducationModule) -> None:
             module.score = 100.0
             st.balloons()
 
+@profiled
 def render() -> None:
     """Render the learning hub page."""
     st.title("Genomics Learning Hub")
@@ -3,15 +3,28 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from genome_explorer.core import (
-    GenomeFeature,
+    JobContext,
+    SequenceStats,
+    collect_job,
     get_state,
+    job_manager,
+    poll_jobs,
+    profiled,
     set_state,
 )
+from genome_explorer.reports.pipeline import (
+    DEFAULT_STAGES,
+    ReportInputs,
+    ReportPipeline,
+)
+from genome_explorer.visualization.downsample import scatter_trace
+
+REPORT_PIPELINE = ReportPipeline(DEFAULT_STAGES)
 
-def render_report_options() -> Dict[str, bool]:
+def render_report_options() -> Dict[str, Any]:
     """Render report configuration options."""
     st.sidebar.subheader("Report Options")
     
@@ -20,60 +33,179 @@ def render_report_options() -> Dict[str, bool]:
         "include_genes": st.sidebar.checkbox("Include Genes", value=True),
         "include_stats": st.sidebar.checkbox("Include Statistics", value=True),
         "include_viz": st.sidebar.checkbox("Include Visualizations", value=True),
+        "include_sequence": st.sidebar.checkbox("Include Sequence Statistics", value=False),
+        "window_size": st.sidebar.select_slider(
+            "Window Size (bp)",
+            options=[1_000, 5_000, 10_000, 50_000, 100_000],
+            value=10_000,
+        ),
+        "kmer_size": st.sidebar.slider("k-mer Size", min_value=1, max_value=8, value=4),
+        "min_quality": st.sidebar.slider(
+            "Minimum Variant Quality", min_value=0, max_value=100, value=0
+        ),
+        "pass_only": st.sidebar.checkbox("PASS Variants Only", value=False),
     }
     
     return options
 
-def generate_report(genome_file: str, options: Dict[str, bool]) -> Dict:
-    """Generate genome analysis report."""
-    # TODO: Implement actual report generation
+def generate_report(
+    context: JobContext,
+    genome_file: str,
+    options: Dict[str, Any],
+    contigs: Optional[List[SequenceStats]] = None,
+    variant_table_dir: Optional[str] = None,
+    packed_genome_dir: Optional[str] = None,
+    feature_index_dir: Optional[str] = None,
+) -> Dict:
+    """Generate genome analysis report; runs as a background job."""
+    inputs = ReportInputs(
+        genome_file,
+        contigs or [],
+        variant_table_dir,
+        packed_genome_dir,
+        feature_index_dir,
+    )
+    status: Dict[str, str] = {}
+    
+    def on_stage(name: str, state: str) -> None:
+        status[name] = state
+        done = sum(value != "running" for value in status.values())
+        context.progress(done / len(REPORT_PIPELINE.stages), f"{name}: {state}")
+    
+    results = REPORT_PIPELINE.run(inputs, options, on_stage=on_stage)
+    
+    stats = results.get("stats", {})
+    genes = results.get("genes", {})
+    variants = results.get("variants", {})
     return {
         "summary": {
-            "total_genes": 1000,
-            "total_variants": 50,
-            "gc_content": 0.42,
+            "total_genes": genes.get("total_genes"),
+            "total_variants": variants.get("total_variants"),
+            "gc_content": stats.get("gc_content"),
+            "total_length": stats.get("total_length"),
         },
-        "features": [
-            GenomeFeature(
-                id="gene1",
-                type="gene",
-                region=None,
-                attributes={"name": "Example"},
-            )
-        ],
+        "genes_by_chromosome": genes.get("by_chromosome", {}),
+        "variants": variants if variants.get("total_variants") is not None else None,
+        "visualizations": results.get("visualizations"),
+        "sequence": results.get("sequence"),
+        "stage_status": status,
     }
 
 def render_report_summary(report: Dict) -> None:
     """Render report summary section."""
     st.subheader("Genome Summary")
     
+    summary = report["summary"]
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Total Genes", report["summary"]["total_genes"])
+        if summary["total_genes"] is not None:
+            st.metric("Total Genes", summary["total_genes"])
     
     with col2:
-        st.metric("Total Variants", report["summary"]["total_variants"])
+        if summary["total_variants"] is not None:
+            st.metric("Total Variants", summary["total_variants"])
     
     with col3:
-        st.metric("GC Content", f"{report['summary']['gc_content']:.2%}")
+        if summary["gc_content"] is not None:
+            st.metric("GC Content", f"{summary['gc_content']:.2%}")
+    
+    status = report.get("stage_status", {})
+    if status:
+        st.caption(
+            " · ".join(f"{stage}: {state}" for stage, state in status.items())
+        )
+
+def render_variant_summary(variants: Dict) -> None:
+    """Render variant type and chromosome breakdown."""
+    st.subheader("Variant Summary")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.dataframe(
+            pd.DataFrame(
+                list(variants["by_type"].items()), columns=["Type", "Count"]
+            )
+        )
+    
+    with col2:
+        if variants["ts_tv_ratio"] is not None:
+            st.metric("Ts/Tv Ratio", f"{variants['ts_tv_ratio']:.2f}")
+        if variants["mean_quality"] is not None:
+            st.metric("Mean Quality", f"{variants['mean_quality']:.1f}")
+
+def render_report_visualizations(viz: Dict) -> None:
+    """Render per-contig GC content chart."""
+    st.subheader("Contig GC Content")
+    
+    fig = go.Figure()
+    fig.add_trace(
+        go.Bar(
+            x=viz["contig_names"],
+            y=viz["contig_gc"],
+            customdata=viz["contig_lengths"],
+            hovertemplate="%{x}<br>GC %{y:.2%}<br>%{customdata:,} bp",
+            name="GC Content",
+        )
+    )
+    
+    fig.update_layout(
+        xaxis_title="Contig",
+        yaxis_title="GC Content",
+        yaxis_tickformat=".0%",
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
 
-def render_feature_table(features: List[GenomeFeature]) -> None:
-    """Render feature table."""
+def render_sequence_stats(sequence: Dict) -> None:
+    """Render windowed sequence statistics and the k-mer spectrum."""
+    st.subheader("Sequence Statistics")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Distinct k-mers", f"{sequence['distinct_kmers']:,}")
+    for col, label, key in [
+        (col2, "Mean GC Skew", "mean_gc_skew"),
+        (col3, "Mean CpG o/e", "mean_cpg_oe"),
+        (col4, "Mean Entropy (bits)", "mean_entropy"),
+    ]:
+        if sequence[key] is not None:
+            col.metric(label, f"{sequence[key]:.3f}")
+    
+    windows = sequence["windows"]
+    chrom = st.selectbox("Chromosome", options=list(windows))
+    stats = windows[chrom]
+    fig = go.Figure()
+    for name, label in [("gc", "GC content"), ("gc_skew", "GC skew"), ("cpg_oe", "CpG o/e")]:
+        fig.add_trace(
+            scatter_trace(stats.starts, getattr(stats, name), mode="lines", name=label)
+        )
+    fig.update_layout(
+        title=f"{chrom} in {stats.window:,} bp windows",
+        xaxis_title="Position",
+        showlegend=True,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    if sequence["top_kmers"]:
+        kmers, counts = zip(*sequence["top_kmers"])
+        fig = go.Figure(go.Bar(x=list(kmers), y=list(counts), name="Count"))
+        fig.update_layout(
+            title=f"Most Frequent {sequence['k']}-mers",
+            xaxis_title="k-mer",
+            yaxis_title="Count",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+def render_gene_counts(by_chromosome: Dict[str, int]) -> None:
+    """Render annotated genes per chromosome."""
     st.subheader("Genomic Features")
     
-    # Convert features to dataframe
-    df = pd.DataFrame([
-        {
-            "ID": f.id,
-            "Type": f.type,
-            "Name": f.attributes.get("name", ""),
-        }
-        for f in features
-    ])
-    
-    st.dataframe(df)
+    st.dataframe(
+        pd.DataFrame(list(by_chromosome.items()), columns=["Chromosome", "Genes"])
+    )
 
+@profiled
 def render() -> None:
     """Render the genome reports page."""
     st.title("Genome Analysis Reports")
@@ -88,16 +220,42 @@ def render() -> None:
     # Report options
     options = render_report_options()
     
-    # Generate report button
-    if st.button("Generate Report"):
-        with st.spinner("Generating report..."):
-            report = generate_report(current_genome, options)
-            set_state("current_report", report)
-            st.success("Report generated!")
+    # Reports build in a background job; option toggles only recompute
+    # the stages that depend on them
+    stale = get_state("current_report") and options != get_state("current_report_options")
+    if st.button("Generate Report") or stale:
+        inputs = (
+            current_genome,
+            options,
+            get_state("genome_contigs"),
+            get_state("variant_table_dir"),
+            get_state("packed_genome_dir"),
+            get_state("feature_index_dir"),
+        )
+        set_state(
+            "report_job",
+            job_manager.submit("report", generate_report, *inputs, key=inputs),
+        )
+        set_state("report_job_options", options)
+    
+    report = collect_job("report_job", "Report")
+    if report is not None:
+        set_state("current_report", report)
+        set_state("current_report_options", get_state("report_job_options"))
+        st.success("Report generated!")
     
     # Display report
     report = get_state("current_report")
     if report:
         render_report_summary(report)
-        if options["include_genes"]:
-            render_feature_table(report["features"]) 
\ No newline at end of file
+        if options["include_genes"] and report.get("genes_by_chromosome"):
+            render_gene_counts(report["genes_by_chromosome"])
+        if options["include_variants"] and report.get("variants"):
+            render_variant_summary(report["variants"])
+        if options["include_viz"] and report.get("visualizations"):
+            render_report_visualizations(report["visualizations"])
+        sequence = report.get("sequence")
+        if options["include_sequence"] and sequence and sequence["windows"]:
+            render_sequence_stats(sequence) 
+    
+    poll_jobs(["report_job"])
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""Staged, disk-memoized report generation pipeline."""
+
+import hashlib
+import json
+import pickle
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from genome_explorer.core import (
+    IntervalIndex,
+    SequenceStats,
+    TwoBitGenome,
+    VariantTable,
+    config,
+    genome_window_stats,
+    hash_value,
+    kmer_label,
+    summarize_contigs,
+)
+
+# k-mers listed in the report, most frequent first
+TOP_KMERS = 20
+
+def artifact_digest(directory: Optional[str]) -> Optional[str]:
+    """Digest of an on-disk artifact from its file names, sizes and mtimes.
+
+    Artifacts are written once and renamed into place, so a rebuilt or
+    replaced artifact always changes the digest.
+    """
+    if not directory or not Path(directory).is_dir():
+        return None
+    root = Path(directory)
+    listing = [
+        (str(path.relative_to(root)), stat.st_size, stat.st_mtime_ns)
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+        for stat in (path.stat(),)
+    ]
+    return hashlib.sha256(json.dumps(listing).encode()).hexdigest()[:16]
+
+@dataclass
+class ReportInputs:
+    """Everything the report stages read."""
+    genome_file: str
+    contigs: List[SequenceStats] = field(default_factory=list)
+    variant_table_dir: Optional[str] = None
+    packed_genome_dir: Optional[str] = None
+    feature_index_dir: Optional[str] = None
+
+    def input_digest(self, name: str) -> Optional[str]:
+        """Digest of one input field; ``*_dir`` fields hash the artifact."""
+        value = getattr(self, name)
+        if name.endswith("_dir"):
+            return artifact_digest(value)
+        return hash_value(value)[:16]
+
+@dataclass
+class ReportStage:
+    """A named, memoized step of the report pipeline.
+
+    ``inputs`` names the ``ReportInputs`` fields the stage reads,
+    ``options`` the report options it receives and ``depends_on`` the
+    upstream stages whose results it receives. A stage is only recomputed
+    when one of those inputs, its options, or an upstream result key change.
+    """
+    name: str
+    func: Callable[[ReportInputs, Dict[str, Any], Dict[str, Any]], Any]
+    inputs: Tuple[str, ...] = ()
+    options: Tuple[str, ...] = ()
+    depends_on: Tuple[str, ...] = ()
+    enabled_by: Optional[str] = None
+
+class ReportPipeline:
+    """Runs report stages in order, caching each result on disk.
+
+    Results are pickled under ``cache_dir/reports/<stage>/<key>.pkl`` and
+    expire after ``ttl`` seconds (``AppConfig.cache_ttl`` by default). The
+    key hashes only what the stage reads, so any session with the same
+    inputs (a VCF alone, say) reuses the result.
+    """
+
+    def __init__(
+        self,
+        stages: List[ReportStage],
+        cache_dir: Optional[Path] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        self.stages = stages
+        self.cache_dir = Path(cache_dir or config.cache_dir) / "reports"
+        self.ttl = config.cache_ttl if ttl is None else ttl
+        self.last_status: Dict[str, str] = {}
+
+    def stage_key(
+        self,
+        stage: ReportStage,
+        inputs: ReportInputs,
+        options: Dict[str, Any],
+        upstream_keys: List[str],
+    ) -> str:
+        """Cache key for one stage given its inputs, options and upstream keys."""
+        payload = json.dumps(
+            {
+                "stage": stage.name,
+                "inputs": {name: inputs.input_digest(name) for name in stage.inputs},
+                "options": {name: options.get(name) for name in stage.options},
+                "upstream": upstream_keys,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def _cache_path(self, stage: ReportStage, key: str) -> Path:
+        return self.cache_dir / stage.name / f"{key}.pkl"
+
+    def _load(self, path: Path) -> Tuple[bool, Any]:
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return False, None
+            with open(path, "rb") as handle:
+                return True, pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False, None
+
+    def _store(self, path: Path, value: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as handle:
+            pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    def run(
+        self,
+        inputs: ReportInputs,
+        options: Dict[str, Any],
+        on_stage: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Run all enabled stages, reusing cached results where possible.
+
+        ``on_stage(name, status)`` is called as each stage starts
+        ("running") and with its final status.
+        """
+        results: Dict[str, Any] = {}
+        keys: Dict[str, str] = {}
+        status: Dict[str, str] = {}
+
+        def report(name: str, state: str) -> None:
+            status[name] = state
+            if on_stage:
+                on_stage(name, state)
+
+        for stage in self.stages:
+            if stage.enabled_by and not options.get(stage.enabled_by, False):
+                report(stage.name, "skipped")
+                continue
+            missing = [name for name in stage.depends_on if name not in results]
+            if missing:
+                report(stage.name, "skipped")
+                continue
+
+            stage_options = {name: options.get(name) for name in stage.options}
+            upstream = {name: results[name] for name in stage.depends_on}
+            keys[stage.name] = self.stage_key(
+                stage, inputs, options, [keys[name] for name in stage.depends_on]
+            )
+            path = self._cache_path(stage, keys[stage.name])
+
+            hit, value = self._load(path)
+            if not hit:
+                report(stage.name, "running")
+                value = stage.func(inputs, stage_options, upstream)
+                self._store(path, value)
+            results[stage.name] = value
+            report(stage.name, "cached" if hit else "computed")
+        self.last_status = status
+        return results
+
+def compute_stats(
+    inputs: ReportInputs, options: Dict[str, Any], upstream: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Genome-wide length and base composition."""
+    total = summarize_contigs(inputs.contigs)
+    return {
+        "total_length": total.length,
+        "gc_content": total.gc_content,
+        "n_fraction": total.n_count / total.length if total.length else 0.0,
+        "num_contigs": len(inputs.contigs),
+    }
+
+def compute_gene_counts(
+    inputs: ReportInputs, options: Dict[str, Any], upstream: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Gene totals per chromosome from the uploaded BED annotation track."""
+    if not inputs.feature_index_dir:
+        return {"total_genes": None, "by_chromosome": {}}
+    index = IntervalIndex.load(Path(inputs.feature_index_dir))
+    counts = np.diff(index.chrom_offsets)
+    return {
+        "total_genes": len(index),
+        "by_chromosome": dict(zip(index.chromosomes, counts.tolist())),
+    }
+
+def compute_variant_summary(
+    inputs: ReportInputs, options: Dict[str, Any], upstream: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Variant totals, filtered on the memory-mapped VCF columns."""
+    table = (
+        VariantTable.open(Path(inputs.variant_table_dir))
+        if inputs.variant_table_dir
+        else None
+    )
+    if table is None:
+        return {"total_variants": None}
+    keep = table.mask(
+        min_quality=options["min_quality"],
+        pass_only=bool(options["pass_only"]),
+    )
+    return table.summary(keep)
+
+def compute_sequence_stats(
+    inputs: ReportInputs, options: Dict[str, Any], upstream: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Windowed GC skew, CpG o/e and entropy tracks plus the k-mer spectrum."""
+    if not inputs.packed_genome_dir:
+        return {"windows": None}
+    genome = TwoBitGenome(Path(inputs.packed_genome_dir))
+    k = int(options["kmer_size"])
+    windows = genome_window_stats(genome, int(options["window_size"]), k=k)
+    if not windows:
+        return {"windows": None}
+    spectrum = np.sum([stats.kmer_counts for stats in windows.values()], axis=0)
+    top = [code for code in np.argsort(spectrum)[::-1][:TOP_KMERS] if spectrum[code]]
+
+    def genome_mean(name: str) -> Optional[float]:
+        values = np.concatenate([getattr(stats, name) for stats in windows.values()])
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else None
+
+    return {
+        "windows": windows,
+        "k": k,
+        "top_kmers": [(kmer_label(int(code), k), int(spectrum[code])) for code in top],
+        "distinct_kmers": int(np.count_nonzero(spectrum)),
+        "mean_gc_skew": genome_mean("gc_skew"),
+        "mean_cpg_oe": genome_mean("cpg_oe"),
+        "mean_entropy": genome_mean("entropy"),
+    }
+
+def compute_visualizations(
+    inputs: ReportInputs, options: Dict[str, Any], upstream: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Plot-ready data: per-contig length and GC content."""
+    contigs = inputs.contigs
+    return {
+        "contig_names": [c.name for c in contigs],
+        "contig_lengths": np.array([c.length for c in contigs], dtype=np.int64),
+        "contig_gc": np.array([c.gc_content for c in contigs], dtype=np.float64),
+    }
+
+DEFAULT_STAGES = [
+    ReportStage(
+        "stats", compute_stats, inputs=("contigs",), enabled_by="include_stats"
+    ),
+    ReportStage(
+        "genes",
+        compute_gene_counts,
+        inputs=("feature_index_dir",),
+        enabled_by="include_genes",
+    ),
+    ReportStage(
+        "variants",
+        compute_variant_summary,
+        inputs=("variant_table_dir",),
+        options=("min_quality", "pass_only"),
+        enabled_by="include_variants",
+    ),
+    ReportStage(
+        "sequence",
+        compute_sequence_stats,
+        inputs=("packed_genome_dir",),
+        options=("window_size", "kmer_size"),
+        enabled_by="include_sequence",
+    ),
+    ReportStage(
+        "visualizations",
+        compute_visualizations,
+        inputs=("contigs",),
+        enabled_by="include_viz",
+    ),
+]
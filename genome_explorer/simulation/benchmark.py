@@ -0,0 +1,71 @@
+"""Throughput benchmark for the fitness models.
+
+Run ``python -m genome_explorer.simulation.benchmark`` to print
+individuals × loci scored per second for each model.
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from genome_explorer.simulation.fitness import FITNESS_MODELS, make_fitness_model
+
+DEFAULT_POPULATIONS = (10_000, 100_000, 1_000_000)
+DEFAULT_LOCI = 64
+
+def benchmark_models(
+    population_sizes: Sequence[int] = DEFAULT_POPULATIONS,
+    num_loci: int = DEFAULT_LOCI,
+    repeats: int = 3,
+    models: Optional[Sequence[str]] = None,
+    allele_frequency: float = 0.2,
+    seed: int = 0,
+) -> List[Dict[str, float]]:
+    """Best-of-``repeats`` timing of each model on random genotype matrices."""
+    rng = np.random.default_rng(seed)
+    selection = rng.normal(-0.005, 0.01, num_loci)
+    rows = []
+    for population_size in population_sizes:
+        genotypes = (rng.random((population_size, num_loci)) < allele_frequency).astype(
+            np.uint8
+        )
+        for name in models or FITNESS_MODELS:
+            model = make_fitness_model(name, selection, rng)
+            model.fitness(genotypes[: min(population_size, 1024)])  # warm up
+            best = np.inf
+            for _ in range(repeats):
+                started = time.perf_counter()
+                model.fitness(genotypes)
+                best = min(best, time.perf_counter() - started)
+            rows.append(
+                {
+                    "model": name,
+                    "individuals": population_size,
+                    "loci": num_loci,
+                    "seconds": best,
+                    "cells_per_second": population_size * num_loci / best,
+                }
+            )
+    return rows
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--population", type=int, nargs="+", default=list(DEFAULT_POPULATIONS)
+    )
+    parser.add_argument("--loci", type=int, default=DEFAULT_LOCI)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--models", nargs="+", choices=list(FITNESS_MODELS))
+    args = parser.parse_args(argv)
+
+    print(f"{'model':<15}{'individuals':>12}{'loci':>6}{'ms':>10}{'cells/s':>14}")
+    for row in benchmark_models(args.population, args.loci, args.repeats, args.models):
+        print(
+            f"{row['model']:<15}{row['individuals']:>12,}{row['loci']:>6}"
+            f"{row['seconds'] * 1000:>10.1f}{row['cells_per_second']:>14.3e}"
+        )
+
+if __name__ == "__main__":
+    main()
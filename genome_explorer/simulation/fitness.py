@@ -0,0 +1,186 @@
+"""Fitness models evaluated over whole genotype matrices."""
+
+import abc
+from typing import Dict, Optional, Type
+
+import numpy as np
+
+# Rows of the genotype matrix evaluated at once
+FITNESS_BLOCK = 1 << 16
+# Floor for additive fitness, which can otherwise reach zero or below
+MIN_FITNESS = 1e-6
+
+class FitnessModel(abc.ABC):
+    """Maps a ``(N, L)`` 0/1 genotype matrix to per-individual fitness.
+
+    Subclasses implement ``log_fitness`` for one float32 block of rows as a
+    few matrix products; ``fitness`` applies it block by block so the
+    float copy of the matrix stays bounded.
+    """
+
+    name = "base"
+
+    def __init__(self, effects: np.ndarray) -> None:
+        self.effects = np.asarray(effects, dtype=np.float64)
+
+    @property
+    def num_loci(self) -> int:
+        return len(self.effects)
+
+    @property
+    def main_effects(self) -> np.ndarray:
+        """Log-fitness change of a single derived allele on its own."""
+        return np.log1p(self.effects)
+
+    @abc.abstractmethod
+    def log_fitness(self, block: np.ndarray) -> np.ndarray:
+        """Per-row log fitness of one float32 block of the genotype matrix."""
+
+    def fitness(self, genotypes: np.ndarray) -> np.ndarray:
+        """Per-individual fitness of a genotype matrix."""
+        log_w = np.empty(len(genotypes), dtype=np.float64)
+        for lo in range(0, len(genotypes), FITNESS_BLOCK):
+            block = genotypes[lo : lo + FITNESS_BLOCK].astype(np.float32)
+            log_w[lo : lo + len(block)] = self.log_fitness(block)
+        return np.exp(log_w)
+
+    def summary(self, fitness: np.ndarray) -> Dict[str, float]:
+        """Population statistics for ``SimulationState.fitness_scores``."""
+        best = float(fitness.max())
+        return {
+            "avg": float(fitness.mean()),
+            "min": float(fitness.min()),
+            "max": best,
+            "std": float(fitness.std()),
+            "median": float(np.median(fitness)),
+            # Genetic load: shortfall of mean fitness relative to the fittest
+            "load": 1.0 - float(fitness.mean()) / best if best > 0 else 0.0,
+        }
+
+class MultiplicativeModel(FitnessModel):
+    """``w = prod(1 + s_i)`` over derived alleles: additive in log space."""
+
+    name = "multiplicative"
+
+    def __init__(self, effects: np.ndarray) -> None:
+        super().__init__(np.clip(effects, -0.99, None))
+        self._weights = self.main_effects.astype(np.float32)
+
+    def log_fitness(self, block: np.ndarray) -> np.ndarray:
+        return block @ self._weights
+
+class AdditiveModel(FitnessModel):
+    """``w = 1 + sum(s_i)`` over derived alleles, floored above zero."""
+
+    name = "additive"
+
+    def __init__(self, effects: np.ndarray) -> None:
+        super().__init__(effects)
+        self._weights = self.effects.astype(np.float32)
+
+    def log_fitness(self, block: np.ndarray) -> np.ndarray:
+        log_w: np.ndarray = np.log(np.maximum(1.0 + block @ self._weights, MIN_FITNESS))
+        return log_w
+
+class EpistaticModel(FitnessModel):
+    """Multiplicative main effects plus pairwise interactions in log space.
+
+    ``log w = g · log(1 + s) + g · E · g`` for a strictly upper-triangular
+    interaction matrix ``E``; the quadratic term is one matrix product and
+    a row-wise dot.
+    """
+
+    name = "epistatic"
+
+    def __init__(self, effects: np.ndarray, interactions: np.ndarray) -> None:
+        super().__init__(np.clip(effects, -0.99, None))
+        interactions = np.triu(np.asarray(interactions, dtype=np.float64), k=1)
+        if interactions.shape != (self.num_loci, self.num_loci):
+            raise ValueError("Interaction matrix must be num_loci x num_loci")
+        self.interactions = interactions
+        self._weights = self.main_effects.astype(np.float32)
+        self._pairs = interactions.astype(np.float32)
+
+    @classmethod
+    def from_pairs(
+        cls,
+        effects: np.ndarray,
+        first: np.ndarray,
+        second: np.ndarray,
+        values: np.ndarray,
+    ) -> "EpistaticModel":
+        """Build from sparse ``(i, j, epsilon)`` interaction triples."""
+        size = len(effects)
+        interactions = np.zeros((size, size), dtype=np.float64)
+        lo, hi = np.minimum(first, second), np.maximum(first, second)
+        np.add.at(interactions, (lo, hi), values)
+        return cls(effects, interactions)
+
+    def log_fitness(self, block: np.ndarray) -> np.ndarray:
+        pairwise = np.einsum("ij,ij->i", block @ self._pairs, block)
+        log_w: np.ndarray = block @ self._weights + pairwise
+        return log_w
+
+class StabilizingModel(FitnessModel):
+    """Gaussian selection on an additive trait towards an optimum.
+
+    ``effects`` are each locus's contribution to the trait ``z = g · a``,
+    and ``w = exp(-(z - optimum)^2 / (2 width^2))``.
+    """
+
+    name = "stabilizing"
+
+    def __init__(
+        self, effects: np.ndarray, optimum: float = 0.0, width: float = 1.0
+    ) -> None:
+        super().__init__(effects)
+        if width <= 0:
+            raise ValueError("Selection width must be positive")
+        self.optimum = float(optimum)
+        self.width = float(width)
+        self._weights = self.effects.astype(np.float32)
+
+    @property
+    def main_effects(self) -> np.ndarray:
+        """Log-fitness change of one allele moving an individual off the optimum."""
+        shifted = self.optimum - self.effects
+        return (self.optimum**2 - shifted**2) / (2 * self.width**2)
+
+    def log_fitness(self, block: np.ndarray) -> np.ndarray:
+        deviation = block @ self._weights - self.optimum
+        return -(deviation * deviation) / (2 * self.width**2)
+
+FITNESS_MODELS: Dict[str, Type[FitnessModel]] = {
+    model.name: model
+    for model in (MultiplicativeModel, AdditiveModel, EpistaticModel, StabilizingModel)
+}
+
+def make_fitness_model(
+    name: str,
+    selection: np.ndarray,
+    rng: Optional[np.random.Generator] = None,
+    epistasis: float = 0.01,
+    pair_density: float = 0.05,
+) -> FitnessModel:
+    """A model of the named kind built around per-locus selection coefficients.
+
+    The epistatic model draws a sparse random interaction matrix (a
+    ``pair_density`` fraction of pairs, each ``N(0, epistasis)``); the
+    stabilizing model uses the coefficients as trait effects with the
+    optimum at the ancestral (all-zero) genotype.
+    """
+    if name not in FITNESS_MODELS:
+        raise ValueError(f"Unknown fitness model: {name}")
+    selection = np.asarray(selection, dtype=np.float64)
+    if name == "epistatic":
+        rng = rng or np.random.default_rng()
+        size = len(selection)
+        mask = rng.random((size, size)) < pair_density
+        interactions = np.where(mask, rng.normal(0.0, epistasis, (size, size)), 0.0)
+        return EpistaticModel(selection, interactions)
+    if name == "stabilizing":
+        width = max(float(np.abs(selection).sum()), 1e-3) / 4
+        return StabilizingModel(selection, optimum=0.0, width=width)
+    if name == "additive":
+        return AdditiveModel(selection)
+    return MultiplicativeModel(selection)
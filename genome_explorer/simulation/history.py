@@ -0,0 +1,328 @@
+"""Columnar (struct-of-arrays) storage for simulation timelines."""
+
+import shutil
+import time
+import uuid
+import weakref
+from collections.abc import Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Union, cast, overload
+
+import numpy as np
+
+from genome_explorer.core import (
+    GenomeRegion,
+    MutationEvent,
+    SimulationState,
+    config,
+)
+
+# Alleles are stored as single ASCII byte codes, so only SNP-style events fit
+EVENT_DTYPE = np.dtype(
+    [
+        ("generation", "<u4"),
+        ("position", "<i8"),
+        ("ref", "u1"),
+        ("alt", "u1"),
+        ("fitness", "<f4"),
+    ]
+)
+INITIAL_CAPACITY = 1024
+
+# Spill files still written to by a history in this process; never pruned
+_live_spills: Set[Path] = set()
+
+class _SpillOwnership:
+    """Whether a spill file must outlive the history that wrote it.
+
+    Shared with the history's finalizer, which cannot hold the history.
+    """
+
+    def __init__(self) -> None:
+        self.kept = False
+
+class SimulationHistory(Sequence):
+    """Simulation timeline stored as typed NumPy columns.
+
+    Mutation events live in one structured array and per-generation values
+    in small per-column arrays. Indexing returns a ``SimulationState`` built
+    on demand, so existing callers keep working without every event being
+    held as a Python object. Once the event table exceeds ``spill_bytes`` it
+    moves to an append-only file under ``cache_dir`` and is read back
+    through ``np.memmap``.
+
+    Pickling a spilled history stores the file's path, not its events. The
+    file is then kept when the original is collected (stale ones are
+    pruned after ``cache_ttl``) and unpickled copies map it read-only; a
+    copy that is appended to first copies the events to a file of its own.
+    """
+
+    def __init__(
+        self,
+        chromosome: str = "sim",
+        spill_bytes: Optional[int] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        self.chromosome = chromosome
+        self.spill_bytes = (
+            config.history_spill_bytes if spill_bytes is None else spill_bytes
+        )
+        self.cache_dir = Path(cache_dir or config.cache_dir)
+        self._token = uuid.uuid4().hex
+        self._events = np.zeros(INITIAL_CAPACITY, dtype=EVENT_DTYPE)
+        self._num_events = 0
+        self._spill_path: Optional[Path] = None
+        self._spill_file: Optional[BinaryIO] = None
+        self._ownership: Optional[_SpillOwnership] = None
+        self._mapped: Optional[np.ndarray] = None
+
+        self._generation: List[int] = []
+        self._population_size: List[int] = []
+        self._timestamp: List[float] = []
+        self._event_offsets: List[int] = [0]
+        self._scores: Dict[str, List[float]] = {}
+
+    def __cache_key__(self) -> tuple:
+        """Identity plus size, so appends invalidate memoized results."""
+        return (self._token, len(self), self._num_events)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the event table has moved to a memory-mapped file."""
+        return self._spill_path is not None
+
+    def append(
+        self,
+        generation: int,
+        population_size: int,
+        fitness_scores: Dict[str, float],
+        positions: np.ndarray,
+        ref: np.ndarray,
+        alt: np.ndarray,
+        fitness: Optional[np.ndarray] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Record one generation and its mutation events."""
+        rows = np.zeros(len(positions), dtype=EVENT_DTYPE)
+        rows["generation"] = generation
+        rows["position"] = positions
+        rows["ref"] = ref
+        rows["alt"] = alt
+        if fitness is not None:
+            rows["fitness"] = fitness
+        self._append_events(rows)
+
+        self._generation.append(int(generation))
+        self._population_size.append(int(population_size))
+        self._timestamp.append((timestamp or datetime.now()).timestamp())
+        self._event_offsets.append(self._num_events)
+        for key, value in fitness_scores.items():
+            column = self._scores.setdefault(key, [np.nan] * (len(self) - 1))
+            column.append(float(value))
+        for key, column in self._scores.items():
+            if len(column) < len(self):
+                column.append(np.nan)
+
+    def append_state(self, state: SimulationState) -> None:
+        """Record a ``SimulationState`` (single-base alleles only)."""
+        events = state.mutation_events
+        self.append(
+            state.generation,
+            state.population_size,
+            state.fitness_scores,
+            positions=np.array([e.region.start for e in events], dtype=np.int64),
+            ref=np.array([ord(e.ref[:1] or "N") for e in events], dtype=np.uint8),
+            alt=np.array([ord(e.alt[:1] or "N") for e in events], dtype=np.uint8),
+            timestamp=state.timestamp,
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        if self._spill_file is not None:
+            self._spill_file.flush()
+        if self._ownership is not None:
+            self._ownership.kept = True
+        state["_spill_file"] = None
+        state["_ownership"] = None
+        state["_mapped"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self.spilled:
+            # Map now, so the events stay readable even if the file is
+            # pruned later
+            self._mapped = self._map_events()
+
+    def _append_events(self, rows: np.ndarray) -> None:
+        if self.spilled:
+            if self._spill_file is None:
+                self._copy_spill()
+            assert self._spill_file is not None
+            self._spill_file.write(rows.tobytes())
+            self._mapped = None
+            self._num_events += len(rows)
+            return
+
+        needed = self._num_events + len(rows)
+        if needed > len(self._events):
+            grown = np.zeros(max(needed, 2 * len(self._events)), dtype=EVENT_DTYPE)
+            grown[: self._num_events] = self._events[: self._num_events]
+            self._events = grown
+        self._events[self._num_events : needed] = rows
+        self._num_events = needed
+        if self._events.nbytes > self.spill_bytes:
+            self._spill()
+
+    def _open_spill(self) -> BinaryIO:
+        """Start a spill file owned (and removed) by this history."""
+        directory = self.cache_dir / "history"
+        directory.mkdir(parents=True, exist_ok=True)
+        _prune_spills(directory, config.cache_ttl)
+        self._spill_path = directory / f"{uuid.uuid4().hex}.events"
+        handle = open(self._spill_path, "wb")
+        self._spill_file = handle
+        self._ownership = _SpillOwnership()
+        _live_spills.add(self._spill_path)
+        weakref.finalize(
+            self, _remove_spill, handle, self._spill_path, self._ownership
+        )
+        return handle
+
+    def _spill(self) -> None:
+        """Move the event table to an append-only file."""
+        self._open_spill().write(self._events[: self._num_events].tobytes())
+        self._events = np.zeros(0, dtype=EVENT_DTYPE)
+
+    def _copy_spill(self) -> None:
+        """Give an unpickled copy its own file before appending to it."""
+        source = self._spill_path
+        assert source is not None
+        handle = self._open_spill()
+        with open(source, "rb") as events:
+            shutil.copyfileobj(events, handle)
+        self._mapped = None
+
+    def _map_events(self) -> np.ndarray:
+        if not self._num_events or self._spill_path is None:
+            return np.zeros(0, dtype=EVENT_DTYPE)
+        mapped: np.ndarray = np.memmap(
+            str(self._spill_path),
+            dtype=EVENT_DTYPE,
+            mode="r",
+            shape=(self._num_events,),
+        )
+        return mapped
+
+    @property
+    def events(self) -> np.ndarray:
+        """All mutation events as a structured array (memory-mapped if spilled)."""
+        if not self.spilled:
+            return self._events[: self._num_events]
+        if self._mapped is None:
+            if self._spill_file is not None:
+                self._spill_file.flush()
+            self._mapped = self._map_events()
+        return self._mapped
+
+    @property
+    def generations(self) -> np.ndarray:
+        """Generation number of each recorded state."""
+        return np.asarray(self._generation, dtype=np.int64)
+
+    @property
+    def population_sizes(self) -> np.ndarray:
+        """Population size of each recorded state."""
+        return np.asarray(self._population_size, dtype=np.int64)
+
+    @property
+    def score_names(self) -> List[str]:
+        """Keys available in ``fitness_scores``."""
+        return list(self._scores)
+
+    def fitness(self, key: str = "avg") -> np.ndarray:
+        """One ``fitness_scores`` entry across all generations."""
+        return np.asarray(self._scores[key], dtype=np.float64)
+
+    def events_for(self, index: int) -> np.ndarray:
+        """Mutation events recorded for the state at ``index``."""
+        start, end = self._event_offsets[index], self._event_offsets[index + 1]
+        return self.events[start:end]
+
+    def __len__(self) -> int:
+        return len(self._generation)
+
+    @overload
+    def __getitem__(self, index: int) -> SimulationState: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[SimulationState]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[SimulationState, List[SimulationState]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("SimulationHistory index out of range")
+        return SimulationState(
+            generation=self._generation[index],
+            population_size=self._population_size[index],
+            mutation_events=cast(List[MutationEvent], _LazyEvents(self, index)),
+            fitness_scores={key: col[index] for key, col in self._scores.items()},
+            timestamp=datetime.fromtimestamp(self._timestamp[index]),
+        )
+
+class _LazyEvents(Sequence):
+    """``List[MutationEvent]`` stand-in that materializes events on access."""
+
+    def __init__(self, history: SimulationHistory, index: int) -> None:
+        self._history = history
+        self._index = index
+
+    def __len__(self) -> int:
+        offsets = self._history._event_offsets
+        return offsets[self._index + 1] - offsets[self._index]
+
+    @overload
+    def __getitem__(self, item: int) -> MutationEvent: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> List[MutationEvent]: ...
+
+    def __getitem__(
+        self, item: Union[int, slice]
+    ) -> Union[MutationEvent, List[MutationEvent]]:
+        rows = self._history.events_for(self._index)[item]
+        if isinstance(item, slice):
+            return [self._to_event(row) for row in rows]
+        return self._to_event(cast(np.void, rows))
+
+    def _to_event(self, row: np.void) -> MutationEvent:
+        position = int(row["position"])
+        return MutationEvent(
+            region=GenomeRegion(self._history.chromosome, position, position + 1),
+            type="SNP",
+            ref=chr(row["ref"]),
+            alt=chr(row["alt"]),
+            impact=f"{float(row['fitness']):+.4f}",
+        )
+
+def _remove_spill(handle: BinaryIO, path: Path, ownership: _SpillOwnership) -> None:
+    handle.close()
+    _live_spills.discard(path)
+    if not ownership.kept:
+        path.unlink(missing_ok=True)
+
+def _prune_spills(directory: Path, ttl: float) -> None:
+    """Delete kept spill files untouched for ``ttl`` seconds."""
+    cutoff = time.time() - ttl
+    for path in directory.glob("*.events"):
+        try:
+            if path not in _live_spills and path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
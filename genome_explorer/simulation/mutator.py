@@ -0,0 +1,324 @@
+"""Batched SNP/indel injection into reference sequences with lift-over."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from genome_explorer.core import GenomeRegion, MutationEvent
+
+ACGT = np.frombuffer(b"ACGT", dtype=np.uint8)
+# ASCII byte -> index into ACGT, or 4 for anything else
+BASE_INDEX = np.full(256, 4, dtype=np.uint8)
+for _code, _base in enumerate(b"ACGT"):
+    BASE_INDEX[_base] = BASE_INDEX[_base | 0x20] = _code
+
+DEFAULT_INDEL_FRACTION = 0.1
+DEFAULT_MAX_INDEL = 10
+
+@dataclass
+class EditBatch:
+    """Sorted, non-overlapping edits held as columns.
+
+    Edit ``i`` replaces ``reference[positions[i] : positions[i] + ref_lengths[i]]``
+    with ``alt_data[alt_offsets[i] : alt_offsets[i + 1]]``. Indels are
+    anchored on the preceding base as in VCF, so every edit covers at least
+    one reference base.
+    """
+    positions: np.ndarray
+    ref_lengths: np.ndarray
+    alt_offsets: np.ndarray
+    alt_data: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def alt_lengths(self) -> np.ndarray:
+        return np.diff(self.alt_offsets)
+
+    @property
+    def ref_ends(self) -> np.ndarray:
+        return self.positions + self.ref_lengths
+
+    def kinds(self) -> np.ndarray:
+        """Event type of each edit: SNP, insertion, deletion or MNP."""
+        alt_lengths = self.alt_lengths
+        kinds = np.full(len(self), "MNP", dtype=object)
+        kinds[(self.ref_lengths == 1) & (alt_lengths == 1)] = "SNP"
+        kinds[alt_lengths > self.ref_lengths] = "insertion"
+        kinds[alt_lengths < self.ref_lengths] = "deletion"
+        return kinds
+
+    def counts(self) -> Dict[str, int]:
+        kinds, counts = np.unique(self.kinds(), return_counts=True)
+        return {str(kind): int(count) for kind, count in zip(kinds, counts)}
+
+    @classmethod
+    def from_events(cls, events: List[MutationEvent]) -> "EditBatch":
+        """Edits from events whose ``ref`` starts at ``region.start``.
+
+        Events are sorted by position; any that overlap an earlier one are
+        dropped.
+        """
+        events = sorted(events, key=lambda event: event.region.start)
+        alts = [event.alt.encode("ascii") for event in events]
+        alt_offsets = np.zeros(len(events) + 1, dtype=np.int64)
+        np.cumsum([len(alt) for alt in alts], out=alt_offsets[1:])
+        batch = cls(
+            positions=np.array([e.region.start for e in events], dtype=np.int64),
+            ref_lengths=np.array([len(e.ref) for e in events], dtype=np.int64),
+            alt_offsets=alt_offsets,
+            alt_data=np.frombuffer(b"".join(alts), dtype=np.uint8),
+        )
+        return batch.non_overlapping()
+
+    def to_events(
+        self, chromosome: str, reference: np.ndarray, probability: float = 1.0
+    ) -> List[MutationEvent]:
+        """One ``MutationEvent`` per edit, with alleles read from ``reference``."""
+        kinds = self.kinds()
+        alt_text = self.alt_data.tobytes().decode("ascii")
+        ref_text = reference.tobytes().decode("ascii")
+        return [
+            MutationEvent(
+                region=GenomeRegion(chromosome, int(pos), int(pos + ref_len)),
+                type=kind,
+                ref=ref_text[pos : pos + ref_len],
+                alt=alt_text[lo:hi],
+                probability=probability,
+            )
+            for pos, ref_len, lo, hi, kind in zip(
+                self.positions.tolist(),
+                self.ref_lengths.tolist(),
+                self.alt_offsets[:-1].tolist(),
+                self.alt_offsets[1:].tolist(),
+                kinds,
+            )
+        ]
+
+    def take(self, keep: np.ndarray) -> "EditBatch":
+        """The edits selected by a boolean mask or index array."""
+        keep = np.flatnonzero(keep) if keep.dtype == bool else keep
+        lo, hi = self.alt_offsets[keep], self.alt_offsets[keep + 1]
+        alt_offsets = np.zeros(len(keep) + 1, dtype=np.int64)
+        np.cumsum(hi - lo, out=alt_offsets[1:])
+        # Gather every kept allele's bytes in one fancy-index
+        owner = np.repeat(np.arange(len(keep)), hi - lo)
+        source = lo[owner] + np.arange(alt_offsets[-1]) - alt_offsets[owner]
+        return EditBatch(
+            self.positions[keep],
+            self.ref_lengths[keep],
+            alt_offsets,
+            self.alt_data[source],
+        )
+
+    def non_overlapping(self) -> "EditBatch":
+        """Drop edits starting inside an earlier edit's reference span."""
+        if not len(self):
+            return self
+        reach = np.maximum.accumulate(self.ref_ends)
+        keep = np.ones(len(self), dtype=bool)
+        keep[1:] = self.positions[1:] >= reach[:-1]
+        return self if keep.all() else self.take(keep)
+
+class LiftOver:
+    """Coordinate map between a reference and its edited copy.
+
+    Positions are mapped with one binary search over the edit spans, so
+    whole arrays of coordinates convert at once. Bases that were deleted
+    (or inserted, going back) map to -1.
+    """
+
+    def __init__(self, batch: EditBatch) -> None:
+        self.ref_starts = batch.positions
+        self.ref_ends = batch.ref_ends
+        growth = batch.alt_lengths - batch.ref_lengths
+        # Shift applied to positions after 0, 1, ... edits
+        self.shifts = np.concatenate(([0], np.cumsum(growth))).astype(np.int64)
+        self.alt_starts = self.ref_starts + self.shifts[:-1]
+        self.alt_ends = self.alt_starts + batch.alt_lengths
+        self.ref_lengths = batch.ref_lengths
+        self.alt_lengths = batch.alt_lengths
+
+    @staticmethod
+    def _map(
+        positions: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        shifts: np.ndarray,
+        target_lengths: np.ndarray,
+    ) -> np.ndarray:
+        positions = np.asarray(positions, dtype=np.int64)
+        passed = np.searchsorted(ends, positions, side="right")
+        mapped = positions + shifts[passed]
+        # Inside an edit, only the first target-length bases carry over
+        inside = passed < len(starts)
+        edit = np.minimum(passed, len(starts) - 1)
+        if len(starts):
+            inside &= starts[edit] <= positions
+            lost = inside & (positions - starts[edit] >= target_lengths[edit])
+            mapped[lost] = -1
+        return mapped
+
+    def to_mutated(self, positions: np.ndarray) -> np.ndarray:
+        """Reference coordinates in the mutated sequence."""
+        return self._map(
+            positions, self.ref_starts, self.ref_ends, self.shifts, self.alt_lengths
+        )
+
+    def to_reference(self, positions: np.ndarray) -> np.ndarray:
+        """Mutated-sequence coordinates back in the reference."""
+        return self._map(
+            positions, self.alt_starts, self.alt_ends, -self.shifts, self.ref_lengths
+        )
+
+    def inserted(self) -> np.ndarray:
+        """Mutated-sequence coordinates of bases with no reference origin."""
+        extra = np.maximum(self.alt_lengths - self.ref_lengths, 0)
+        first = np.repeat(self.alt_starts + self.ref_lengths, extra)
+        # Offset of each inserted base within its own edit
+        run_starts = np.repeat(np.cumsum(extra) - extra, extra)
+        positions: np.ndarray = first + np.arange(len(first)) - run_starts
+        return positions
+
+def sample_edits(
+    reference: np.ndarray,
+    mutation_rate: float,
+    rng: np.random.Generator,
+    indel_fraction: float = DEFAULT_INDEL_FRACTION,
+    max_indel: int = DEFAULT_MAX_INDEL,
+) -> EditBatch:
+    """Draw SNPs and indels at ``mutation_rate`` per called base.
+
+    Positions, types, lengths and alleles are all drawn as arrays; only
+    A/C/G/T bases are mutated. Indels are split evenly between insertions
+    and deletions of 1 to ``max_indel`` bases.
+    """
+    length = len(reference)
+    count = rng.binomial(length, mutation_rate) if length else 0
+    positions = np.unique(rng.integers(0, max(length, 1), size=count))
+    positions = positions[BASE_INDEX[reference[positions]] < 4]
+    n = len(positions)
+
+    kind = rng.random(n)
+    insertion = kind < indel_fraction / 2
+    deletion = (kind >= indel_fraction / 2) & (kind < indel_fraction)
+    sizes = rng.integers(1, max_indel + 1, size=n)
+    # Deletions stop at the end of the sequence; one at the last base is dropped
+    ref_lengths = np.minimum(np.where(deletion, sizes + 1, 1), length - positions)
+    keep = ~deletion | (ref_lengths > 1)
+    positions, ref_lengths = positions[keep], ref_lengths[keep]
+    insertion, deletion, sizes = insertion[keep], deletion[keep], sizes[keep]
+    n = len(positions)
+    alt_lengths = np.where(insertion, sizes + 1, 1)
+
+    alt_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(alt_lengths, out=alt_offsets[1:])
+    alt_data = ACGT[rng.integers(0, 4, size=alt_offsets[-1])]
+    first = alt_offsets[:-1]
+    ref_index = BASE_INDEX[reference[positions]]
+    snp = ~(insertion | deletion)
+    # SNPs always change the base; indels keep their anchor base
+    shifted = (ref_index + rng.integers(1, 4, size=n)) % 4
+    alt_data[first] = np.where(snp, ACGT[shifted], ACGT[ref_index])
+
+    batch = EditBatch(
+        positions.astype(np.int64), ref_lengths.astype(np.int64), alt_offsets, alt_data
+    )
+    return batch.non_overlapping()
+
+def apply_edits(reference: np.ndarray, batch: EditBatch) -> Tuple[np.ndarray, LiftOver]:
+    """Splice every edit into ``reference`` in one pass.
+
+    The untouched reference stretches and the alternate alleles are
+    interleaved as array views and joined by a single ``np.concatenate``,
+    so the cost is linear in the sequence length however many edits there
+    are.
+    """
+    if not len(batch):
+        return reference.copy(), LiftOver(batch)
+    gap_starts = [0] + batch.ref_ends.tolist()
+    gap_ends = batch.positions.tolist() + [len(reference)]
+    offsets = batch.alt_offsets.tolist()
+    pieces: List[np.ndarray] = []
+    for i in range(len(batch)):
+        pieces.append(reference[gap_starts[i] : gap_ends[i]])
+        pieces.append(batch.alt_data[offsets[i] : offsets[i + 1]])
+    pieces.append(reference[gap_starts[-1] : gap_ends[-1]])
+    return np.concatenate(pieces), LiftOver(batch)
+
+class SequenceMutator:
+    """Accumulates mutations on a sequence generation by generation.
+
+    Keeps one ``LiftOver`` per generation, so reference coordinates can be
+    followed into the current sequence and back, and the positions of
+    inserted bases, so counting surviving reference bases never needs a
+    lift-over of the whole reference.
+    """
+
+    def __init__(
+        self,
+        reference: Union[np.ndarray, str],
+        mutation_rate: float,
+        seed: Optional[Union[int, np.random.SeedSequence]] = None,
+        indel_fraction: float = DEFAULT_INDEL_FRACTION,
+        max_indel: int = DEFAULT_MAX_INDEL,
+    ) -> None:
+        if isinstance(reference, str):
+            reference = np.frombuffer(reference.encode("ascii"), dtype=np.uint8)
+        self.reference = reference
+        self.sequence = np.array(reference, dtype=np.uint8)
+        self.mutation_rate = float(mutation_rate)
+        self.indel_fraction = indel_fraction
+        self.max_indel = max_indel
+        self.rng = np.random.default_rng(seed)
+        self.liftovers: List[LiftOver] = []
+        # Current coordinates of bases not derived from the reference
+        self.inserted = np.zeros(0, dtype=np.int64)
+        self.generation = 0
+
+    def step(self) -> EditBatch:
+        """Mutate the current sequence once, returning the applied edits.
+
+        Edit positions are in the coordinates of the sequence before this
+        generation.
+        """
+        batch = sample_edits(
+            self.sequence,
+            self.mutation_rate,
+            self.rng,
+            self.indel_fraction,
+            self.max_indel,
+        )
+        self.sequence, liftover = apply_edits(self.sequence, batch)
+        self.liftovers.append(liftover)
+        kept = liftover.to_mutated(self.inserted)
+        self.inserted = np.concatenate((kept[kept >= 0], liftover.inserted()))
+        self.generation += 1
+        return batch
+
+    def run(self, generations: int) -> List[EditBatch]:
+        return [self.step() for _ in range(int(generations))]
+
+    def retained(self) -> int:
+        """Reference bases that survive (are not deleted) in the sequence."""
+        return len(self.sequence) - len(self.inserted)
+
+    def to_current(self, positions: np.ndarray) -> np.ndarray:
+        """Reference coordinates in the current sequence (-1 if deleted)."""
+        mapped = np.asarray(positions, dtype=np.int64)
+        for liftover in self.liftovers:
+            lost = mapped < 0
+            mapped = liftover.to_mutated(np.where(lost, 0, mapped))
+            mapped[lost] = -1
+        return mapped
+
+    def to_reference(self, positions: np.ndarray) -> np.ndarray:
+        """Current coordinates in the reference (-1 if inserted)."""
+        mapped = np.asarray(positions, dtype=np.int64)
+        for liftover in reversed(self.liftovers):
+            lost = mapped < 0
+            mapped = liftover.to_reference(np.where(lost, 0, mapped))
+            mapped[lost] = -1
+        return mapped
@@ -3,16 +3,50 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from typing import Dict, List
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
 
 from genome_explorer.core import (
+    JobContext,
     MutationEvent,
+    SimulationParams,
     SimulationState,
+    TwoBitGenome,
+    collect_job,
     get_state,
+    job_manager,
+    memoize,
+    poll_jobs,
+    profiled,
     set_state,
 )
+from genome_explorer.simulation.benchmark import benchmark_models
+from genome_explorer.simulation.engine import CHROMOSOME, WrightFisherSimulation
+from genome_explorer.simulation.fitness import FITNESS_MODELS
+from genome_explorer.simulation.history import SimulationHistory
+from genome_explorer.simulation.mutator import SequenceMutator
+from genome_explorer.simulation.replicates import (
+    aggregate_replicates,
+    make_tasks,
+    run_replicates,
+)
+from genome_explorer.visualization.downsample import (
+    WEBGL_POINTS,
+    envelope,
+    scatter_trace,
+)
+
+SWEEP_MUTATION_RATES = [0.0001, 0.0005, 0.001, 0.005, 0.01]
+# Session keys holding the ids of this page's background jobs
+JOB_KEYS = ["simulation_job", "sweep_job", "mutation_job"]
 
-def render_simulation_controls() -> Dict[str, float]:
+# Length of the random reference mutated when no genome is loaded
+SYNTHETIC_LENGTH = 1_000_000
+# Events listed from the last generation
+EVENT_PREVIEW = 20
+
+def render_simulation_controls() -> SimulationParams:
     """Render simulation parameter controls."""
     st.sidebar.subheader("Simulation Parameters")
     
@@ -29,7 +63,7 @@ def render_simulation_controls() -> Dict[str, float]:
     population_size = st.sidebar.slider(
         "Population Size",
         min_value=10,
-        max_value=1000,
+        max_value=1_000_000,
         value=params["population_size"],
     )
     
@@ -40,45 +74,66 @@ def render_simulation_controls() -> Dict[str, float]:
         value=params["generations"],
     )
     
-    new_params = {
-        "mutation_rate": mutation_rate,
-        "population_size": population_size,
-        "generations": generations,
+    model_names = list(FITNESS_MODELS)
+    fitness_model = st.sidebar.selectbox(
+        "Fitness Model",
+        options=model_names,
+        index=model_names.index(params.get("fitness_model", "multiplicative")),
+    )
+    
+    seed = st.sidebar.number_input(
+        "Random Seed",
+        min_value=0,
+        value=params.get("seed", 0),
+        step=1,
+    )
+    
+    new_params: SimulationParams = {
+        "mutation_rate": float(mutation_rate),
+        "population_size": int(population_size),
+        "generations": int(generations),
+        "seed": int(seed),
+        "fitness_model": fitness_model,
     }
     set_state("simulation_params", new_params)
     
     return new_params
 
-def run_simulation(params: Dict[str, float]) -> List[SimulationState]:
-    """Run genomics simulation with given parameters."""
-    # TODO: Implement actual simulation
-    states = []
-    for gen in range(params["generations"]):
-        states.append(
-            SimulationState(
-                generation=gen,
-                population_size=params["population_size"],
-                mutation_events=[],
-                fitness_scores={"avg": np.random.random()},
-                timestamp=None,
-            )
+def run_simulation(context: JobContext, params: SimulationParams) -> SimulationHistory:
+    """Run genomics simulation with given parameters as a background job."""
+    simulation = WrightFisherSimulation(
+        population_size=params["population_size"],
+        mutation_rate=params["mutation_rate"],
+        seed=params["seed"],
+        fitness_model=params["fitness_model"],
+    )
+    generations = params["generations"]
+    history = SimulationHistory(CHROMOSOME)
+    for generation in range(generations):
+        context.progress(
+            generation / generations, f"generation {generation + 1}/{generations}"
         )
-    return states
+        history = simulation.run_history(1, history)
+    return history
 
-def render_simulation_results(states: List[SimulationState]) -> None:
-    """Render simulation results visualization."""
-    st.subheader("Simulation Results")
-    
-    # Plot fitness over generations
-    generations = [s.generation for s in states]
-    fitness = [s.fitness_scores["avg"] for s in states]
+@memoize(max_entries=16)
+def build_fitness_figure(states: Sequence[SimulationState]) -> go.Figure:
+    """Fitness-over-time figure, reused across reruns."""
+    # Plot fitness over generations, straight from the columns when available
+    if isinstance(states, SimulationHistory):
+        generations = states.generations
+        fitness = states.fitness("avg")
+    else:
+        generations = np.array([s.generation for s in states])
+        fitness = np.array([s.fitness_scores["avg"] for s in states])
     
+    # Long runs are decimated to the plot width; markers only when sparse
     fig = go.Figure()
     fig.add_trace(
-        go.Scatter(
-            x=generations,
-            y=fitness,
-            mode="lines+markers",
+        scatter_trace(
+            generations,
+            fitness,
+            mode="lines+markers" if len(generations) <= WEBGL_POINTS else "lines",
             name="Average Fitness",
         )
     )
@@ -89,9 +144,154 @@ def render_simulation_results(states: List[SimulationState]) -> None:
         yaxis_title="Fitness Score",
         showlegend=True,
     )
+    return fig
+
+@profiled
+def render_simulation_results(states: Sequence[SimulationState]) -> None:
+    """Render simulation results visualization."""
+    st.subheader("Simulation Results")
+    
+    st.plotly_chart(build_fitness_figure(states), use_container_width=True)
+
+def run_sequence_mutation(
+    context: JobContext,
+    params: SimulationParams,
+    generations: int,
+    genome_dir: Optional[str] = None,
+    chromosome: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Mutate a chromosome (or a random sequence) and summarize the edits."""
+    rng = np.random.default_rng(params["seed"])
+    if genome_dir and chromosome:
+        genome = TwoBitGenome(Path(genome_dir))
+        reference = genome.fetch(chromosome, 0, genome.lengths[chromosome], soft_mask=False)
+    else:
+        chromosome = "synthetic"
+        reference = np.frombuffer(b"ACGT", dtype=np.uint8)[
+            rng.integers(0, 4, size=SYNTHETIC_LENGTH)
+        ]
+    
+    mutator = SequenceMutator(
+        reference, params["mutation_rate"], seed=int(rng.integers(1 << 32))
+    )
+    per_generation = []
+    batch = None
+    for generation in range(generations):
+        context.progress(
+            generation / generations, f"generation {generation + 1}/{generations}"
+        )
+        source = mutator.sequence
+        batch = mutator.step()
+        per_generation.append(batch.counts())
+    
+    return {
+        "chromosome": chromosome,
+        "reference_length": len(reference),
+        "mutated_length": len(mutator.sequence),
+        # Fraction of reference bases that survive (not deleted) in the result
+        "retained": mutator.retained() / len(reference) if len(reference) else 1.0,
+        "per_generation": per_generation,
+        "last_events": batch.to_events(chromosome, source)[:EVENT_PREVIEW] if batch else [],
+    }
+
+def render_sequence_mutation(result: Dict[str, Any]) -> None:
+    """Render edit counts per generation and the last generation's events."""
+    st.subheader(f"Sequence Mutation — {result['chromosome']}")
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Reference Length", f"{result['reference_length']:,}")
+    col2.metric(
+        "Mutated Length",
+        f"{result['mutated_length']:,}",
+        delta=f"{result['mutated_length'] - result['reference_length']:+,}",
+    )
+    col3.metric("Reference Bases Retained", f"{result['retained']:.2%}")
+    
+    fig = go.Figure()
+    for kind in ("SNP", "insertion", "deletion"):
+        fig.add_trace(
+            go.Bar(
+                x=list(range(len(result["per_generation"]))),
+                y=[counts.get(kind, 0) for counts in result["per_generation"]],
+                name=kind,
+            )
+        )
+    fig.update_layout(
+        barmode="stack",
+        title="Edits per Generation",
+        xaxis_title="Generation",
+        yaxis_title="Edits",
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.dataframe(
+        [
+            {
+                "Position": event.region.start,
+                "Type": event.type,
+                "Ref": event.ref,
+                "Alt": event.alt,
+            }
+            for event in result["last_events"]
+        ]
+    )
+
+def run_replicate_sweep(
+    context: JobContext,
+    params: SimulationParams,
+    mutation_rates: List[float],
+    replicates: int,
+) -> Dict[float, Dict[str, np.ndarray]]:
+    """Run replicates over a mutation-rate grid in worker processes."""
+    tasks = make_tasks(params, mutation_rates, replicates)
+    results = []
+    # Closing the generator on cancel stops queued replicates from starting
+    with closing(run_replicates(tasks)) as runs:
+        for result in runs:
+            results.append(result)
+            context.progress(
+                len(results) / len(tasks), f"{len(results)}/{len(tasks)} replicates"
+            )
+    return aggregate_replicates(results)
+
+def render_sweep_results(summary: Dict[float, Dict[str, np.ndarray]]) -> None:
+    """Render mean fitness with 95% confidence bands per mutation rate."""
+    st.subheader("Replicate Sweep")
+    
+    fig = go.Figure()
+    for rate, stats in sorted(summary.items()):
+        generations = np.arange(len(stats["mean"]))
+        band_x, lower, upper = envelope(generations, stats["lower"], stats["upper"])
+        fig.add_trace(
+            go.Scatter(
+                x=np.concatenate((band_x, band_x[::-1])),
+                y=np.concatenate((upper, lower[::-1])),
+                fill="toself",
+                line={"width": 0},
+                opacity=0.2,
+                showlegend=False,
+                hoverinfo="skip",
+            )
+        )
+        fig.add_trace(
+            scatter_trace(
+                generations,
+                stats["mean"],
+                mode="lines",
+                name=f"μ = {rate:g} (n={int(stats['replicates'])})",
+            )
+        )
+    
+    fig.update_layout(
+        title="Mean Fitness Across Replicates (95% CI)",
+        xaxis_title="Generation",
+        yaxis_title="Fitness Score",
+        showlegend=True,
+    )
     
     st.plotly_chart(fig, use_container_width=True)
 
+@profiled
 def render() -> None:
     """Render the simulation laboratory page."""
     st.title("Genomics Simulation Lab")
@@ -100,13 +300,94 @@ def render() -> None:
     params = render_simulation_controls()
     
     # Run simulation button
+    # Long runs go to background jobs; the page polls until they finish
     if st.button("Run Simulation"):
-        with st.spinner("Running simulation..."):
-            states = run_simulation(params)
-            set_state("simulation_results", states)
-            st.success("Simulation complete!")
+        set_state(
+            "simulation_job",
+            job_manager.submit("simulation", run_simulation, params, key=params),
+        )
+    states = collect_job("simulation_job", "Simulation")
+    if states is not None:
+        set_state("simulation_results", states)
+        st.success("Simulation complete!")
+    
+    # Replicate sweep
+    with st.expander("Replicate Sweep"):
+        mutation_rates = st.multiselect(
+            "Mutation Rates",
+            options=SWEEP_MUTATION_RATES,
+            default=SWEEP_MUTATION_RATES[1:4],
+        )
+        replicates = st.slider("Replicates", min_value=2, max_value=200, value=20)
+        if st.button("Run Sweep") and mutation_rates:
+            sweep_args = (params, mutation_rates, replicates)
+            set_state(
+                "sweep_job",
+                job_manager.submit(
+                    "sweep", run_replicate_sweep, *sweep_args, key=sweep_args
+                ),
+            )
+        summary = collect_job("sweep_job", "Replicate sweep")
+        if summary is not None:
+            set_state("sweep_results", summary)
+    
+    # Sequence mutation
+    with st.expander("Sequence Mutation"):
+        genome_dir = get_state("packed_genome_dir")
+        chromosome = None
+        if genome_dir:
+            chromosome = st.selectbox(
+                "Chromosome", options=list(TwoBitGenome(Path(genome_dir)).lengths)
+            )
+        else:
+            st.caption(
+                f"No genome loaded; a random {SYNTHETIC_LENGTH:,} bp sequence is used."
+            )
+        mutation_generations = st.slider(
+            "Mutation Generations", min_value=1, max_value=50, value=10
+        )
+        if st.button("Mutate Sequence"):
+            mutation_args = (params, mutation_generations, genome_dir, chromosome)
+            set_state(
+                "mutation_job",
+                job_manager.submit(
+                    "mutation", run_sequence_mutation, *mutation_args, key=mutation_args
+                ),
+            )
+        mutation = collect_job("mutation_job", "Sequence mutation")
+        if mutation is not None:
+            set_state("mutation_results", mutation)
+    
+    # Fitness model throughput, to gauge how large a population is practical
+    with st.expander("Fitness Model Benchmark"):
+        if st.button("Run Benchmark"):
+            with st.spinner("Timing fitness models..."):
+                rows = benchmark_models(
+                    population_sizes=[params["population_size"]], repeats=3
+                )
+            st.dataframe(
+                [
+                    {
+                        "Model": row["model"],
+                        "Individuals": row["individuals"],
+                        "Milliseconds": round(row["seconds"] * 1000, 2),
+                        "Individuals × Loci / s": f"{row['cells_per_second']:.3e}",
+                    }
+                    for row in rows
+                ]
+            )
     
     # Display results
     results = get_state("simulation_results")
     if results:
-        render_simulation_results(results) 
\ No newline at end of file
+        render_simulation_results(results)
+    
+    sweep = get_state("sweep_results")
+    if sweep:
+        render_sweep_results(sweep)
+    
+    mutation = get_state("mutation_results")
+    if mutation:
+        render_sequence_mutation(mutation) 
+    
+    poll_jobs(JOB_KEYS)
\ No newline at end of file
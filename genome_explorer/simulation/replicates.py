@@ -0,0 +1,117 @@
+"""Parallel replicate and parameter-sweep runner for simulations."""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Generator, List, Optional, Sequence
+
+import numpy as np
+
+from genome_explorer.core import SimulationParams, config
+from genome_explorer.simulation.engine import WrightFisherSimulation
+
+# Normal quantile for the two-sided 95% confidence band
+Z_95 = 1.959964
+
+@dataclass
+class ReplicateTask:
+    """One independent simulation run in a sweep."""
+    index: int
+    replicate: int
+    mutation_rate: float
+    population_size: int
+    generations: int
+    seed: np.random.SeedSequence
+    fitness_model: str = "multiplicative"
+
+@dataclass
+class ReplicateResult:
+    """Per-generation fitness statistics from one run."""
+    index: int
+    replicate: int
+    mutation_rate: float
+    scores: Dict[str, np.ndarray]
+
+def run_replicate(task: ReplicateTask) -> ReplicateResult:
+    """Run a single replicate; executed inside a worker process."""
+    simulation = WrightFisherSimulation(
+        population_size=task.population_size,
+        mutation_rate=task.mutation_rate,
+        seed=task.seed,
+        fitness_model=task.fitness_model,
+    )
+    history = simulation.run_history(task.generations)
+    # Ship compact arrays back rather than pickling every SimulationState
+    scores = {key: history.fitness(key) for key in history.score_names}
+    return ReplicateResult(task.index, task.replicate, task.mutation_rate, scores)
+
+def make_tasks(
+    params: SimulationParams,
+    mutation_rates: Sequence[float],
+    replicates: int,
+) -> List[ReplicateTask]:
+    """Expand a mutation-rate grid into tasks with independent seed streams.
+
+    Seeds are spawned from ``params["seed"]`` in task order, so results do
+    not depend on which worker picks up which task.
+    """
+    grid = [(rate, rep) for rate in mutation_rates for rep in range(replicates)]
+    seeds = np.random.SeedSequence(params["seed"]).spawn(len(grid))
+    return [
+        ReplicateTask(
+            index=i,
+            replicate=rep,
+            mutation_rate=float(rate),
+            population_size=params["population_size"],
+            generations=params["generations"],
+            seed=seed,
+            fitness_model=params["fitness_model"],
+        )
+        for i, ((rate, rep), seed) in enumerate(zip(grid, seeds))
+    ]
+
+def run_replicates(
+    tasks: List[ReplicateTask],
+    num_workers: Optional[int] = None,
+) -> Generator[ReplicateResult, None, None]:
+    """Run tasks over a process pool, yielding results as they finish.
+
+    Closing the generator early cancels the tasks that have not started.
+    """
+    num_workers = num_workers or config.num_workers
+    if num_workers <= 1:
+        for task in tasks:
+            yield run_replicate(task)
+        return
+    with ProcessPoolExecutor(max_workers=num_workers) as pool:
+        futures = [pool.submit(run_replicate, task) for task in tasks]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+def aggregate_replicates(
+    results: List[ReplicateResult], metric: str = "avg"
+) -> Dict[float, Dict[str, np.ndarray]]:
+    """Mean and 95% confidence band of a metric per generation and rate."""
+    by_rate: Dict[float, List[np.ndarray]] = {}
+    for result in sorted(results, key=lambda r: r.index):
+        by_rate.setdefault(result.mutation_rate, []).append(result.scores[metric])
+
+    summary = {}
+    for rate, runs in by_rate.items():
+        values = np.vstack(runs)
+        mean = values.mean(axis=0)
+        sem = (
+            values.std(axis=0, ddof=1) / np.sqrt(len(values))
+            if len(values) > 1
+            else np.zeros_like(mean)
+        )
+        summary[rate] = {
+            "mean": mean,
+            "lower": mean - Z_95 * sem,
+            "upper": mean + Z_95 * sem,
+            "replicates": np.array(len(values)),
+        }
+    return summary
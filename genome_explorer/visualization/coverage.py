@@ -0,0 +1,114 @@
+"""Vectorized read-depth coverage feeding the summary pyramids."""
+
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from genome_explorer.core import BamReader
+from genome_explorer.core.parsers import ProgressCallback
+from genome_explorer.visualization.pyramid import (
+    BASE_BIN,
+    BUILD_CHUNK,
+    PyramidWriter,
+    SummaryPyramid,
+    pyramid_dir,
+)
+
+def depth_from_events(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    chunk_start: int,
+    chunk_end: int,
+    carry: int = 0,
+) -> np.ndarray:
+    """Per-base depth over ``[chunk_start, chunk_end)`` from interval events.
+
+    Each interval adds +1 at its start and -1 at its end in a difference
+    array, and a single ``cumsum`` turns the events into depth. ``carry`` is
+    the depth entering the chunk from intervals that started before it.
+    Events must fall inside the chunk.
+    """
+    span = chunk_end - chunk_start
+    diff = np.bincount(starts - chunk_start, minlength=span).astype(np.int32)
+    diff -= np.bincount(ends - chunk_start, minlength=span).astype(np.int32)
+    diff[0] += carry
+    return np.cumsum(diff, dtype=np.int32)
+
+def depth_chunks(
+    batches: Iterable[Tuple[np.ndarray, np.ndarray]],
+    length: int,
+    chunk_size: int = BUILD_CHUNK,
+) -> Iterator[np.ndarray]:
+    """Per-base depth of one chromosome, ``chunk_size`` bases at a time.
+
+    ``batches`` yields ``(starts, ends)`` arrays ordered so that no later
+    batch starts before the smallest start of an earlier one (true for
+    reads from a coordinate-sorted BAM, and their aligned blocks). Only
+    intervals still open at the current chunk are kept between chunks, so
+    memory is bounded by the chunk and batch sizes.
+    """
+    pending_starts = np.zeros(0, dtype=np.int64)
+    pending_ends = np.zeros(0, dtype=np.int64)
+    chunk_start, carry = 0, 0
+
+    def emit(frontier: int) -> Iterator[np.ndarray]:
+        nonlocal pending_starts, pending_ends, chunk_start, carry
+        while chunk_start < length and min(chunk_start + chunk_size, length) <= frontier:
+            chunk_end = min(chunk_start + chunk_size, length)
+            start_mask = pending_starts < chunk_end
+            end_mask = pending_ends < chunk_end
+            depth = depth_from_events(
+                pending_starts[start_mask],
+                pending_ends[end_mask],
+                chunk_start,
+                chunk_end,
+                carry,
+            )
+            yield depth
+            # Ends at chunk_end are applied as the next chunk's first event
+            carry = int(depth[-1])
+            pending_starts = pending_starts[~start_mask]
+            pending_ends = pending_ends[~end_mask]
+            chunk_start = chunk_end
+
+    for starts, ends in batches:
+        if not len(starts):
+            continue
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.minimum(np.asarray(ends, dtype=np.int64), length)
+        frontier = int(starts.min())
+        keep = ends > starts
+        pending_starts = np.concatenate((pending_starts, starts[keep]))
+        pending_ends = np.concatenate((pending_ends, ends[keep]))
+        # No later batch can add events before ``frontier``
+        yield from emit(frontier)
+    yield from emit(length)
+
+def build_coverage_pyramid(
+    reader: BamReader,
+    key: str,
+    cache_dir: Optional[Path] = None,
+    base_bin: int = BASE_BIN,
+    blocks: bool = True,
+    progress: Optional[ProgressCallback] = None,
+) -> SummaryPyramid:
+    """Build the read-depth pyramid for every reference in a BAM.
+
+    ``progress`` is called with the bases covered so far after each
+    reference.
+    """
+    writer = PyramidWriter(pyramid_dir(key, "coverage", cache_dir), base_bin)
+    total, done = sum(reader.lengths), 0
+    for chrom, length in zip(reader.references, reader.lengths):
+        chunks = (
+            (depth.astype(np.float32), np.ones(len(depth), dtype=bool))
+            for depth in depth_chunks(
+                reader.span_batches(chrom, blocks=blocks), length, BUILD_CHUNK
+            )
+        )
+        writer.add_chromosome(chrom, length, chunks)
+        done += length
+        if progress:
+            progress(done, total)
+    return writer.close()
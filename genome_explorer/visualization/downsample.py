@@ -0,0 +1,145 @@
+"""Server-side decimation of long series before they are sent to Plotly."""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import plotly.graph_objects as go
+
+from genome_explorer.core import config
+
+# Traces longer than this are drawn with WebGL (Scattergl)
+WEBGL_POINTS = 1000
+
+def target_points(method: str = "lttb", width: Optional[int] = None) -> int:
+    """Points worth drawing across a plot ``width`` pixels wide.
+
+    LTTB keeps one point per pixel; min-max keeps both extremes of each
+    pixel column so spikes survive.
+    """
+    width = width or config.plot_width
+    return 2 * width if method == "minmax" else width
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices kept by Largest-Triangle-Three-Buckets decimation.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the next bucket's average. Bucket averages are computed
+    in one pass with ``reduceat``, and each bucket's areas in one array
+    operation, so the Python loop runs ``n_out`` times whatever the input
+    length. NaN values are only chosen when a bucket has nothing else.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    starts, stops = edges[:-1], edges[1:]
+
+    # Average of each bucket, plus the last point as the final "next bucket"
+    # (the last point is excluded so the final bucket stops before it)
+    valid = ~np.isnan(y[:-1])
+    counts = np.add.reduceat(valid, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        avg_x = np.append(np.add.reduceat(x[:-1], starts) / (stops - starts), x[-1])
+        avg_y = np.append(
+            np.add.reduceat(np.where(valid, y[:-1], 0), starts) / counts, y[-1]
+        )
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    anchor = 0
+    for i, (start, stop) in enumerate(zip(starts, stops)):
+        ax, ay = x[anchor], y[anchor]
+        areas = np.abs(
+            (ax - avg_x[i + 1]) * (y[start:stop] - ay)
+            - (ax - x[start:stop]) * (avg_y[i + 1] - ay)
+        )
+        # A NaN anchor or next-bucket average leaves nothing to compare, but
+        # any real value still beats a NaN
+        missing = np.isnan(areas)
+        areas[missing] = np.where(np.isnan(y[start:stop][missing]), -1, 0)
+        anchor = start + int(np.argmax(areas))
+        kept[i + 1] = anchor
+    return kept
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of ``n_out // 2`` buckets.
+
+    Unlike LTTB this never drops a spike, which suits coverage and other
+    noisy tracks. Indices are returned in ascending order.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    buckets = n_out // 2
+    size = -(-n // buckets)
+    buckets = -(-n // size)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    padded = padded.reshape(buckets, size)
+    missing = np.isnan(padded)
+
+    base = np.arange(buckets) * size
+    lows = base + np.where(missing, np.inf, padded).argmin(axis=1)
+    highs = base + np.where(missing, -np.inf, padded).argmax(axis=1)
+    kept = np.unique(np.concatenate((lows, highs, [0, n - 1])))
+    return kept[kept < n]
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Decimate a series to at most about ``max_points`` points."""
+    x, y = np.asarray(x), np.asarray(y)
+    if method not in ("lttb", "minmax"):
+        raise ValueError(f"Unknown downsampling method: {method}")
+    max_points = max_points or target_points(method)
+    if len(y) <= max_points:
+        return x, y
+    if method == "lttb":
+        kept = lttb_indices(x, y, max_points)
+    else:
+        kept = minmax_indices(y, max_points)
+    return x[kept], y[kept]
+
+def envelope(
+    x: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    max_points: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bucket a band to its outer bounds: the lowest ``lower`` and highest ``upper``."""
+    x, lower, upper = np.asarray(x), np.asarray(lower), np.asarray(upper)
+    max_points = max_points or target_points()
+    if len(x) <= max_points:
+        return x, lower, upper
+    starts = np.arange(0, len(x), -(-len(x) // max_points))
+    return (
+        x[starts],
+        np.fmin.reduceat(lower.astype(np.float64), starts),
+        np.fmax.reduceat(upper.astype(np.float64), starts),
+    )
+
+def scatter_trace(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: Optional[int] = None,
+    method: str = "lttb",
+    **kwargs,
+) -> go.Scatter:
+    """A line trace decimated for the plot width, using WebGL when dense.
+
+    Pass ``max_points=0`` to skip decimation (for example when the data is
+    already binned) and only pick the renderer.
+    """
+    if max_points != 0:
+        x, y = downsample(x, y, max_points, method)
+    trace_type = go.Scattergl if len(x) > WEBGL_POINTS else go.Scatter
+    return trace_type(x=x, y=y, **kwargs)
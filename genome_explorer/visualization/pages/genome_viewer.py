@@ -1,17 +1,86 @@
 """Genome visualization page."""
 
+import pickle
 import streamlit as st
 import plotly.graph_objects as go
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from genome_explorer.core import (
+    BamReader,
+    BlockCache,
+    GenomeFormat,
     GenomeRegion,
+    IntervalIndex,
+    JobContext,
+    RegionSet,
+    SequenceStats,
     VisualizationType,
+    collect_job,
+    config,
+    dataset_store,
+    detect_format,
+    file_digest,
     get_state,
+    interval_index_dir,
+    job_manager,
+    load_vcf,
+    memoize,
+    pack_fasta,
+    packed_genome_dir,
+    poll_jobs,
+    profiled,
+    scan_fastq,
     set_state,
+    variant_table_dir,
 )
+from genome_explorer.core.parsers import FORMAT_ALIASES
+from genome_explorer.core.vcf import open_vcf_stream
+from genome_explorer.visualization.coverage import build_coverage_pyramid
+from genome_explorer.visualization.downsample import scatter_trace
+from genome_explorer.visualization.pyramid import (
+    SummaryPyramid,
+    build_gc_pyramid,
+    pyramid_dir,
+)
+
+# Narrowest window (in bases) shown at maximum zoom
+MIN_WINDOW = 1000
+
+# Widest window for which reads are fetched from an indexed BAM
+MAX_FETCH_SPAN = 1_000_000
+
+# Decompressed BAM blocks, shared by every session in this process
+BLOCK_CACHE = BlockCache()
+
+# Artifact key inside each dataset directory of the shared store
+DATASET_KEY = "upload"
+CONTIGS_FILE = "contigs.pkl"
+
+# Uploads that replace the loaded sequence; the others annotate it
+SEQUENCE_FORMATS = (GenomeFormat.FASTA, GenomeFormat.FASTQ)
+
+# Accepted upload extensions; any format may also be gzip/BGZF-compressed
+UPLOAD_TYPES = [*FORMAT_ALIASES, "gz", "bgz"]
 
-def render_genome_controls() -> None:
+def genome_lengths(
+    contigs: List[SequenceStats], bam: Optional[BamReader] = None
+) -> Dict[str, int]:
+    """Chromosome lengths of the loaded sequence, or of the open BAM."""
+    if contigs:
+        return {contig.name: contig.length for contig in contigs}
+    if bam is not None:
+        return dict(zip(bam.references, bam.lengths))
+    return {}
+
+def render_chromosome_selector(lengths: Dict[str, int]) -> Optional[GenomeRegion]:
+    """Let the user pick which chromosome to view."""
+    if not lengths:
+        return None
+    chromosome = st.sidebar.selectbox("Chromosome", options=list(lengths))
+    return GenomeRegion(chromosome, 0, lengths[chromosome])
+
+def render_genome_controls(region: Optional[GenomeRegion] = None) -> Dict[str, Any]:
     """Render genome visualization controls."""
     st.sidebar.subheader("Visualization Controls")
     
@@ -21,15 +90,44 @@ def render_genome_controls() -> None:
         index=0,
     )
     
-    st.sidebar.slider(
+    zoom = st.sidebar.slider(
         "Zoom Level",
         min_value=1,
         max_value=100,
         value=50,
     )
     
-    st.sidebar.checkbox("Show Labels", value=True)
-    st.sidebar.checkbox("Show Features", value=True)
+    center = None
+    if region is not None and region.end > region.start:
+        center = st.sidebar.slider(
+            "Position",
+            min_value=region.start,
+            max_value=region.end,
+            value=(region.start + region.end) // 2,
+        )
+    
+    return {
+        "viz_type": viz_type,
+        "zoom": zoom,
+        "center": center,
+        "show_labels": st.sidebar.checkbox("Show Labels", value=True),
+        "show_features": st.sidebar.checkbox("Show Features", value=True),
+    }
+
+def zoom_window(region: GenomeRegion, zoom: int, center: Optional[int]) -> GenomeRegion:
+    """Visible part of a region for a 1-100 zoom level.
+
+    Zoom 1 shows the whole region and zoom 100 shows ``MIN_WINDOW`` bases,
+    with the window width shrinking geometrically in between.
+    """
+    length = region.end - region.start
+    if length <= MIN_WINDOW:
+        return region
+    width = int(length * (MIN_WINDOW / length) ** ((zoom - 1) / 99))
+    if center is None:
+        center = region.start + length // 2
+    start = min(max(region.start, center - width // 2), region.end - width)
+    return GenomeRegion(region.chromosome, start, start + width, region.strand)
 
 def render_genome_upload() -> Optional[str]:
     """Render genome file upload section."""
@@ -37,57 +135,283 @@ def render_genome_upload() -> Optional[str]:
     
     uploaded_file = st.file_uploader(
         "Choose a genome file",
-        type=["fasta", "fastq", "bam", "vcf", "bed"],
+        type=UPLOAD_TYPES,
     )
     
+    # Indexed BAMs are too large to upload, so they are opened in place
+    bam_path = st.text_input(
+        "Indexed BAM path",
+        value=get_state("bam_path") or "",
+        help=f"Path to a .bam with a .bai/.csi index, relative to {config.data_dir}",
+    )
+    if bam_path:
+        bam = open_bam_file(bam_path)
+        if bam is not None and st.button("Compute coverage"):
+            # Keyed on the file's mtime so a rewritten BAM is recomputed
+            key = (str(bam.path), bam.path.stat().st_mtime_ns)
+            set_state(
+                "coverage_job",
+                job_manager.submit(
+                    "coverage", compute_coverage, str(bam.path), bam_path, key=key
+                ),
+            )
+    coverage = collect_job("coverage_job", "Coverage")
+    if coverage is not None:
+        set_state("coverage_pyramid_dir", coverage)
+    
     if uploaded_file:
         return process_genome_file(uploaded_file)
     return None
 
-def render_visualization(region: Optional[GenomeRegion] = None) -> None:
-    """Render the genome visualization."""
-    st.subheader("Genome Visualization")
+def open_bam_file(bam_path: str) -> Optional[BamReader]:
+    """Open an indexed BAM once per session and keep the reader in state."""
+    reader = get_state("bam_reader")
+    if reader is not None and get_state("bam_path") == bam_path:
+        return reader
+    
+    # Only files under the data directory may be opened from the page
+    root = config.data_dir.resolve()
+    path = (root / bam_path).resolve()
+    if not path.is_relative_to(root):
+        st.error(f"BAM files must be under {config.data_dir}")
+        return None
+    try:
+        reader = BamReader(path, cache=BLOCK_CACHE)
+    except (OSError, ValueError) as e:
+        st.error(f"Could not open BAM: {e}")
+        return None
+    
+    set_state("bam_reader", reader)
+    set_state("bam_path", bam_path)
+    set_state("coverage_pyramid_dir", None)
+    set_state("coverage_job", None)
+    return reader
+
+def compute_coverage(context: JobContext, bam_file: str, key: str) -> str:
+    """Build the read-depth pyramid of a BAM; runs as a background job."""
+    # The job opens its own reader; the session's one stays on the page thread
+    reader = BamReader(Path(bam_file), cache=BLOCK_CACHE)
+    
+    def report_progress(done: int, total: Optional[int]) -> None:
+        context.progress(done / total if total else 0.0, "Computing read depth")
     
-    # Placeholder visualization
+    pyramid = build_coverage_pyramid(reader, key, progress=report_progress)
+    return str(pyramid.directory)
+
+@memoize(max_entries=64)
+def build_genome_figure(
+    region: Optional[GenomeRegion],
+    pyramid: Optional[SummaryPyramid],
+    track: str,
+) -> go.Figure:
+    """Plotly figure for a region, reused across reruns."""
     fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=[1, 2, 3, 4, 5],
-            y=[1, 2, 3, 4, 5],
-            mode="lines+markers",
-            name="Genome",
+    if (
+        region is not None
+        and pyramid is not None
+        and region.chromosome in pyramid.chromosomes
+    ):
+        # About one zoom-level bin per pixel; each bin already carries its
+        # min/max envelope, so the traces need no further decimation
+        positions, summary = pyramid.query(region, max_points=config.plot_width)
+        fig.add_trace(
+            scatter_trace(
+                positions,
+                summary["max"],
+                max_points=0,
+                mode="lines",
+                line={"width": 0},
+                showlegend=False,
+                hoverinfo="skip",
+            )
         )
-    )
+        fig.add_trace(
+            scatter_trace(
+                positions,
+                summary["min"],
+                max_points=0,
+                mode="lines",
+                line={"width": 0},
+                fill="tonexty",
+                name=f"{track} range",
+            )
+        )
+        fig.add_trace(
+            scatter_trace(
+                positions,
+                summary["mean"],
+                max_points=0,
+                mode="lines",
+                name=track,
+            )
+        )
+        yaxis_title = track.capitalize()
+    else:
+        # Placeholder visualization
+        fig.add_trace(
+            go.Scatter(
+                x=[1, 2, 3, 4, 5],
+                y=[1, 2, 3, 4, 5],
+                mode="lines+markers",
+                name="Genome",
+            )
+        )
+        yaxis_title = "Coverage"
+    
+    title = "Genome Overview"
+    if region is not None:
+        title += f" — {region.chromosome}:{region.start:,}-{region.end:,}"
     
     fig.update_layout(
-        title="Genome Overview",
+        title=title,
         xaxis_title="Position",
-        yaxis_title="Coverage",
+        yaxis_title=yaxis_title,
         showlegend=True,
     )
+    return fig
+
+@profiled
+def render_visualization(
+    region: Optional[GenomeRegion] = None,
+    pyramid: Optional[SummaryPyramid] = None,
+    track: str = "GC content",
+) -> None:
+    """Render the genome visualization."""
+    st.subheader("Genome Visualization")
     
+    fig = build_genome_figure(region, pyramid, track)
     st.plotly_chart(fig, use_container_width=True)
 
+def build_dataset(
+    directory: Path, file, genome_format: GenomeFormat, progress=None
+) -> None:
+    """Parse an upload into a dataset directory of the shared store.
+
+    FASTA is packed and gets a GC pyramid, VCF is split into columns, BED
+    is indexed for overlap queries, and every format stores its contig
+    statistics. Compressed uploads are decompressed while they are read.
+    """
+    file.seek(0)
+    # The VCF and BED readers decompress on their own
+    source = open_vcf_stream(file)
+    # The decompressed size is unknown without a second pass
+    sequence_progress = progress if source is file else None
+    if genome_format == GenomeFormat.FASTA:
+        # Pack while scanning so panning never needs the text file again
+        packed = pack_fasta(
+            source, DATASET_KEY, cache_dir=directory, progress=sequence_progress
+        )
+        contigs = packed.contig_stats()
+        build_gc_pyramid(packed, DATASET_KEY, cache_dir=directory)
+    elif genome_format == GenomeFormat.FASTQ:
+        contigs = [scan_fastq(source, progress=sequence_progress)]
+    else:
+        contigs = []
+        if genome_format == GenomeFormat.VCF:
+            load_vcf(file, DATASET_KEY, cache_dir=directory, progress=progress)
+        elif genome_format == GenomeFormat.BED:
+            index = RegionSet.read_bed(file).to_interval_index()
+            index.save(interval_index_dir(DATASET_KEY, directory))
+    with open(directory / CONTIGS_FILE, "wb") as handle:
+        pickle.dump(contigs, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
 def process_genome_file(file) -> str:
     """Process uploaded genome file."""
-    # TODO: Implement genome file processing
+    file_id = getattr(file, "file_id", file.name)
+    if get_state("genome_file_id") == file_id:
+        return file.name
+    
+    genome_format = detect_format(file.name)
+    progress_bar = st.progress(0.0, text=f"Hashing {file.name}...")
+    
+    def report_progress(bytes_read: int, total: Optional[int]) -> None:
+        if total:
+            progress_bar.progress(min(bytes_read / total, 1.0))
+    
+    # Uploads are stored by content, so a file another session already
+    # parsed is only hashed here, never parsed again
+    file.seek(0)
+    digest = file_digest(file, progress=report_progress)
+    progress_bar.progress(0.0, text=f"Reading {file.name}...")
+    
+    def build(directory: Path) -> None:
+        build_dataset(directory, file, genome_format, report_progress)
+    
+    lease = dataset_store.acquire(
+        f"{digest}.{genome_format.value}", build, name=file.name
+    )
+    progress_bar.empty()
+    
+    # One lease per format, so a VCF upload keeps the reference it annotates;
+    # replacing a lease releases the previous upload of that format
+    leases = dict(get_state("dataset_leases") or {})
+    leases[genome_format.value] = lease
+    set_state("dataset_leases", leases)
+    
+    directory = lease.directory
+    if genome_format == GenomeFormat.FASTA:
+        set_state("packed_genome_dir", str(packed_genome_dir(DATASET_KEY, directory)))
+        set_state("gc_pyramid_dir", str(pyramid_dir(DATASET_KEY, "gc", directory)))
+    elif genome_format == GenomeFormat.VCF:
+        set_state("variant_table_dir", str(variant_table_dir(DATASET_KEY, directory)))
+    elif genome_format == GenomeFormat.BED:
+        set_state("feature_index_dir", str(interval_index_dir(DATASET_KEY, directory)))
+    if genome_format in SEQUENCE_FORMATS:
+        with open(directory / CONTIGS_FILE, "rb") as handle:
+            contigs = pickle.load(handle)
+        set_state("genome_contigs", contigs)
+        set_state("genome_digest", digest)
+    
+    set_state("genome_file_id", file_id)
     return file.name
 
+@profiled
 def render() -> None:
     """Render the genome visualization page."""
     st.title("Genome Visualizer")
     
-    # Sidebar controls
-    render_genome_controls()
-    
     # Main content
     col1, col2 = st.columns([2, 1])
     
-    with col1:
-        render_visualization()
-    
+    # Process uploads first so the plot reflects them on the same rerun
     with col2:
         genome_file = render_genome_upload()
         if genome_file:
             st.success(f"Loaded genome: {genome_file}")
-            set_state("current_genome", genome_file) 
\ No newline at end of file
+            set_state("current_genome", genome_file)
+    
+    bam = get_state("bam_reader")
+    lengths = genome_lengths(get_state("genome_contigs") or [], bam)
+    
+    # Sidebar controls
+    region = render_chromosome_selector(lengths)
+    controls = render_genome_controls(region)
+    
+    track = "GC content"
+    pyramid_path = get_state("gc_pyramid_dir")
+    coverage_path = get_state("coverage_pyramid_dir")
+    if coverage_path and (
+        controls["viz_type"] == VisualizationType.COVERAGE.value or not pyramid_path
+    ):
+        track, pyramid_path = "read depth", coverage_path
+    pyramid = SummaryPyramid.open(Path(pyramid_path)) if pyramid_path else None
+    if region is not None:
+        region = zoom_window(region, controls["zoom"], controls["center"])
+    
+    with col1:
+        render_visualization(region, pyramid, track)
+        if (
+            bam is not None
+            and region is not None
+            and region.chromosome in bam.references
+            and region.end - region.start <= MAX_FETCH_SPAN
+        ):
+            # Only the BGZF blocks indexed for this window are decompressed
+            st.metric("Reads in view", f"{bam.count(region):,}")
+        feature_path = get_state("feature_index_dir")
+        if feature_path and region is not None and controls["show_features"]:
+            # Memory-mapped, so reopening on every rerun reads no intervals
+            features = IntervalIndex.load(Path(feature_path))
+            st.metric("Features in view", f"{len(features.overlaps(region)):,}")
+    
+    poll_jobs(["coverage_job"])
\ No newline at end of file
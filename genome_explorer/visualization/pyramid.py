@@ -0,0 +1,231 @@
+"""Multi-resolution summary pyramid (zoom levels) for genome tracks."""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from genome_explorer.core import GenomeRegion, TwoBitGenome, config
+
+META_FILE = "meta.json"
+BASE_BIN = 64
+# Stop adding coarser levels once a chromosome fits in this many bins
+MIN_BINS = 512
+# Upper bound on bins returned for one view
+MAX_POINTS = 2000
+# Bases pulled from the source per step while building the finest level
+BUILD_CHUNK = 1 << 22
+
+SUMMARY_DTYPE = np.dtype(
+    [("min", "<f4"), ("max", "<f4"), ("mean", "<f4"), ("count", "<u4")]
+)
+
+def pyramid_dir(key: str, track: str, cache_dir: Optional[Path] = None) -> Path:
+    """Directory holding one track's pyramid for a genome."""
+    safe_key = re.sub(r"[^A-Za-z0-9._-]", "_", key)
+    return Path(cache_dir or config.cache_dir) / "pyramids" / safe_key / track
+
+def summarize_bins(values: np.ndarray, valid: np.ndarray, bin_size: int) -> np.ndarray:
+    """Summarize per-base values into fixed-size bins.
+
+    ``len(values)`` need not be a multiple of ``bin_size``; the last bin is
+    padded with invalid positions.
+    """
+    nbins = -(-len(values) // bin_size)
+    pad = nbins * bin_size - len(values)
+    values = np.pad(values.astype(np.float32), (0, pad)).reshape(nbins, bin_size)
+    valid = np.pad(valid, (0, pad)).reshape(nbins, bin_size)
+
+    summary = np.zeros(nbins, dtype=SUMMARY_DTYPE)
+    count = valid.sum(axis=1)
+    summary["count"] = count
+    summary["min"] = np.where(valid, values, np.inf).min(axis=1)
+    summary["max"] = np.where(valid, values, -np.inf).max(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        summary["mean"] = np.where(valid, values, 0).sum(axis=1) / count
+    empty = count == 0
+    summary["min"][empty] = np.nan
+    summary["max"][empty] = np.nan
+    return summary
+
+def merge_pairs(summary: np.ndarray) -> np.ndarray:
+    """Halve resolution by merging neighbouring bins."""
+    if len(summary) % 2:
+        summary = np.append(summary, np.zeros(1, dtype=SUMMARY_DTYPE))
+        summary["min"][-1] = summary["max"][-1] = np.nan
+    left, right = summary[0::2], summary[1::2]
+
+    merged = np.zeros(len(left), dtype=SUMMARY_DTYPE)
+    count = left["count"] + right["count"]
+    merged["count"] = count
+    merged["min"] = np.fmin(left["min"], right["min"])
+    merged["max"] = np.fmax(left["max"], right["max"])
+    total = (
+        np.nan_to_num(left["mean"]) * left["count"]
+        + np.nan_to_num(right["mean"]) * right["count"]
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        merged["mean"] = total / count
+    return merged
+
+class PyramidWriter:
+    """Builds zoom levels for one track, chromosome by chromosome.
+
+    The finest level is filled chunk by chunk into a memory-mapped file, and
+    each coarser level is derived from the one below it, so memory stays
+    bounded by the chunk size rather than the chromosome length.
+    """
+
+    def __init__(self, directory: Path, base_bin: int = BASE_BIN) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.base_bin = base_bin
+        self.chromosomes: Dict[str, Dict[str, object]] = {}
+
+    def add_chromosome(
+        self,
+        chrom: str,
+        length: int,
+        chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+    ) -> None:
+        """Add a chromosome from consecutive ``(values, valid)`` chunks."""
+        chrom_id = len(self.chromosomes)
+        nbins = max(1, -(-length // self.base_bin))
+        level = open_memmap(
+            self.directory / f"{chrom_id}.{self.base_bin}.npy",
+            mode="w+",
+            dtype=SUMMARY_DTYPE,
+            shape=(nbins,),
+        )
+
+        filled = 0
+        carry_values = np.zeros(0, dtype=np.float32)
+        carry_valid = np.zeros(0, dtype=bool)
+        for values, valid in chunks:
+            values = np.concatenate((carry_values, values))
+            valid = np.concatenate((carry_valid, valid))
+            usable = len(values) - len(values) % self.base_bin
+            if usable:
+                summary = summarize_bins(values[:usable], valid[:usable], self.base_bin)
+                level[filled : filled + len(summary)] = summary
+                filled += len(summary)
+            carry_values, carry_valid = values[usable:], valid[usable:]
+        if len(carry_values):
+            level[filled : filled + 1] = summarize_bins(
+                carry_values, carry_valid, self.base_bin
+            )
+        level.flush()
+
+        bin_sizes = [self.base_bin]
+        while len(level) > MIN_BINS:
+            level = merge_pairs(np.asarray(level))
+            bin_sizes.append(bin_sizes[-1] * 2)
+            np.save(self.directory / f"{chrom_id}.{bin_sizes[-1]}.npy", level)
+
+        self.chromosomes[chrom] = {
+            "id": chrom_id,
+            "length": length,
+            "bin_sizes": bin_sizes,
+        }
+
+    def close(self) -> "SummaryPyramid":
+        """Write the metadata and open the pyramid for reading."""
+        with open(self.directory / META_FILE, "w") as handle:
+            json.dump({"chromosomes": self.chromosomes}, handle)
+        return SummaryPyramid(self.directory)
+
+class SummaryPyramid:
+    """Read side of a pyramid; each query reads only the visible bins."""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        with open(self.directory / META_FILE) as handle:
+            self.chromosomes: Dict[str, Dict] = json.load(handle)["chromosomes"]
+        self._levels: Dict[Tuple[str, int], np.ndarray] = {}
+
+    @classmethod
+    def open(cls, directory: Path) -> Optional["SummaryPyramid"]:
+        """Open a pyramid, or None if it has not been built."""
+        if not (Path(directory) / META_FILE).exists():
+            return None
+        return cls(directory)
+
+    def __cache_key__(self) -> tuple:
+        """Location and build time, for memoized figure construction."""
+        return (str(self.directory), (self.directory / META_FILE).stat().st_mtime_ns)
+
+    def _level(self, chrom: str, bin_size: int) -> np.ndarray:
+        key = (chrom, bin_size)
+        if key not in self._levels:
+            chrom_id = self.chromosomes[chrom]["id"]
+            self._levels[key] = np.load(
+                self.directory / f"{chrom_id}.{bin_size}.npy", mmap_mode="r"
+            )
+        return self._levels[key]
+
+    def choose_bin_size(self, chrom: str, span: int, max_points: int = MAX_POINTS) -> int:
+        """Finest bin size that draws ``span`` bases in at most ``max_points``."""
+        bin_sizes: List[int] = self.chromosomes[chrom]["bin_sizes"]
+        for bin_size in bin_sizes:
+            if span / bin_size <= max_points:
+                return bin_size
+        return bin_sizes[-1]
+
+    def query(
+        self, region: GenomeRegion, max_points: int = MAX_POINTS
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Bin start positions and summaries covering a region."""
+        if region.chromosome not in self.chromosomes:
+            raise KeyError(f"Unknown chromosome: {region.chromosome}")
+        length = self.chromosomes[region.chromosome]["length"]
+        start, end = max(0, region.start), min(region.end, length)
+        bin_size = self.choose_bin_size(
+            region.chromosome, max(end - start, 1), max_points
+        )
+        level = self._level(region.chromosome, bin_size)
+        first, last = start // bin_size, -(-end // bin_size)
+        summary = np.array(level[first:last])
+        positions = np.arange(first, first + len(summary), dtype=np.int64) * bin_size
+        return positions, summary
+
+def _gc_chunks(
+    genome: TwoBitGenome, chrom: str, chunk_size: int, window: int
+) -> Iterable[Tuple[np.ndarray, np.ndarray]]:
+    """GC fraction of each ``window``-base window, repeated per base, and the
+    called-base mask for a contig.
+
+    Summarizing fractions rather than a per-base G/C indicator gives the
+    pyramid's min/max a real envelope: the GC range between windows.
+    """
+    length = genome.lengths[chrom]
+    chunk_size = max(window, chunk_size - chunk_size % window)
+    for start in range(0, length, chunk_size):
+        bases = genome.fetch(chrom, start, start + chunk_size, soft_mask=False)
+        called = bases != ord("N")
+        gc = (bases == ord("G")) | (bases == ord("C"))
+        starts = np.arange(0, len(bases), window)
+        gc_count = np.add.reduceat(gc.astype(np.int64), starts)
+        called_count = np.add.reduceat(called.astype(np.int64), starts)
+        fraction = gc_count / np.maximum(called_count, 1)
+        yield np.repeat(fraction.astype(np.float32), window)[: len(bases)], called
+
+def build_gc_pyramid(
+    genome: TwoBitGenome,
+    key: str,
+    cache_dir: Optional[Path] = None,
+    base_bin: int = BASE_BIN,
+) -> SummaryPyramid:
+    """Build the GC-content pyramid for a packed genome.
+
+    GC content is measured over windows of ``base_bin`` bases, the finest
+    zoom level.
+    """
+    writer = PyramidWriter(pyramid_dir(key, "gc", cache_dir), base_bin)
+    for chrom, length in genome.lengths.items():
+        writer.add_chromosome(
+            chrom, length, _gc_chunks(genome, chrom, BUILD_CHUNK, base_bin)
+        )
+    return writer.close()
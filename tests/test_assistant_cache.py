@@ -0,0 +1,100 @@
+"""Tests for which assistant answers reach the shared response cache."""
+
+import pytest
+
+from genome_explorer.ai.llm import ResponseStream, TemplateBackend
+from genome_explorer.core import set_state
+
+assistant = pytest.importorskip("genome_explorer.ai.pages.ai_assistant")
+
+
+class FakeCache:
+    def __init__(self):
+        self.answers = {}
+
+    def get(self, query):
+        return self.answers.get(query), "exact"
+
+    def put(self, query, answer):
+        self.answers[query] = answer
+
+
+class StaticBackend:
+    """Stands in for a configured API backend."""
+
+    def __init__(self, answer="Genes are units of heredity."):
+        self.answer = answer
+
+    async def stream(self, messages, max_tokens, temperature):
+        for word in self.answer.split(" "):
+            yield word + " "
+
+
+class FailingBackend:
+    async def stream(self, messages, max_tokens, temperature):
+        raise ConnectionError("network down")
+        yield ""
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(assistant, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(assistant, "retrieve_context", lambda query: [])
+    set_state("chat_history", [])
+    set_state("active_response", None)
+    return cache
+
+
+def ask(monkeypatch, question, backend):
+    monkeypatch.setattr(assistant, "get_chat_backend", lambda query, context: backend)
+    stream = assistant.stream_ai_response(question)
+    assistant.get_conversation().append("user", question, "now")
+    set_state("active_response", stream)
+    try:
+        "".join(stream)
+    except Exception:
+        pass
+    assistant.finish_active_response()
+    return stream
+
+
+def test_completed_opening_answer_is_cached(cache, monkeypatch):
+    ask(monkeypatch, "What is a gene?", StaticBackend())
+    assert cache.answers == {"What is a gene?": "Genes are units of heredity."}
+
+
+def test_failed_answer_is_not_cached(cache, monkeypatch):
+    stream = ask(monkeypatch, "What is a gene?", FailingBackend())
+    assert isinstance(stream.error, ConnectionError)
+    assert not stream.completed
+    assert cache.answers == {}
+
+
+def test_failed_answer_falls_back_to_local_answer(cache, monkeypatch):
+    ask(monkeypatch, "What is a gene?", FailingBackend())
+    role, content, _ = assistant.get_conversation()[-1]
+    assert role == "assistant"
+    assert content == assistant.compose_local_answer("What is a gene?", [])
+
+
+def test_follow_up_is_not_cached_or_served(cache, monkeypatch):
+    ask(monkeypatch, "What is a gene?", StaticBackend())
+    cache.answers["Explain that more simply"] = "stale answer"
+    stream = ask(monkeypatch, "Explain that more simply", StaticBackend("Simpler."))
+    assert stream.text.strip() == "Simpler."
+    assert cache.answers["Explain that more simply"] == "stale answer"
+
+
+def test_offline_fallback_is_not_cached(cache, monkeypatch):
+    ask(monkeypatch, "What is a gene?", TemplateBackend(lambda messages: "offline"))
+    assert cache.answers == {}
+
+
+def test_stream_records_backend_error():
+    stream = ResponseStream(FailingBackend(), [{"role": "user", "content": "q"}])
+    with pytest.raises(ConnectionError):
+        list(stream)
+    stream._thread.join(5)
+    assert stream.done and not stream.completed
+    assert stream.text == ""
@@ -0,0 +1,292 @@
+"""Brute-force tests for indexed BAM queries against BAI and CSI indexes."""
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from genome_explorer.core import BamReader, BlockCache, GenomeRegion
+from genome_explorer.core.bam import aligned_blocks, region_to_bins
+
+REFERENCES = [("chr1", 300_000), ("chr2", 120_000)]
+RECORDS_PER_BLOCK = 40
+MIN_SHIFT, DEPTH = 14, 5
+CIGAR_CODES = {op: code for code, op in enumerate("MIDNSHP=X")}
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+
+
+def bgzf_block(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    payload = compressor.compress(data) + compressor.flush()
+    header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00"
+    size = len(header) + 2 + len(payload) + 8
+    trailer = struct.pack("<II", zlib.crc32(data), len(data))
+    return header + struct.pack("<H", size - 1) + payload + trailer
+
+
+def reg2bin(beg: int, end: int) -> int:
+    end -= 1
+    for level in range(DEPTH, 0, -1):
+        shift = MIN_SHIFT + (DEPTH - level) * 3
+        if beg >> shift == end >> shift:
+            return ((1 << (level * 3)) - 1) // 7 + (beg >> shift)
+    return 0
+
+
+def bin_first_window(bin_id: int) -> int:
+    """Finest-level window at which a bin starts."""
+    level = 0
+    while bin_id >= ((1 << ((level + 1) * 3)) - 1) // 7:
+        level += 1
+    return (bin_id - ((1 << (level * 3)) - 1) // 7) << ((DEPTH - level) * 3)
+
+
+def random_reads(rng: np.random.Generator) -> list[dict]:
+    reads = []
+    for ref_id, (_, length) in enumerate(REFERENCES):
+        starts = np.sort(rng.integers(0, length - 2000, size=rng.integers(400, 800)))
+        # A few long reads cross coarse bins; some reads are unmapped
+        for i, start in enumerate(starts.tolist()):
+            ops = [("M", int(rng.integers(20, 150)))]
+            if rng.random() < 0.3:
+                ops += [
+                    ("D" if rng.random() < 0.5 else "N", int(rng.integers(1, 1500)))
+                ]
+                ops += [("S", 5), ("M", int(rng.integers(10, 100)))]
+            if rng.random() < 0.2:
+                ops = [("S", 3), *ops, ("I", 2), ("=", 7), ("X", 1)]
+            span = sum(n for op, n in ops if op in "MDN=X")
+            reads.append(
+                {
+                    "ref_id": ref_id,
+                    "start": start,
+                    "end": start + span,
+                    "name": f"r{ref_id}_{i}",
+                    "flag": 4 if rng.random() < 0.05 else 0,
+                    "mapq": int(rng.integers(0, 61)),
+                    "cigar": ops,
+                }
+            )
+    return reads
+
+
+def encode_record(read: dict) -> bytes:
+    name = read["name"].encode() + b"\x00"
+    cigar = [n << 4 | CIGAR_CODES[op] for op, n in read["cigar"]]
+    body = struct.pack(
+        "<iiBBHHHiiii",
+        read["ref_id"],
+        read["start"],
+        len(name),
+        read["mapq"],
+        reg2bin(read["start"], read["end"]),
+        len(cigar),
+        read["flag"],
+        0,
+        -1,
+        -1,
+        0,
+    )
+    body += name + struct.pack(f"<{len(cigar)}I", *cigar)
+    return struct.pack("<i", len(body)) + body
+
+
+def write_bam(path, reads: list[dict]) -> list[tuple[int, int]]:
+    """Write a BAM and return each read's (begin, end) virtual offsets."""
+    header = b"BAM\x01" + struct.pack("<i", 0) + struct.pack("<i", len(REFERENCES))
+    for name, length in REFERENCES:
+        header += struct.pack("<i", len(name) + 1) + name.encode() + b"\x00"
+        header += struct.pack("<i", length)
+    blocks = [bgzf_block(header)]
+    coffset = len(blocks[0])
+    offsets = []
+    for lo in range(0, len(reads), RECORDS_PER_BLOCK):
+        data = b""
+        for read in reads[lo : lo + RECORDS_PER_BLOCK]:
+            record = encode_record(read)
+            begin = (coffset << 16) | len(data)
+            offsets.append((begin, begin + len(record)))
+            data += record
+        blocks.append(bgzf_block(data))
+        coffset += len(blocks[-1])
+    # The last record ends at the start of the EOF block
+    if offsets:
+        last_beg, _ = offsets[-1]
+        offsets[-1] = (last_beg, coffset << 16)
+    path.write_bytes(b"".join(blocks) + BGZF_EOF)
+    return offsets
+
+
+def index_entries(reads, offsets):
+    """Per-reference bin chunks, linear index and bin loffsets."""
+    refs = []
+    for ref_id, (_, length) in enumerate(REFERENCES):
+        bins: dict[int, list[tuple[int, int]]] = {}
+        linear = np.zeros((length >> MIN_SHIFT) + 1, dtype=np.int64)
+        for read, (beg, end) in zip(reads, offsets, strict=False):
+            if read["ref_id"] != ref_id:
+                continue
+            bins.setdefault(reg2bin(read["start"], read["end"]), []).append((beg, end))
+            first, last = read["start"] >> MIN_SHIFT, (read["end"] - 1) >> MIN_SHIFT
+            for window in range(first, last + 1):
+                if linear[window] == 0 or beg < linear[window]:
+                    linear[window] = beg
+        # Windows no read overlaps take the previous window's offset
+        linear = np.maximum.accumulate(linear)
+        refs.append((bins, linear))
+    return refs
+
+
+def write_bai(path, reads, offsets) -> None:
+    data = b"BAI\x01" + struct.pack("<i", len(REFERENCES))
+    for bins, linear in index_entries(reads, offsets):
+        data += struct.pack("<i", len(bins))
+        for bin_id, chunks in sorted(bins.items()):
+            data += struct.pack("<Ii", bin_id, len(chunks))
+            data += b"".join(struct.pack("<QQ", beg, end) for beg, end in chunks)
+        data += struct.pack("<i", len(linear)) + linear.astype("<u8").tobytes()
+    path.write_bytes(data)
+
+
+def write_csi(path, reads, offsets) -> None:
+    data = b"CSI\x01" + struct.pack("<iiii", MIN_SHIFT, DEPTH, 0, len(REFERENCES))
+    for bins, linear in index_entries(reads, offsets):
+        data += struct.pack("<i", len(bins))
+        for bin_id, chunks in sorted(bins.items()):
+            # As in htslib: the linear offset at the bin's first window
+            loffset = int(linear[min(bin_first_window(bin_id), len(linear) - 1)])
+            data += struct.pack("<IQi", bin_id, loffset, len(chunks))
+            data += b"".join(struct.pack("<QQ", beg, end) for beg, end in chunks)
+    blocks = [bgzf_block(data[lo : lo + 60000]) for lo in range(0, len(data), 60000)]
+    path.write_bytes(b"".join(blocks) + BGZF_EOF)
+
+
+@pytest.fixture(scope="module", params=["bai", "csi"])
+def indexed_bam(request, tmp_path_factory):
+    directory = tmp_path_factory.mktemp(request.param)
+    reads = random_reads(np.random.default_rng(7))
+    path = directory / "reads.bam"
+    offsets = write_bam(path, reads)
+    if request.param == "bai":
+        write_bai(directory / "reads.bam.bai", reads, offsets)
+    else:
+        write_csi(directory / "reads.bam.csi", reads, offsets)
+    reader = BamReader(path, cache=BlockCache(max_bytes=1 << 16))
+    yield reader, reads
+    reader.close()
+
+
+def expected(reads, region: GenomeRegion) -> list[dict]:
+    ref_id = [name for name, _ in REFERENCES].index(region.chromosome)
+    return [
+        read
+        for read in reads
+        if read["ref_id"] == ref_id
+        and not read["flag"] & 4
+        and read["start"] < region.end
+        and read["end"] > region.start
+    ]
+
+
+def query_regions(seed: int, count: int) -> list[GenomeRegion]:
+    rng = np.random.default_rng(seed)
+    regions = []
+    for _ in range(count):
+        name, length = REFERENCES[rng.integers(len(REFERENCES))]
+        start = int(rng.integers(0, length))
+        span = int(rng.choice([1, 50, 2000, 20_000, 200_000]))
+        regions.append(GenomeRegion(name, start, min(start + span, length)))
+    return regions
+
+
+def test_header(indexed_bam):
+    reader, _ = indexed_bam
+    assert reader.references == [name for name, _ in REFERENCES]
+    assert reader.lengths == [length for _, length in REFERENCES]
+
+
+def test_fetch_and_count_match_brute_force(indexed_bam):
+    reader, reads = indexed_bam
+    for region in query_regions(0, 150):
+        want = expected(reads, region)
+        got = list(reader.fetch(region))
+        assert [(r.name, r.start, r.end) for r in got] == [
+            (r["name"], r["start"], r["end"]) for r in want
+        ]
+        assert reader.count(region) == len(want)
+
+
+def test_fetch_decodes_record_fields(indexed_bam):
+    reader, reads = indexed_bam
+    region = GenomeRegion("chr1", 0, REFERENCES[0][1])
+    by_name = {read["name"]: read for read in reads}
+    for record in reader.fetch(region):
+        read = by_name[record.name]
+        assert record.mapq == read["mapq"]
+        assert record.flag == read["flag"]
+        assert record.cigar_string == "".join(f"{n}{op}" for op, n in read["cigar"])
+
+
+def test_fetch_spans_match_fetch(indexed_bam):
+    reader, reads = indexed_bam
+    for region in query_regions(1, 20):
+        spans = reader.fetch_spans(region)
+        want = expected(reads, region)
+        assert spans["start"].tolist() == [r["start"] for r in want]
+        assert spans["end"].tolist() == [r["end"] for r in want]
+        assert spans["mapq"].tolist() == [r["mapq"] for r in want]
+
+
+def test_span_batches_cover_every_mapped_read(indexed_bam):
+    reader, reads = indexed_bam
+    for name, length in REFERENCES:
+        want = expected(reads, GenomeRegion(name, 0, length))
+        batches = list(reader.span_batches(name, batch_size=97))
+        assert all(len(starts) <= 97 for starts, _ in batches)
+        starts = np.concatenate([starts for starts, _ in batches])
+        ends = np.concatenate([ends for _, ends in batches])
+        assert starts.tolist() == [r["start"] for r in want]
+        assert ends.tolist() == [r["end"] for r in want]
+
+
+def test_unknown_reference(indexed_bam):
+    reader, _ = indexed_bam
+    with pytest.raises(KeyError):
+        reader.count(GenomeRegion("chrX", 0, 10))
+
+
+def test_aligned_blocks_skip_deletions_and_introns():
+    cigars = [
+        np.array([10 << 4 | 0, 5 << 4 | 2, 3 << 4 | 4, 7 << 4 | 0], dtype=np.uint32),
+        np.array(
+            [2 << 4 | 4, 4 << 4 | 7, 1 << 4 | 1, 6 << 4 | 3, 2 << 4 | 8],
+            dtype=np.uint32,
+        ),
+    ]
+    starts, ends = aligned_blocks(np.array([100, 1000]), cigars)
+    assert list(zip(starts.tolist(), ends.tolist(), strict=False)) == [
+        (100, 110),
+        (115, 122),
+        (1000, 1004),
+        (1010, 1012),
+    ]
+
+
+def test_aligned_blocks_skip_reads_without_cigar():
+    match = np.array([5 << 4 | 0], dtype=np.uint32)
+    empty = np.zeros(0, dtype=np.uint32)
+    starts, ends = aligned_blocks(
+        np.array([0, 10, 20, 30]), [empty, match, empty, empty]
+    )
+    assert list(zip(starts.tolist(), ends.tolist(), strict=False)) == [(10, 15)]
+    starts, ends = aligned_blocks(np.array([0]), [empty])
+    assert len(starts) == len(ends) == 0
+
+
+def test_region_to_bins_contains_reg2bin():
+    rng = np.random.default_rng(3)
+    for _ in range(500):
+        beg = int(rng.integers(0, 1 << 29))
+        end = beg + int(rng.integers(1, 1 << 20))
+        assert reg2bin(beg, end) in region_to_bins(beg, end, MIN_SHIFT, DEPTH)
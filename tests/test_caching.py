@@ -0,0 +1,46 @@
+"""Tests for rerun-aware memoization."""
+
+import numpy as np
+
+from genome_explorer.core import hash_value, memoize
+
+
+def test_memoize_reuses_results_and_counts():
+    calls = []
+
+    @memoize(max_entries=2)
+    def total(values: np.ndarray, scale: int = 1) -> float:
+        calls.append(scale)
+        return float(values.sum() * scale)
+
+    values = np.arange(10)
+    assert total(values) == 45.0
+    assert total(np.arange(10)) == 45.0
+    assert total(values, scale=2) == 90.0
+    assert calls == [1, 2]
+    assert total.cache_stats() == {"hits": 1, "misses": 2}
+    assert total.__name__ == "total"
+
+    total.cache_clear()
+    assert total(values) == 45.0
+    assert calls == [1, 2, 1]
+
+
+def test_hash_value_distinguishes_types_and_contents():
+    assert hash_value([1, 2]) != hash_value((1, 2))
+    assert hash_value({"a": 1, "b": 2}) == hash_value({"b": 2, "a": 1})
+    assert hash_value(np.zeros(3, np.int32)) != hash_value(np.zeros(3, np.int64))
+
+
+def test_memmap_views_hash_by_position(tmp_path):
+    path = tmp_path / "values.npy"
+    np.save(path, np.arange(300, dtype=np.float64))
+    mapped = np.load(path, mmap_mode="r")
+    assert hash_value(mapped[0:100]) != hash_value(mapped[100:200])
+    assert hash_value(mapped[100:200]) == hash_value(mapped[100:200])
+    assert hash_value(mapped[100:200]) == hash_value(mapped[50:250][50:150])
+    assert hash_value(mapped[::2]) != hash_value(mapped[1::2])
+    # Reopening the same unchanged file gives the same keys
+    assert hash_value(np.load(path, mmap_mode="r")[5:9]) == hash_value(mapped[5:9])
+    # Arrays computed from a mapping are hashed by content
+    assert hash_value(mapped[:3] + 0) == hash_value(np.arange(3, dtype=np.float64))
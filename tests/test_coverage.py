@@ -0,0 +1,78 @@
+"""Tests for chunked read-depth computation and the coverage pyramid."""
+
+import itertools
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.core import GenomeRegion
+from genome_explorer.visualization.coverage import build_coverage_pyramid, depth_chunks
+
+
+class FakeReader:
+    """Stands in for a BamReader: references and their read spans."""
+
+    def __init__(self, reads: dict[str, list[tuple[int, int]]]) -> None:
+        self.reads = reads
+        self.references = ["chr1", "chr2"]
+        self.lengths = [300, 100]
+
+    def span_batches(self, chrom: str, blocks: bool = True):
+        spans = self.reads.get(chrom, [])
+        yield (
+            np.array([start for start, _ in spans], dtype=np.int64),
+            np.array([end for _, end in spans], dtype=np.int64),
+        )
+
+
+@settings(max_examples=300, deadline=None)
+@given(
+    length=st.integers(1, 500),
+    chunk_size=st.integers(1, 120),
+    data=st.data(),
+)
+def test_depth_chunks_match_brute_force(length, chunk_size, data):
+    reads = data.draw(
+        st.lists(st.tuples(st.integers(0, length - 1), st.integers(0, 80)), max_size=60)
+    )
+    reads.sort()
+    starts = np.array([start for start, _ in reads], dtype=np.int64)
+    # Reads may run past the end of the chromosome
+    ends = starts + np.array([span for _, span in reads], dtype=np.int64)
+    cuts = sorted(data.draw(st.lists(st.integers(0, len(reads)), max_size=5)))
+    bounds = [0, *cuts, len(reads)]
+    batches = [(starts[lo:hi], ends[lo:hi]) for lo, hi in itertools.pairwise(bounds)]
+
+    chunks = list(depth_chunks(batches, length, chunk_size))
+    assert [len(chunk) for chunk in chunks[:-1]] == [chunk_size] * (len(chunks) - 1)
+
+    expected = np.zeros(length, dtype=np.int32)
+    for start, end in zip(starts.tolist(), ends.tolist(), strict=False):
+        expected[start : min(end, length)] += 1
+    assert np.array_equal(np.concatenate(chunks), expected)
+
+
+def test_no_reads_gives_zero_depth():
+    chunks = list(depth_chunks([], 10, chunk_size=4))
+    assert [chunk.tolist() for chunk in chunks] == [[0] * 4, [0] * 4, [0] * 2]
+
+
+def test_coverage_pyramid_reports_progress(tmp_path):
+    reader = FakeReader({"chr1": [(10, 50), (20, 30)], "chr2": [(0, 100)]})
+    calls: list[tuple[int, int | None]] = []
+    pyramid = build_coverage_pyramid(
+        reader,
+        "reads.bam",
+        cache_dir=tmp_path,
+        base_bin=1,
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    assert calls == [(300, 400), (400, 400)]
+    _, summary = pyramid.query(GenomeRegion("chr1", 0, 60))
+    expected = np.zeros(60)
+    expected[10:50] += 1
+    expected[20:30] += 1
+    assert summary["mean"].tolist() == expected.tolist()
+    _, summary = pyramid.query(GenomeRegion("chr2", 0, 100))
+    assert summary["mean"].tolist() == [1.0] * 100
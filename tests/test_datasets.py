@@ -0,0 +1,94 @@
+"""Tests for the content-addressed dataset store."""
+
+import threading
+import time
+from pathlib import Path
+
+from genome_explorer.core.datasets import READY_FILE, DatasetStore
+
+
+def test_concurrent_acquire_builds_once(tmp_path):
+    store = DatasetStore(tmp_path)
+    builds = []
+
+    def build(directory: Path) -> None:
+        builds.append(directory)
+        time.sleep(0.05)
+        (directory / "data.bin").write_bytes(b"x" * 100)
+
+    leases = []
+
+    def worker() -> None:
+        leases.append(store.acquire("key", build))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert {lease.directory for lease in leases} == {store.directory("key")}
+    assert (store.directory("key") / "data.bin").read_bytes() == b"x" * 100
+    assert store.stats()["datasets"][0]["refs"] == 8
+
+
+def test_acquire_after_build_lock_dropped_finds_dataset(tmp_path):
+    store = DatasetStore(tmp_path)
+    builds = []
+    late = []
+
+    def build(directory: Path) -> None:
+        builds.append(directory)
+        (directory / "data.bin").write_bytes(b"data")
+
+    class Building(dict):
+        def pop(self, key, default=None):
+            lock = super().pop(key, default)
+            # The next caller arrives the moment the build lock is gone
+            if not late:
+                late.append(store.acquire(key, build))
+            return lock
+
+    store._building = Building()
+    lease = store.acquire("key", build)
+    assert len(builds) == 1
+    assert late[0].directory == lease.directory
+    assert (lease.directory / "data.bin").read_bytes() == b"data"
+
+
+def test_ready_dataset_on_disk_is_reused_not_rebuilt(tmp_path):
+    DatasetStore(tmp_path).acquire(
+        "key", lambda directory: (directory / "data.bin").write_bytes(b"first")
+    )
+    # A second store has already scanned, so it has not seen the dataset
+    store = DatasetStore(tmp_path)
+    store._scanned = True
+    lease = store.acquire(
+        "key", lambda directory: (directory / "data.bin").write_bytes(b"second")
+    )
+    assert (lease.directory / "data.bin").read_bytes() == b"first"
+
+
+def test_interrupted_build_is_replaced(tmp_path):
+    store = DatasetStore(tmp_path)
+    partial = store.directory("key")
+    partial.mkdir(parents=True)
+    (partial / "data.bin").write_bytes(b"partial")
+    store._scanned = True
+    lease = store.acquire(
+        "key", lambda directory: (directory / "data.bin").write_bytes(b"done")
+    )
+    assert (lease.directory / "data.bin").read_bytes() == b"done"
+    assert (lease.directory / READY_FILE).exists()
+
+
+def test_released_datasets_evicted_over_budget(tmp_path):
+    store = DatasetStore(tmp_path, max_bytes=150)
+    first = store.acquire("a", lambda d: (d / "data.bin").write_bytes(b"x" * 100))
+    second = store.acquire("b", lambda d: (d / "data.bin").write_bytes(b"x" * 100))
+    assert store.evictions == 0
+    first.release()
+    assert store.evictions == 1
+    assert not store.directory("a").exists()
+    assert (second.directory / "data.bin").exists()
@@ -0,0 +1,149 @@
+"""Tests for LTTB and min-max decimation of plotted series."""
+
+import numpy as np
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+pytest.importorskip("plotly")
+
+import plotly.graph_objects as go
+
+from genome_explorer.visualization.downsample import (
+    WEBGL_POINTS,
+    downsample,
+    envelope,
+    lttb_indices,
+    minmax_indices,
+    scatter_trace,
+)
+
+
+def reference_lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> list[int]:
+    """Point-by-point LTTB over the same bucket edges."""
+    n = len(y)
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    kept, anchor = [0], 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[stop : edges[i + 2]].mean()
+            next_y = y[stop : edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs(
+                (x[anchor] - next_x) * (y[j] - y[anchor])
+                - (x[anchor] - x[j]) * (next_y - y[anchor])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        anchor = best
+    return [*kept, n - 1]
+
+
+series = st.integers(3, 400).flatmap(
+    lambda n: st.tuples(
+        st.just(n),
+        st.integers(3, n + 5),
+        st.integers(0, 2**32 - 1),
+    )
+)
+
+
+@settings(max_examples=200, deadline=None)
+@given(case=series)
+def test_lttb_matches_reference(case):
+    n, n_out, seed = case
+    rng = np.random.default_rng(seed)
+    x = np.sort(rng.uniform(0, 1000, n))
+    y = rng.normal(size=n).cumsum()
+    kept = lttb_indices(x, y, n_out)
+    if n_out >= n:
+        assert kept.tolist() == list(range(n))
+    else:
+        assert len(kept) == n_out
+        assert kept.tolist() == reference_lttb(x, y, n_out)
+
+
+def test_lttb_prefers_real_values_to_nan():
+    y = np.arange(100, dtype=np.float64)
+    y[10:60] = np.nan
+    kept = lttb_indices(np.arange(100), y, 10)
+    assert (kept[0], kept[-1]) == (0, len(y) - 1)
+    assert np.diff(kept).min() > 0
+    # Only buckets made entirely of NaN may pick one
+    edges = (np.arange(9) * (98 / 8)).astype(np.int64) + 1
+    edges[-1] = 99
+    for i, index in enumerate(kept[1:-1]):
+        bucket = y[edges[i] : edges[i + 1]]
+        assert not np.isnan(y[index]) or np.isnan(bucket).all()
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+    values=st.lists(
+        st.floats(-1e6, 1e6) | st.just(float("nan")), min_size=4, max_size=300
+    ),
+    n_out=st.integers(4, 320),
+)
+def test_minmax_keeps_every_bucket_extreme(values, n_out):
+    y = np.array(values)
+    kept = minmax_indices(y, n_out)
+    assert kept.tolist() == sorted(set(kept.tolist()))
+    if n_out >= len(y):
+        assert kept.tolist() == list(range(len(y)))
+        return
+    assert {0, len(y) - 1} <= set(kept.tolist())
+    size = -(-len(y) // (n_out // 2))
+    chosen = set(kept.tolist())
+    for start in range(0, len(y), size):
+        bucket = y[start : start + size]
+        if np.isnan(bucket).all():
+            continue
+        picked = [y[i] for i in chosen if start <= i < start + size]
+        assert np.nanmin(picked) == np.nanmin(bucket)
+        assert np.nanmax(picked) == np.nanmax(bucket)
+
+
+def test_downsample_only_decimates_long_series():
+    x = np.arange(50)
+    y = np.sin(x)
+    np.testing.assert_array_equal(downsample(x, y, max_points=100)[1], y)
+
+    y = np.zeros(10_000)
+    y[1234] = 99.0
+    for method in ("lttb", "minmax"):
+        dx, dy = downsample(np.arange(10_000), y, max_points=200, method=method)
+        assert len(dx) == len(dy) <= 202
+        assert dy.max() == 99.0
+    with pytest.raises(ValueError, match="Unknown"):
+        downsample(x, y[:50], max_points=10, method="mean")
+
+
+def test_envelope_bounds_every_value():
+    rng = np.random.default_rng(2)
+    centre = rng.normal(size=5_000).cumsum()
+    lower, upper = centre - rng.uniform(0, 1, 5_000), centre + rng.uniform(0, 1, 5_000)
+    x, low, high = envelope(np.arange(5_000), lower, upper, max_points=100)
+    assert len(x) == len(low) == len(high) <= 100
+    step = int(x[1] - x[0])
+    for i, start in enumerate(x.tolist()):
+        assert low[i] == lower[start : start + step].min()
+        assert high[i] == upper[start : start + step].max()
+    short = envelope(np.arange(5), lower[:5], upper[:5], max_points=100)
+    np.testing.assert_array_equal(short[1], lower[:5])
+
+
+def test_scatter_trace_switches_to_webgl_when_dense():
+    x = np.arange(WEBGL_POINTS * 5)
+    y = np.cos(x / 50)
+    sparse = scatter_trace(x, y, max_points=WEBGL_POINTS // 2, name="gc")
+    assert not isinstance(sparse, go.Scattergl)
+    assert len(sparse["x"]) == WEBGL_POINTS // 2
+    dense = scatter_trace(x, y, max_points=0)
+    assert isinstance(dense, go.Scattergl)
+    assert len(dense["x"]) == len(x)
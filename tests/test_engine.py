@@ -0,0 +1,64 @@
+"""Tests for the vectorized Wright-Fisher simulation engine."""
+
+import numpy as np
+import pytest
+
+from genome_explorer.simulation.engine import WrightFisherSimulation
+from genome_explorer.simulation.fitness import MultiplicativeModel, StabilizingModel
+
+
+def test_score_matches_model_and_allele_counts():
+    sim = WrightFisherSimulation(200, 0.0, num_loci=16, seed=0)
+    sim.genotypes = np.random.default_rng(1).integers(0, 2, (200, 16), dtype=np.uint8)
+    fitness, counts = sim.score()
+    assert np.allclose(fitness, sim.fitness_model.fitness(sim.genotypes))
+    assert counts.tolist() == sim.genotypes.sum(axis=0).tolist()
+    assert np.allclose(sim.allele_frequencies(), counts / 200)
+
+
+def test_same_seed_gives_same_timeline():
+    runs = [
+        WrightFisherSimulation(100, 1e-3, num_loci=32, seed=7).run(20) for _ in range(2)
+    ]
+    first, second = ([s.fitness_scores for s in run] for run in runs)
+    assert first == second
+    assert [s.generation for s in runs[0]] == list(range(20))
+
+
+def test_beneficial_allele_fixes_without_drift_or_mutation():
+    sim = WrightFisherSimulation(
+        500, 0.0, num_loci=1, selection=np.array([1.0]), seed=3
+    )
+    sim.genotypes[:250] = 1
+    sim.run(40)
+    assert sim.allele_frequencies().tolist() == [1.0]
+
+
+def test_zero_fitness_population_samples_parents_uniformly():
+    rng = np.random.default_rng(4)
+    genotypes = rng.integers(0, 2, (256, 12), dtype=np.uint8)
+    genotypes[:, 0] = 1
+    # Every individual sits far enough from the optimum to underflow to 0
+    model = StabilizingModel(np.ones(12), optimum=0.0, width=1e-3)
+    sim = WrightFisherSimulation(256, 0.0, num_loci=12, seed=5, fitness_model=model)
+    sim.genotypes = genotypes.copy()
+    assert not sim.fitness().any()
+
+    sim.step()
+    assert len(np.unique(sim.genotypes, axis=0)) > len(genotypes) // 2
+    assert not np.array_equal(sim.genotypes, np.repeat(genotypes[-1:], 256, axis=0))
+
+
+def test_history_records_mutated_loci():
+    sim = WrightFisherSimulation(50, 0.01, num_loci=20, seed=6)
+    history = sim.run_history(10)
+    assert history.generations.tolist() == list(range(10))
+    assert len(history.events) > 0
+    assert set(history.events["position"].tolist()) <= set(range(20))
+
+
+def test_model_must_match_number_of_loci():
+    with pytest.raises(ValueError, match="number of loci"):
+        WrightFisherSimulation(
+            10, 0.0, num_loci=4, fitness_model=MultiplicativeModel(np.zeros(5))
+        )
@@ -0,0 +1,47 @@
+"""Tests for the vectorized fitness models."""
+
+import numpy as np
+import pytest
+
+from genome_explorer.simulation.fitness import (
+    FITNESS_MODELS,
+    AdditiveModel,
+    FitnessModel,
+    MultiplicativeModel,
+    make_fitness_model,
+)
+
+
+def test_make_fitness_model_builds_every_kind():
+    rng = np.random.default_rng(0)
+    selection = rng.normal(0, 0.05, size=20)
+    genotypes = rng.integers(0, 2, size=(50, 20)).astype(np.uint8)
+    for name, model_type in FITNESS_MODELS.items():
+        model = make_fitness_model(name, selection, rng=rng)
+        assert type(model) is model_type
+        fitness = model.fitness(genotypes)
+        assert fitness.shape == (50,) and np.all(fitness > 0)
+
+
+def test_models_match_per_individual_formulas():
+    rng = np.random.default_rng(1)
+    selection = rng.normal(0, 0.1, size=8)
+    genotypes = rng.integers(0, 2, size=(30, 8))
+    expected_mult = [np.prod(1 + selection[row == 1]) for row in genotypes]
+    expected_add = [1 + selection[row == 1].sum() for row in genotypes]
+    assert MultiplicativeModel(selection).fitness(genotypes) == pytest.approx(
+        expected_mult, rel=1e-5
+    )
+    assert AdditiveModel(selection).fitness(genotypes) == pytest.approx(
+        expected_add, rel=1e-5
+    )
+
+
+def test_base_model_is_abstract():
+    with pytest.raises(TypeError):
+        FitnessModel(np.zeros(3))
+
+
+def test_unknown_model_rejected():
+    with pytest.raises(ValueError):
+        make_fitness_model("lethal", np.zeros(3))
@@ -0,0 +1,136 @@
+"""Tests for upload handling on the genome viewer page."""
+
+import gzip
+import io
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("plotly")
+
+import streamlit as st
+
+from genome_explorer.core import (
+    GenomeRegion,
+    IntervalIndex,
+    TwoBitGenome,
+    VariantTable,
+    get_state,
+)
+from genome_explorer.core.datasets import DatasetStore
+from genome_explorer.core.jobs import Job, JobContext
+from genome_explorer.visualization.pages import genome_viewer
+
+
+def upload(name: str, data: bytes) -> io.BytesIO:
+    file = io.BytesIO(data)
+    file.name = name
+    return file
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    monkeypatch.setattr(genome_viewer, "dataset_store", DatasetStore(tmp_path))
+    st.session_state.clear()
+    yield st.session_state
+    st.session_state.clear()
+
+
+def test_variant_upload_keeps_loaded_sequence(session):
+    genome_viewer.process_genome_file(
+        upload("ref.fasta", b">chr1\n" + b"ACGT" * 50 + b"\n")
+    )
+    contigs, digest = get_state("genome_contigs"), get_state("genome_digest")
+    assert [contig.name for contig in contigs] == ["chr1"]
+
+    vcf = (
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\nchr1\t5\t.\tA\tG\t50\tPASS\t.\n"
+    )
+    genome_viewer.process_genome_file(upload("calls.vcf", vcf.encode()))
+    assert get_state("genome_contigs") == contigs
+    assert get_state("genome_digest") == digest
+    assert get_state("variant_table_dir")
+    assert get_state("packed_genome_dir")
+
+
+def test_bed_upload_builds_a_feature_index(session):
+    bed = (
+        b"track name=genes\nchr1\t100\t200\tgeneA\t0\t+\nchr1\t500\t900\tgeneB\t0\t-\n"
+    )
+    genome_viewer.process_genome_file(upload("genes.bed", bed))
+    index = IntervalIndex.load(Path(get_state("feature_index_dir")))
+    assert index.overlaps(GenomeRegion("chr1", 150, 600)).tolist() == [0, 1]
+    assert index.overlaps(GenomeRegion("chr2", 0, 1000)).tolist() == []
+
+
+def test_every_uploaded_chromosome_can_be_viewed(session):
+    fasta = b">chr1\n" + b"ACGT" * 50 + b"\n>chr2\n" + b"GC" * 30 + b"\n>chrM\nAT\n"
+    genome_viewer.process_genome_file(upload("ref.fasta", fasta))
+    lengths = genome_viewer.genome_lengths(get_state("genome_contigs"))
+    assert lengths == {"chr1": 200, "chr2": 60, "chrM": 2}
+    assert genome_viewer.genome_lengths([]) == {}
+
+
+def test_compressed_uploads_are_decompressed(session):
+    fasta = b">chr1\n" + b"ACGT" * 50 + b"\n>chr2\nGGCC\n"
+    genome_viewer.process_genome_file(upload("ref.fa.gz", gzip.compress(fasta)))
+    contigs = get_state("genome_contigs")
+    assert [(c.name, c.length) for c in contigs] == [("chr1", 200), ("chr2", 4)]
+    genome = TwoBitGenome(Path(get_state("packed_genome_dir")))
+    assert genome.fetch_sequence("chr2", 0, 4) == "GGCC"
+
+    vcf = (
+        "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\nchr1\t5\t.\tA\tG\t50\tPASS\t.\n"
+    )
+    genome_viewer.process_genome_file(
+        upload("calls.vcf.gz", gzip.compress(vcf.encode()))
+    )
+    assert len(VariantTable(Path(get_state("variant_table_dir")))) == 1
+
+
+def test_uploader_accepts_compressed_and_alias_extensions():
+    assert {"fa", "fq", "gz", "bgz", "vcf", "bed"} <= set(genome_viewer.UPLOAD_TYPES)
+
+
+def test_bam_paths_outside_the_data_dir_are_rejected(session, tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (tmp_path / "outside.bam").write_bytes(b"")
+    monkeypatch.setattr(genome_viewer.config, "data_dir", data_dir)
+    errors: list[str] = []
+    monkeypatch.setattr(st, "error", errors.append)
+
+    for path in ("../outside.bam", str(tmp_path / "outside.bam"), "a/../../x.bam"):
+        assert genome_viewer.open_bam_file(path) is None
+    assert errors == [f"BAM files must be under {data_dir}"] * 3
+    assert get_state("bam_reader") is None
+
+    # Paths inside the data directory reach the reader
+    assert genome_viewer.open_bam_file("sub/../missing.bam") is None
+    assert errors[-1].startswith("Could not open BAM")
+
+
+def test_coverage_job_opens_its_own_reader(monkeypatch, tmp_path):
+    opened: list[Path] = []
+    reader = object()
+
+    def fake_reader(path, cache):
+        opened.append(path)
+        return reader
+
+    def fake_build(bam, key, progress):
+        assert bam is reader
+        progress(50, 200)
+        progress(200, 200)
+        return SimpleNamespace(directory=tmp_path / key)
+
+    monkeypatch.setattr(genome_viewer, "BamReader", fake_reader)
+    monkeypatch.setattr(genome_viewer, "build_coverage_pyramid", fake_build)
+    job = Job("coverage-job", "coverage")
+    context = JobContext(job, threading.Lock(), threading.Event())
+    result = genome_viewer.compute_coverage(context, "/data/reads.bam", "reads.bam")
+    assert result == str(tmp_path / "reads.bam")
+    assert opened == [Path("/data/reads.bam")]
+    assert job.progress == 1.0
@@ -0,0 +1,69 @@
+"""Tests for the columnar simulation history and its disk spill."""
+
+import gc
+import pickle
+
+import numpy as np
+
+from genome_explorer.simulation.history import SimulationHistory
+
+# Mutation events appended per generation
+EVENTS = 50
+
+
+def fill(history: SimulationHistory, generations: int, events: int) -> None:
+    rng = np.random.default_rng(0)
+    for generation in range(generations):
+        history.append(
+            generation,
+            100,
+            {"avg": 1.0 - generation / 100},
+            positions=rng.integers(0, 1000, size=events),
+            ref=np.full(events, ord("0"), dtype=np.uint8),
+            alt=np.full(events, ord("1"), dtype=np.uint8),
+        )
+
+
+def test_pickle_in_memory(tmp_path):
+    history = SimulationHistory(spill_bytes=1 << 30, cache_dir=tmp_path)
+    fill(history, 5, 10)
+    copy = pickle.loads(pickle.dumps(history))
+    assert not copy.spilled
+    np.testing.assert_array_equal(copy.events, history.events)
+    np.testing.assert_array_equal(copy.fitness("avg"), history.fitness("avg"))
+
+
+def test_pickle_spilled_outlives_original(tmp_path):
+    history = SimulationHistory(spill_bytes=256, cache_dir=tmp_path)
+    fill(history, 10, EVENTS)
+    assert history.spilled
+    expected = np.array(history.events)
+    data = pickle.dumps(history)
+    spill_path = history._spill_path
+    del history
+    gc.collect()
+    # The pickle still refers to the spill file, so it must survive
+    assert spill_path.exists()
+    copy = pickle.loads(data)
+    np.testing.assert_array_equal(copy.events, expected)
+    assert len(copy[3].mutation_events) == EVENTS
+
+
+def test_unpickled_copy_appends_to_own_file(tmp_path):
+    history = SimulationHistory(spill_bytes=256, cache_dir=tmp_path)
+    fill(history, 4, EVENTS)
+    copy = pickle.loads(pickle.dumps(history))
+    fill(copy, 2, EVENTS)
+    assert copy._spill_path != history._spill_path
+    assert len(copy.events) == 6 * EVENTS
+    assert len(history.events) == 4 * EVENTS
+    np.testing.assert_array_equal(copy.events[: 4 * EVENTS], history.events)
+
+
+def test_spill_removed_with_owner_when_never_pickled(tmp_path):
+    history = SimulationHistory(spill_bytes=256, cache_dir=tmp_path)
+    fill(history, 4, EVENTS)
+    spill_path = history._spill_path
+    del history
+    gc.collect()
+    assert not spill_path.exists()
@@ -0,0 +1,112 @@
+"""Brute-force property tests for the sorted-array interval index."""
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.core import (
+    GenomeFeature,
+    GenomeRegion,
+    IntervalIndex,
+    load_or_build_index,
+)
+
+CHROMOSOMES = ["chr1", "chr2", "chr10"]
+SPAN = 300
+
+Interval = tuple[str, int, int]
+intervals = st.lists(
+    st.builds(
+        lambda chrom, start, length: (chrom, start, min(start + length, SPAN)),
+        st.sampled_from(CHROMOSOMES),
+        st.integers(0, SPAN - 1),
+        st.integers(0, 120),
+    ),
+    max_size=40,
+)
+
+
+def build(items: list[Interval]) -> IntervalIndex:
+    return IntervalIndex.build(
+        [c for c, _, _ in items], [s for _, s, _ in items], [e for _, _, e in items]
+    )
+
+
+def overlapping(items: list[Interval], chrom: str, start: int, end: int) -> set[int]:
+    return {
+        i for i, (c, s, e) in enumerate(items) if c == chrom and s < end and e > start
+    }
+
+
+@settings(max_examples=200, deadline=None)
+@given(items=intervals, queries=intervals.map(lambda items: items[:10]))
+def test_overlaps_match_brute_force(items, queries):
+    index = build(items)
+    assert len(index) == len(items)
+    for chrom, start, end in queries:
+        ids = index.overlaps(GenomeRegion(chrom, start, end))
+        assert set(ids.tolist()) == overlapping(items, chrom, start, end)
+        assert len(ids) == len(set(ids.tolist()))
+        starts = [items[i][1] for i in ids]
+        assert starts == sorted(starts)
+
+
+@settings(max_examples=100, deadline=None)
+@given(items=intervals, queries=intervals.map(lambda items: items[:10]))
+def test_overlaps_batch_groups_by_query(items, queries):
+    index = build(items)
+    query_starts = [s for _, s, _ in queries]
+    query_ends = [e for _, _, e in queries]
+    query_index, ids = index.overlaps_batch("chr1", query_starts, query_ends)
+    assert query_index.tolist() == sorted(query_index.tolist())
+    for q, (start, end) in enumerate(zip(query_starts, query_ends, strict=True)):
+        expected = overlapping(items, "chr1", start, end)
+        assert set(ids[query_index == q].tolist()) == expected
+
+
+@settings(max_examples=200, deadline=None)
+@given(items=intervals, chrom=st.sampled_from(CHROMOSOMES), pos=st.integers(0, SPAN))
+def test_nearest_is_closest(items, chrom, pos):
+    def distance(start: int, end: int) -> int:
+        if start <= pos < end:
+            return 0
+        return pos - end + 1 if end <= pos else start - pos
+
+    candidates = [distance(s, e) for c, s, e in items if c == chrom]
+    found = build(items).nearest(chrom, pos)
+    if not candidates:
+        assert found is None
+    else:
+        found_chrom, start, end = items[found]
+        assert found_chrom == chrom
+        assert distance(start, end) == min(candidates)
+
+
+def test_index_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(5)
+    starts = rng.integers(0, 10_000, size=500)
+    ends = starts + rng.integers(0, 2_000, size=500)
+    index = IntervalIndex.build(rng.choice(CHROMOSOMES, size=500), starts, ends)
+    index.save(tmp_path)
+    loaded = IntervalIndex.load(tmp_path)
+    for chrom in CHROMOSOMES:
+        region = GenomeRegion(chrom, 4_000, 6_000)
+        assert loaded.overlaps(region).tolist() == index.overlaps(region).tolist()
+        assert loaded.nearest(chrom, 12_500) == index.nearest(chrom, 12_500)
+
+
+def feature(name: str, start: int, end: int) -> GenomeFeature:
+    return GenomeFeature(name, "gene", GenomeRegion("chr1", start, end), {})
+
+
+def test_cached_index_is_rebuilt_when_features_change(tmp_path):
+    query = GenomeRegion("chr1", 150, 160)
+    first = load_or_build_index("genes", [feature("a", 100, 200)], cache_dir=tmp_path)
+    assert [f.id for f in first.overlapping_features(query)] == ["a"]
+
+    cached = load_or_build_index("genes", [feature("a", 100, 200)], cache_dir=tmp_path)
+    assert [f.id for f in cached.overlapping_features(query)] == ["a"]
+
+    changed = [feature("a", 100, 120), feature("b", 140, 170)]
+    rebuilt = load_or_build_index("genes", changed, cache_dir=tmp_path)
+    assert [f.id for f in rebuilt.overlapping_features(query)] == ["b"]
@@ -0,0 +1,125 @@
+"""Tests for the background job manager."""
+
+import pickle
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from genome_explorer.core import config
+from genome_explorer.core.jobs import JobCancelled, JobManager, JobStatus
+from genome_explorer.simulation.engine import WrightFisherSimulation
+
+
+def wait(manager: JobManager, job_id: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while manager.get(job_id).active:
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.01)
+
+
+def counting(context, steps: int):
+    for step in range(steps):
+        context.progress(step / steps, f"step {step}")
+    return {"steps": steps}
+
+
+def test_result_and_progress(tmp_path):
+    manager = JobManager(max_workers=1, cache_dir=tmp_path)
+    job_id = manager.submit("count", counting, 5)
+    wait(manager, job_id)
+    job = manager.get(job_id)
+    assert job.status == JobStatus.COMPLETED
+    assert job.progress == 1.0
+    assert manager.result(job_id) == {"steps": 5}
+
+
+def test_key_reuses_job_and_survives_restart(tmp_path):
+    manager = JobManager(max_workers=1, cache_dir=tmp_path)
+    first = manager.submit("count", counting, 3, key="a")
+    assert manager.submit("count", counting, 3, key="a") == first
+    wait(manager, first)
+    restarted = JobManager(max_workers=1, cache_dir=tmp_path)
+    assert restarted.submit("count", counting, 3, key="a") == first
+    assert restarted.get(first).status == JobStatus.COMPLETED
+    assert restarted.result(first) == {"steps": 3}
+
+
+def test_cancel_running_and_queued(tmp_path):
+    manager = JobManager(max_workers=1, cache_dir=tmp_path)
+    started = threading.Event()
+
+    def endless(context):
+        started.set()
+        while True:
+            context.progress(0.5)
+            time.sleep(0.01)
+
+    running = manager.submit("endless", endless)
+    queued = manager.submit("count", counting, 3)
+    started.wait(5)
+    manager.cancel(queued)
+    manager.cancel(running)
+    wait(manager, running)
+    wait(manager, queued)
+    assert manager.get(running).status == JobStatus.CANCELLED
+    assert manager.get(queued).status == JobStatus.CANCELLED
+
+
+def test_failure_is_recorded(tmp_path):
+    manager = JobManager(max_workers=1, cache_dir=tmp_path)
+
+    def broken(context):
+        raise ValueError("boom")
+
+    job_id = manager.submit("broken", broken)
+    wait(manager, job_id)
+    job = manager.get(job_id)
+    assert job.status == JobStatus.FAILED
+    assert "boom" in job.error
+    with pytest.raises(KeyError):
+        manager.result(job_id)
+
+
+def test_cancelled_exception_is_not_a_failure(tmp_path):
+    manager = JobManager(max_workers=1, cache_dir=tmp_path)
+
+    def gives_up(context):
+        raise JobCancelled()
+
+    job_id = manager.submit("gives_up", gives_up)
+    wait(manager, job_id)
+    assert manager.get(job_id).status == JobStatus.CANCELLED
+
+
+def test_spilled_simulation_result_is_persisted(tmp_path, monkeypatch):
+    pytest.importorskip("plotly")
+    # The page module needs plotly, so it is imported after the skip check
+    from genome_explorer.simulation.pages.simulation_lab import (  # noqa: PLC0415
+        run_simulation,
+    )
+
+    monkeypatch.setattr(config, "cache_dir", tmp_path)
+    monkeypatch.setattr(config, "history_spill_bytes", 1024)
+    params = {
+        "mutation_rate": 0.01,
+        "population_size": 500,
+        "generations": 10,
+        "seed": 3,
+        "fitness_model": "multiplicative",
+    }
+    manager = JobManager(max_workers=1, cache_dir=tmp_path)
+    job_id = manager.submit("simulation", run_simulation, params, key=params)
+    wait(manager, job_id)
+    assert manager.get(job_id).status == JobStatus.COMPLETED, manager.get(job_id).error
+
+    history = manager.result(job_id)
+    assert history.spilled
+    expected = WrightFisherSimulation(500, 0.01, seed=3).run_history(10)
+    np.testing.assert_allclose(history.fitness("avg"), expected.fitness("avg"))
+    np.testing.assert_array_equal(history.events, expected.events)
+    # Loading the stored result again still finds the spilled events
+    assert len(pickle.loads(pickle.dumps(manager.result(job_id))).events) == len(
+        expected.events
+    )
@@ -0,0 +1,102 @@
+"""Tests for token-budgeted chat memory."""
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.ai import memory
+from genome_explorer.ai.memory import (
+    SUMMARY_EXCERPT,
+    ConversationMemory,
+    count_tokens,
+    extractive_summary,
+)
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Character-based estimates keep the budgets independent of tiktoken
+    monkeypatch.setattr(memory, "_tokenizer", None)
+
+
+messages = st.lists(st.text("abc .!?", min_size=1, max_size=200), max_size=40)
+
+
+@settings(max_examples=200, deadline=None)
+@given(contents=messages, max_tokens=st.integers(20, 200), keep=st.integers(0, 5))
+def test_context_stays_within_budget(contents, max_tokens, keep):
+    chat = ConversationMemory(max_tokens=max_tokens, keep_recent=keep)
+    for i, content in enumerate(contents):
+        chat.append("user" if i % 2 else "assistant", content)
+
+        turns = [m["content"] for m in chat.prompt_messages() if m["role"] != "system"]
+        assert chat.context_tokens == chat.summary_tokens + sum(
+            map(count_tokens, turns)
+        )
+        # Only the protected recent turns may keep the context over budget
+        assert chat.context_tokens <= max_tokens or len(turns) <= keep
+        recent = min(keep, len(chat))
+        assert turns[len(turns) - recent :] == [
+            c for _, c, _ in chat[len(chat) - recent :]
+        ]
+    assert [content for _, content, _ in chat] == contents
+
+
+def test_summary_keeps_first_sentences():
+    long_sentence = "x" * (SUMMARY_EXCERPT + 20)
+    summary = extractive_summary(
+        "Earlier.",
+        [
+            ("user", "What is a SNP? Tell me more.", "t0"),
+            ("assistant", f"{long_sentence}. Second sentence.", "t1"),
+        ],
+    )
+    lines = summary.split("\n")
+    assert lines[:2] == ["Earlier.", "User: What is a SNP?"]
+    assert lines[2].startswith("Assistant: xxx")
+    assert len(lines[2]) == len("Assistant: ") + SUMMARY_EXCERPT
+    assert lines[2].endswith("…")
+
+
+def test_old_turns_fold_into_a_summary():
+    chat = ConversationMemory(max_tokens=40, keep_recent=2)
+    for i in range(10):
+        chat.append("user", f"Question {i} is here. " + "filler " * 5)
+    prompt = chat.prompt_messages()
+    assert prompt[0]["role"] == "system"
+    assert "User: Question 7 is here." in prompt[0]["content"]
+    assert [m["content"][:10] for m in prompt[-2:]] == ["Question 8", "Question 9"]
+    # The summary itself is trimmed to half the budget, oldest lines first
+    assert chat.summary_tokens <= chat.max_tokens // 2
+    assert "Question 0" not in prompt[0]["content"]
+    assert len(chat) == len(range(10))
+
+
+def test_only_folded_messages_are_dropped():
+    chat = ConversationMemory(max_tokens=10_000, max_messages=3, keep_recent=1)
+    for i in range(5):
+        chat.append("user", f"message {i}")
+    # Nothing has been summarized, so nothing may be forgotten
+    assert len(chat) == len(range(5))
+    assert chat.dropped == 0
+
+    chat.max_tokens = 5
+    chat.append("user", "message 5")
+    assert chat.dropped == len(range(6)) - chat.max_messages
+    assert [content for _, content, _ in chat] == [
+        "message 3",
+        "message 4",
+        "message 5",
+    ]
+    assert chat.prompt_messages()[-1]["content"] == "message 5"
+
+
+def test_pages_count_back_from_the_newest():
+    chat = ConversationMemory(max_tokens=10_000)
+    for i in range(7):
+        chat.append("user", str(i))
+    assert chat.num_pages(3) == 3
+    assert [c for _, c, _ in chat.page(0, 3)] == ["4", "5", "6"]
+    assert [c for _, c, _ in chat.page(2, 3)] == ["0"]
+    assert chat.page(3, 3) == []
+    assert ConversationMemory().num_pages(3) == 1
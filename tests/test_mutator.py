@@ -0,0 +1,124 @@
+"""Tests for batched sequence mutation and lift-over."""
+
+import itertools
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.core import GenomeRegion, MutationEvent
+from genome_explorer.simulation.mutator import (
+    EditBatch,
+    SequenceMutator,
+    apply_edits,
+    sample_edits,
+)
+
+
+def random_reference(rng: np.random.Generator, length: int) -> np.ndarray:
+    return np.frombuffer(b"ACGTN", dtype=np.uint8)[rng.integers(0, 5, size=length)]
+
+
+def naive_splice(reference: str, edits):
+    """Edited sequence plus the reference origin of every edited base."""
+    sequence, origins, cursor = "", [], 0
+    for pos, ref_len, alt in edits:
+        sequence += reference[cursor:pos] + alt
+        origins += list(range(cursor, pos))
+        # Leading bases of an edit keep their reference origin
+        kept = min(ref_len, len(alt))
+        origins += list(range(pos, pos + kept)) + [-1] * (len(alt) - kept)
+        cursor = pos + ref_len
+    sequence += reference[cursor:]
+    origins += list(range(cursor, len(reference)))
+    return sequence, origins
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+    reference=st.text("ACGT", min_size=1, max_size=200),
+    data=st.data(),
+)
+def test_apply_edits_match_naive_splice(reference, data):
+    length = len(reference)
+    raw = data.draw(
+        st.lists(
+            st.tuples(
+                st.integers(0, length - 1),
+                st.integers(1, 6),
+                st.text("ACGT", min_size=1, max_size=6),
+            ),
+            max_size=20,
+        )
+    )
+    events = [
+        MutationEvent(
+            region=GenomeRegion("chr1", pos, min(pos + ref_len, length)),
+            type="",
+            ref=reference[pos : pos + ref_len],
+            alt=alt,
+        )
+        for pos, ref_len, alt in raw
+    ]
+    batch = EditBatch.from_events(events)
+    edits = [
+        (pos, ref_len, batch.alt_data[lo:hi].tobytes().decode())
+        for pos, ref_len, lo, hi in zip(
+            batch.positions.tolist(),
+            batch.ref_lengths.tolist(),
+            batch.alt_offsets[:-1].tolist(),
+            batch.alt_offsets[1:].tolist(),
+            strict=False,
+        )
+    ]
+    assert all(a[0] + a[1] <= b[0] for a, b in itertools.pairwise(edits))
+
+    codes = np.frombuffer(reference.encode(), dtype=np.uint8)
+    mutated, liftover = apply_edits(codes, batch)
+    sequence, origins = naive_splice(reference, edits)
+    assert mutated.tobytes().decode() == sequence
+
+    assert liftover.to_reference(np.arange(len(sequence))).tolist() == origins
+    forward = [-1] * length
+    for position, origin in enumerate(origins):
+        if origin >= 0:
+            forward[origin] = position
+    assert liftover.to_mutated(np.arange(length)).tolist() == forward
+    assert liftover.inserted().tolist() == [
+        position for position, origin in enumerate(origins) if origin < 0
+    ]
+
+    round_trip = batch.to_events("chr1", codes)
+    assert [(e.region.start, e.ref, e.alt) for e in round_trip] == [
+        (pos, reference[pos : pos + ref_len], alt) for pos, ref_len, alt in edits
+    ]
+
+
+def test_sampled_edits_only_touch_called_bases():
+    rng = np.random.default_rng(11)
+    reference = random_reference(rng, 5000)
+    batch = sample_edits(reference, 0.05, rng, indel_fraction=0.5)
+    assert len(batch) > 0
+    assert np.all(batch.positions[1:] >= batch.ref_ends[:-1])
+    assert np.all(batch.ref_ends <= len(reference))
+    assert np.all(np.isin(reference[batch.positions], np.frombuffer(b"ACGT", np.uint8)))
+
+
+@settings(max_examples=50, deadline=None)
+@given(
+    seed=st.integers(0, 2**32 - 1),
+    length=st.integers(0, 2000),
+    rate=st.floats(0, 0.2),
+    indel_fraction=st.floats(0, 1),
+    generations=st.integers(0, 6),
+)
+def test_retained_matches_lift_over(seed, length, rate, indel_fraction, generations):
+    rng = np.random.default_rng(seed)
+    mutator = SequenceMutator(
+        random_reference(rng, length), rate, seed=seed, indel_fraction=indel_fraction
+    )
+    mutator.run(generations)
+    survivors = mutator.to_current(np.arange(length))
+    assert mutator.retained() == np.count_nonzero(survivors >= 0)
+    origins = mutator.to_reference(np.arange(len(mutator.sequence)))
+    assert np.array_equal(np.sort(mutator.inserted), np.flatnonzero(origins < 0))
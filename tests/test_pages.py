@@ -0,0 +1,96 @@
+"""Tests for the lazily importing page registry."""
+
+import sys
+import threading
+
+import pytest
+
+from genome_explorer.core import PageRegistry
+
+PAGE_SOURCE = """
+from pathlib import Path
+
+# Each import leaves a line next to the module
+with open(Path(__file__).with_suffix(".log"), "a") as log:
+    log.write("imported\\n")
+
+RENDERS = []
+
+
+def render():
+    RENDERS.append(1)
+"""
+
+
+@pytest.fixture
+def page_module(tmp_path, monkeypatch):
+    """Name of a fresh page module, and a count of how often it was imported."""
+    name = f"page_under_test_{tmp_path.name}"
+    (tmp_path / f"{name}.py").write_text(PAGE_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def imports() -> int:
+        log = tmp_path / f"{name}.log"
+        return len(log.read_text().splitlines()) if log.exists() else 0
+
+    yield name, imports
+    sys.modules.pop(name, None)
+
+
+def test_pages_are_imported_on_first_use(page_module):
+    name, imports = page_module
+    registry = PageRegistry()
+    registry.register("Viewer", name)
+    assert registry.names == ["Viewer"]
+    assert imports() == 0
+    assert registry.metrics() == [
+        {"page": "Viewer", "loaded": False, "import_seconds": None, "renders": 0}
+    ]
+
+    registry.render("Viewer")
+    registry.render("Viewer")
+    assert imports() == 1
+    assert registry.load("Viewer").RENDERS == [1, 1]
+    (metrics,) = registry.metrics()
+    assert metrics["loaded"] is True
+    assert metrics["renders"] == 2
+    assert metrics["import_seconds"] >= 0
+
+
+def test_concurrent_loads_import_once(page_module):
+    name, imports = page_module
+    registry = PageRegistry()
+    registry.register("Viewer", name)
+    start = threading.Barrier(8)
+    modules = []
+
+    def worker():
+        start.wait()
+        modules.append(registry.load("Viewer"))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert imports() == 1
+    assert len({id(module) for module in modules}) == 1
+
+
+def test_reregistering_keeps_or_replaces_the_entry(page_module):
+    name, _ = page_module
+    registry = PageRegistry()
+    registry.register("Viewer", name)
+    registry.render("Viewer")
+    registry.register("Viewer", name)
+    assert registry.metrics()[0]["renders"] == 1
+
+    registry.register("Viewer", "json")
+    assert registry.metrics()[0] == {
+        "page": "Viewer",
+        "loaded": False,
+        "import_seconds": None,
+        "renders": 0,
+    }
+    with pytest.raises(KeyError):
+        registry.load("Missing")
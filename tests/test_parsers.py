@@ -0,0 +1,103 @@
+"""Property tests for the chunked FASTA/FASTQ parsers."""
+
+import io
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.core import (
+    GenomeFormat,
+    detect_format,
+    parse_fasta,
+    parse_fastq,
+    scan_fasta,
+    scan_fastq,
+)
+
+contig_names = st.text("abcXYZ0123_.", min_size=1, max_size=8)
+sequences = st.text("ACGTNacgtn", max_size=300)
+genomes = st.lists(st.tuples(contig_names, sequences), min_size=1, max_size=4)
+
+
+def to_fasta(contigs: list[tuple[str, str]], width: int, newline: str) -> bytes:
+    lines = []
+    for name, sequence in contigs:
+        lines.append(f">{name} description")
+        lines += [sequence[lo : lo + width] for lo in range(0, len(sequence), width)]
+    return (newline.join(lines) + newline).encode()
+
+
+def composition(sequence: str) -> tuple[int, int, int]:
+    gc = sum(base in "GCgc" for base in sequence)
+    return len(sequence), gc, sum(base in "Nn" for base in sequence)
+
+
+@settings(max_examples=200, deadline=None)
+@given(
+    contigs=genomes,
+    width=st.integers(1, 80),
+    newline=st.sampled_from(["\n", "\r\n"]),
+    chunk_size=st.integers(1, 64),
+)
+def test_chunked_parsing_matches_whole_contigs(contigs, width, newline, chunk_size):
+    data = to_fasta(contigs, width, newline)
+
+    records = list(parse_fasta(io.BytesIO(data), chunk_size=chunk_size))
+    assert [(r.id, r.sequence, r.description) for r in records] == [
+        (name, sequence, "description") for name, sequence in contigs
+    ]
+
+    stats = scan_fasta(io.BytesIO(data), chunk_size=chunk_size)
+    assert [(s.name, s.length, s.gc_count, s.n_count) for s in stats] == [
+        (name, *composition(sequence)) for name, sequence in contigs
+    ]
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+    reads=st.lists(st.text("ACGTN", min_size=1, max_size=50), max_size=10),
+    chunk_size=st.integers(1, 64),
+)
+def test_chunked_fastq_matches_reads(reads, chunk_size):
+    data = "".join(
+        f"@read{i}\n{read}\n+\n{'I' * len(read)}\n" for i, read in enumerate(reads)
+    ).encode()
+
+    records = list(parse_fastq(io.BytesIO(data), chunk_size=chunk_size))
+    assert [(r.id, r.sequence, r.quality) for r in records] == [
+        (f"read{i}", read, "I" * len(read)) for i, read in enumerate(reads)
+    ]
+
+    stats = scan_fastq(io.BytesIO(data), chunk_size=chunk_size)
+    assert stats.records == len(reads)
+    assert (stats.length, stats.gc_count, stats.n_count) == composition("".join(reads))
+
+
+def test_truncated_fastq_is_rejected():
+    with pytest.raises(ValueError, match="Truncated"):
+        list(parse_fastq(io.BytesIO(b"@read\nACGT\n+\n")))
+
+
+def test_sequence_before_header_is_rejected():
+    with pytest.raises(ValueError, match="before first header"):
+        scan_fasta(io.BytesIO(b"ACGT\n>chr1\nACGT\n"))
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("genome.fa", GenomeFormat.FASTA),
+        ("genome.FASTA.gz", GenomeFormat.FASTA),
+        ("reads.fq", GenomeFormat.FASTQ),
+        ("calls.vcf.bgz", GenomeFormat.VCF),
+        ("reads.bam", GenomeFormat.BAM),
+    ],
+)
+def test_detect_format(filename, expected):
+    assert detect_format(filename) == expected
+
+
+def test_detect_format_rejects_unknown_suffix():
+    with pytest.raises(ValueError, match="Unsupported"):
+        detect_format("notes.txt")
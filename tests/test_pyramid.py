@@ -0,0 +1,45 @@
+"""Tests for the multi-resolution summary pyramid."""
+
+import io
+
+import numpy as np
+import pytest
+
+from genome_explorer.core import GenomeRegion, pack_fasta
+from genome_explorer.visualization.pyramid import build_gc_pyramid
+
+
+def gc_pyramid(tmp_path, sequence: bytes, base_bin: int = 64):
+    genome = pack_fasta(
+        io.BytesIO(b">chr1\n" + sequence + b"\n"), "g", cache_dir=tmp_path
+    )
+    return build_gc_pyramid(genome, "g", cache_dir=tmp_path, base_bin=base_bin)
+
+
+def test_uniform_gc_has_flat_envelope(tmp_path):
+    pyramid = gc_pyramid(tmp_path, b"ACGT" * 4096)
+    for bin_size in pyramid.chromosomes["chr1"]["bin_sizes"]:
+        level = pyramid._level("chr1", bin_size)
+        assert np.allclose(level["min"], 0.5)
+        assert np.allclose(level["max"], 0.5)
+        assert np.allclose(level["mean"], 0.5)
+
+
+def test_envelope_spans_window_fractions(tmp_path):
+    # Alternating all-GC and all-AT windows of one finest bin each
+    pyramid = gc_pyramid(tmp_path, (b"G" * 64 + b"A" * 64) * 300)
+    _, finest = pyramid.query(GenomeRegion("chr1", 0, 256), max_points=4096)
+    assert list(finest["mean"]) == [1.0, 0.0, 1.0, 0.0]
+    assert list(finest["min"]) == list(finest["max"]) == [1.0, 0.0, 1.0, 0.0]
+
+    coarse = pyramid._level("chr1", 128)
+    assert np.all(coarse["min"] == 0.0)
+    assert np.all(coarse["max"] == 1.0)
+    assert np.allclose(coarse["mean"], 0.5)
+
+
+def test_n_bases_excluded_from_fraction(tmp_path):
+    pyramid = gc_pyramid(tmp_path, b"N" * 32 + b"GC" * 16 + b"AT" * 32)
+    _, summary = pyramid.query(GenomeRegion("chr1", 0, 128), max_points=4096)
+    assert summary["count"].tolist() == [32, 64]
+    assert summary["mean"].tolist() == pytest.approx([1.0, 0.0])
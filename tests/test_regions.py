@@ -0,0 +1,132 @@
+"""Brute-force property tests for vectorized region-set operations."""
+
+import gzip
+import io
+import itertools
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.core import RegionSet
+
+CHROMOSOMES = ["chr1", "chr2", "chr10"]
+SPAN = 300
+
+Interval = tuple[str, int, int]
+
+
+def intervals(min_length: int = 0, max_length: int = 120, max_size: int = 40):
+    def build(chrom: str, start: int, length: int) -> Interval:
+        return chrom, start, min(start + length, SPAN)
+
+    interval = st.builds(
+        build,
+        st.sampled_from(CHROMOSOMES),
+        st.integers(0, SPAN - 1),
+        st.integers(min_length, max_length),
+    )
+    return st.lists(interval, max_size=max_size)
+
+
+def region_set(items: list[Interval]) -> RegionSet:
+    return RegionSet.from_arrays(
+        [chrom for chrom, _, _ in items],
+        [start for _, start, _ in items],
+        [end for _, _, end in items],
+    )
+
+
+def coverage(items: list[Interval], length: int = SPAN) -> dict[str, np.ndarray]:
+    covered = {chrom: np.zeros(length, dtype=bool) for chrom in CHROMOSOMES}
+    for chrom, start, end in items:
+        covered[chrom][start:end] = True
+    return covered
+
+
+def runs(mask: np.ndarray, offset: int = 0) -> list[tuple[int, int]]:
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return list(
+        zip(
+            (np.flatnonzero(edges == 1) + offset).tolist(),
+            (np.flatnonzero(edges == -1) + offset).tolist(),
+            strict=True,
+        )
+    )
+
+
+def as_tuples(regions: RegionSet) -> list[Interval]:
+    return [(r.chromosome, r.start, r.end) for r in regions.to_regions()]
+
+
+@settings(max_examples=200, deadline=None)
+@given(items=intervals(min_length=1), distance=st.integers(0, 5))
+def test_merge_is_union(items, distance):
+    merged = as_tuples(region_set(items).merge(distance))
+    covered, merged_covered = coverage(items), coverage(merged)
+    for chrom in CHROMOSOMES:
+        pieces = sorted((s, e) for c, s, e in merged if c == chrom)
+        # Merged regions are separated by more than ``distance`` bases and
+        # only fill the gaps they bridge
+        assert all(b[0] - a[1] > distance for a, b in itertools.pairwise(pieces))
+        assert np.all(merged_covered[chrom][covered[chrom]])
+        assert all(covered[chrom][s] and covered[chrom][e - 1] for s, e in pieces)
+        if distance == 0:
+            assert pieces == runs(covered[chrom])
+
+
+@settings(max_examples=200, deadline=None)
+@given(items=intervals(min_length=1), others=intervals(min_length=1))
+def test_intersect_and_subtract_cut_each_region(items, others):
+    covered = coverage(others)
+    expected_intersect, expected_subtract = [], []
+    for chrom, start, end in items:
+        inside = covered[chrom][start:end]
+        expected_intersect += [(chrom, s, e) for s, e in runs(inside, start)]
+        expected_subtract += [(chrom, s, e) for s, e in runs(~inside, start)]
+    regions, other = region_set(items), region_set(others)
+    assert as_tuples(regions.intersect(other)) == expected_intersect
+    assert as_tuples(regions.subtract(other)) == expected_subtract
+
+
+@settings(max_examples=200, deadline=None)
+@given(items=intervals(min_length=1), length=st.integers(1, SPAN))
+def test_complement_covers_the_rest(items, length):
+    items = [(c, s, min(e, length)) for c, s, e in items if s < length]
+    lengths = {"chr1": length, "chr10": length, "chrM": length}
+    covered = coverage(items, length)
+    covered["chrM"] = np.zeros(length, dtype=bool)
+    expected = sorted(
+        (chrom, s, e) for chrom in lengths for s, e in runs(~covered[chrom])
+    )
+    assert sorted(as_tuples(region_set(items).complement(lengths))) == expected
+
+
+@settings(max_examples=100, deadline=None)
+@given(items=intervals(), size=st.integers(1, 50), step=st.integers(1, 50))
+def test_windows_tile_each_region(items, size, step):
+    expected = [
+        (chrom, s, min(s + size, end))
+        for chrom, start, end in items
+        for s in range(start, end, step)
+    ]
+    assert as_tuples(region_set(items).windows(size, step)) == expected
+
+
+def test_read_bed_skips_headers_and_reads_strands():
+    bed = (
+        b"track name=genes\n#comment\n"
+        b"chr2\t10\t20\tgeneA\t0\t+\nchr1\t5\t9\tgeneB\t0\t-\nchr1\t1\t3\tx\t0\t.\n"
+    )
+    for data in (bed, gzip.compress(bed)):
+        regions = RegionSet.read_bed(io.BytesIO(data))
+        assert [
+            (r.chromosome, r.start, r.end, r.strand) for r in regions.to_regions()
+        ] == [
+            ("chr2", 10, 20, "+"),
+            ("chr1", 5, 9, "-"),
+            ("chr1", 1, 3, None),
+        ]
+    three_columns = RegionSet.read_bed(io.BytesIO(b"chr1\t0\t10\nchr1\t20\t30\n"))
+    assert as_tuples(three_columns) == [("chr1", 0, 10), ("chr1", 20, 30)]
+    assert len(RegionSet.read_bed(io.BytesIO(b"track name=empty\n"))) == 0
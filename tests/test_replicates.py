@@ -0,0 +1,65 @@
+"""Tests for the process-pool replicate sweep runner."""
+
+import numpy as np
+
+from genome_explorer.core import SimulationParams
+from genome_explorer.simulation.replicates import (
+    Z_95,
+    ReplicateResult,
+    aggregate_replicates,
+    make_tasks,
+    run_replicate,
+    run_replicates,
+)
+
+PARAMS: SimulationParams = {
+    "mutation_rate": 0.001,
+    "population_size": 40,
+    "generations": 5,
+    "seed": 11,
+    "fitness_model": "additive",
+}
+
+
+def test_tasks_expand_the_grid_with_independent_seeds():
+    tasks = make_tasks(PARAMS, [0.001, 0.01], replicates=3)
+    assert [(t.mutation_rate, t.replicate) for t in tasks] == [
+        (rate, rep) for rate in (0.001, 0.01) for rep in range(3)
+    ]
+    assert [t.index for t in tasks] == list(range(6))
+    assert all(t.fitness_model == "additive" for t in tasks)
+    states = {tuple(t.seed.generate_state(4)) for t in tasks}
+    assert len(states) == len(tasks)
+    again = make_tasks(PARAMS, [0.001, 0.01], replicates=3)
+    assert [t.seed.generate_state(4).tolist() for t in again] == [
+        t.seed.generate_state(4).tolist() for t in tasks
+    ]
+
+
+def test_pool_results_match_serial_runs():
+    tasks = make_tasks(PARAMS, [0.001, 0.01], replicates=2)
+    serial = {r.index: r.scores["avg"] for r in run_replicates(tasks, num_workers=1)}
+    pooled = {r.index: r.scores["avg"] for r in run_replicates(tasks, num_workers=2)}
+    assert sorted(pooled) == sorted(serial) == list(range(4))
+    for index, scores in serial.items():
+        assert len(scores) == PARAMS["generations"]
+        np.testing.assert_allclose(pooled[index], scores)
+    np.testing.assert_allclose(run_replicate(tasks[0]).scores["avg"], serial[0])
+
+
+def test_aggregate_gives_mean_and_confidence_band():
+    runs = [np.array([1.0, 2.0]), np.array([3.0, 4.0]), np.array([5.0, 9.0])]
+    results = [
+        ReplicateResult(i, i, 0.01, {"avg": values}) for i, values in enumerate(runs)
+    ]
+    results.append(ReplicateResult(3, 0, 0.1, {"avg": np.array([7.0, 7.0])}))
+    summary = aggregate_replicates(results)
+
+    values = np.vstack(runs)
+    sem = values.std(axis=0, ddof=1) / np.sqrt(len(runs))
+    np.testing.assert_allclose(summary[0.01]["mean"], [3.0, 5.0])
+    np.testing.assert_allclose(summary[0.01]["lower"], values.mean(0) - Z_95 * sem)
+    np.testing.assert_allclose(summary[0.01]["upper"], values.mean(0) + Z_95 * sem)
+    assert int(summary[0.01]["replicates"]) == len(runs)
+    # A single replicate has no spread
+    np.testing.assert_allclose(summary[0.1]["lower"], summary[0.1]["upper"])
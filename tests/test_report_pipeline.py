@@ -0,0 +1,103 @@
+"""Tests for the staged report pipeline's cache keys."""
+
+import io
+
+from genome_explorer.core import RegionSet, load_vcf, pack_fasta
+from genome_explorer.reports.pipeline import (
+    DEFAULT_STAGES,
+    ReportInputs,
+    ReportPipeline,
+)
+
+OPTIONS = {
+    "include_stats": True,
+    "include_sequence": True,
+    "include_variants": True,
+    "min_quality": 0,
+    "pass_only": False,
+    "window_size": 100,
+    "kmer_size": 3,
+}
+
+
+def packed(tmp_path, key: str, sequence: bytes) -> str:
+    genome = pack_fasta(
+        io.BytesIO(b">chr1\n" + sequence + b"\n"), key, cache_dir=tmp_path
+    )
+    return str(genome.directory)
+
+
+def variants(tmp_path, key: str, count: int) -> str:
+    lines = ["##fileformat=VCFv4.2", "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO"]
+    lines += [f"chr1\t{pos + 1}\t.\tA\tG\t50\tPASS\tDP=10" for pos in range(count)]
+    stream = io.BytesIO(("\n".join(lines) + "\n").encode())
+    return str(load_vcf(stream, key, cache_dir=tmp_path).directory)
+
+
+def test_variant_stage_reruns_when_variant_table_changes(tmp_path):
+    pipeline = ReportPipeline(DEFAULT_STAGES, cache_dir=tmp_path)
+    first = ReportInputs("g.fa", variant_table_dir=variants(tmp_path, "a", 3))
+    second = ReportInputs("g.fa", variant_table_dir=variants(tmp_path, "b", 5))
+
+    assert pipeline.run(first, OPTIONS)["variants"]["total_variants"] == 3
+    pipeline.run(first, OPTIONS)
+    assert pipeline.last_status["variants"] == "cached"
+    assert pipeline.run(second, OPTIONS)["variants"]["total_variants"] == 5
+    assert pipeline.last_status["variants"] == "computed"
+
+
+def test_sequence_stage_reruns_when_packed_genome_changes(tmp_path):
+    pipeline = ReportPipeline(DEFAULT_STAGES, cache_dir=tmp_path)
+    first = ReportInputs("g.fa", [], None, packed(tmp_path, "a", b"ACGT" * 100))
+    second = ReportInputs("g.fa", [], None, packed(tmp_path, "b", b"GGCC" * 100))
+
+    pipeline.run(first, OPTIONS)
+    assert pipeline.last_status["sequence"] == "computed"
+    pipeline.run(first, OPTIONS)
+    assert pipeline.last_status["sequence"] == "cached"
+    results = pipeline.run(second, OPTIONS)
+    assert pipeline.last_status["sequence"] == "computed"
+    assert results["sequence"]["top_kmers"][0][0] in ("GGC", "GCC", "CCG", "CGG")
+
+
+def test_stage_key_ignores_inputs_the_stage_does_not_read(tmp_path):
+    pipeline = ReportPipeline(DEFAULT_STAGES, cache_dir=tmp_path)
+    stats = next(stage for stage in DEFAULT_STAGES if stage.name == "stats")
+    base = ReportInputs("g.fa")
+    other = ReportInputs("g.fa", packed_genome_dir=packed(tmp_path, "a", b"ACGT"))
+    assert pipeline.stage_key(stats, base, OPTIONS, []) == pipeline.stage_key(
+        stats, other, OPTIONS, []
+    )
+
+
+def test_stage_key_tracks_its_options_and_upstream_keys(tmp_path):
+    pipeline = ReportPipeline(DEFAULT_STAGES, cache_dir=tmp_path)
+    sequence = next(stage for stage in DEFAULT_STAGES if stage.name == "sequence")
+    inputs = ReportInputs("g.fa", packed_genome_dir=packed(tmp_path, "a", b"ACGT"))
+    key = pipeline.stage_key(sequence, inputs, OPTIONS, [])
+    assert (
+        pipeline.stage_key(sequence, inputs, {**OPTIONS, "min_quality": 30}, []) == key
+    )
+    assert pipeline.stage_key(sequence, inputs, {**OPTIONS, "kmer_size": 4}, []) != key
+    assert pipeline.stage_key(sequence, inputs, OPTIONS, ["upstream"]) != key
+
+
+def test_vcf_only_session_reuses_the_disk_cache(tmp_path):
+    inputs = ReportInputs("calls.vcf", variant_table_dir=variants(tmp_path, "a", 4))
+    ReportPipeline(DEFAULT_STAGES, cache_dir=tmp_path).run(inputs, OPTIONS)
+    # A fresh pipeline, as in another process, finds the stored result
+    pipeline = ReportPipeline(DEFAULT_STAGES, cache_dir=tmp_path)
+    assert pipeline.run(inputs, OPTIONS)["variants"]["total_variants"] == 4
+    assert pipeline.last_status["variants"] == "cached"
+
+
+def test_gene_counts_come_from_the_annotation_track(tmp_path):
+    pipeline = ReportPipeline(DEFAULT_STAGES, cache_dir=tmp_path)
+    options = {**OPTIONS, "include_genes": True}
+    assert pipeline.run(ReportInputs("g.fa"), options)["genes"]["total_genes"] is None
+
+    regions = RegionSet.from_arrays(["chr1", "chr2", "chr1"], [0, 5, 50], [10, 9, 90])
+    regions.to_interval_index().save(tmp_path / "genes")
+    inputs = ReportInputs("g.fa", feature_index_dir=str(tmp_path / "genes"))
+    genes = pipeline.run(inputs, options)["genes"]
+    assert genes == {"total_genes": 3, "by_chromosome": {"chr1": 2, "chr2": 1}}
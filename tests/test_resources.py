@@ -0,0 +1,125 @@
+"""Tests for the process-wide resource registry."""
+
+import threading
+import time
+
+import numpy as np
+
+from genome_explorer.core import ResourceRegistry, resources
+from genome_explorer.core.resources import estimate_size
+
+
+def test_each_key_is_loaded_once():
+    registry = ResourceRegistry(memory_budget=1_000, ttl=60)
+    calls: list[str] = []
+
+    def loader(name: str):
+        def load() -> str:
+            calls.append(name)
+            return name.upper()
+
+        return load
+
+    assert registry.get("a", loader("a"), size=1) == "A"
+    assert registry.get("a", loader("a"), size=1) == "A"
+    assert registry.get("b", loader("b"), size=1) == "B"
+    assert calls == ["a", "b"]
+
+    stats = registry.stats()
+    assert stats["resources"]["a"]["hits"] == 1
+    assert stats["resources"]["a"]["misses"] == 1
+    assert stats["hit_rate"] == 1 / 3
+    assert stats["total_size"] == 2
+
+
+def test_concurrent_requests_share_one_load():
+    registry = ResourceRegistry(memory_budget=1_000, ttl=60)
+    calls: list[int] = []
+    start = threading.Barrier(8)
+
+    def slow_loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    values: list[object] = []
+
+    def worker():
+        start.wait()
+        values.append(registry.get("model", slow_loader, size=1))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len({id(value) for value in values}) == 1
+
+
+def test_least_recently_used_entries_are_evicted_over_budget():
+    registry = ResourceRegistry(memory_budget=10, ttl=60)
+    registry.get("a", lambda: "a", size=4)
+    registry.get("b", lambda: "b", size=4)
+    registry.get("a", lambda: "a", size=4)
+    registry.get("c", lambda: "c", size=4)
+    loaded = {k for k, s in registry.stats()["resources"].items() if s["loaded"]}
+    assert loaded == {"a", "c"}
+    assert registry.stats()["resources"]["b"]["evictions"] == 1
+
+    # A resource larger than the budget is still kept on its own
+    registry.get("huge", lambda: "huge", size=50)
+    loaded = {k for k, s in registry.stats()["resources"].items() if s["loaded"]}
+    assert loaded == {"huge"}
+    assert registry.total_size == 50
+
+
+def test_idle_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resources.time, "monotonic", lambda: now[0])
+    registry = ResourceRegistry(memory_budget=1_000, ttl=10)
+    calls: list[int] = []
+
+    def loader():
+        calls.append(1)
+        return "value"
+
+    registry.get("a", loader, size=1)
+    now[0] += 5
+    registry.get("a", loader, size=1)
+    now[0] += 11
+    registry.get("a", loader, size=1)
+    assert len(calls) == 2
+
+
+def test_evict_and_clear_keep_statistics():
+    registry = ResourceRegistry(memory_budget=1_000, ttl=60)
+    registry.get("a", lambda: "a", size=1)
+    registry.get("b", lambda: "b", size=1)
+    registry.evict("a")
+    registry.evict("missing")
+    assert registry.total_size == 1
+    registry.clear()
+    stats = registry.stats()
+    assert stats["total_size"] == 0
+    assert {k: s["evictions"] for k, s in stats["resources"].items()} == {
+        "a": 1,
+        "b": 1,
+    }
+
+
+def test_estimate_size():
+    class Parameter:
+        def numel(self) -> int:
+            return 10
+
+        def element_size(self) -> int:
+            return 4
+
+    class Module:
+        def parameters(self):
+            return [Parameter(), Parameter()]
+
+    assert estimate_size(Module()) == 80
+    assert estimate_size(np.zeros(100, dtype=np.float64)) == 800
+    assert estimate_size("text") > 0
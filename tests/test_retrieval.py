@@ -0,0 +1,110 @@
+"""Tests for the memory-mapped embedding index used for retrieval."""
+
+import numpy as np
+
+from genome_explorer.ai.retrieval import (
+    Document,
+    EmbeddingIndex,
+    corpus_key,
+    load_or_build_embedding_index,
+    load_reference_documents,
+    split_passages,
+)
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz"
+
+
+class LetterEncoder:
+    """Letter counts as vectors; records every batch it is asked to embed."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.batches.append(texts)
+        return np.array(
+            [[text.lower().count(c) for c in ALPHABET] for text in texts],
+            dtype=np.float32,
+        )
+
+
+def documents(texts: list[str]) -> list[Document]:
+    return [
+        Document(f"doc{i}", f"Doc {i}", text, "test") for i, text in enumerate(texts)
+    ]
+
+
+def test_split_passages_groups_paragraphs():
+    text = "one\n\ntwo\n\n\n  \nthree three\n\nfour"
+    assert split_passages(text, max_chars=8) == ["one\n\ntwo", "three three", "four"]
+    assert split_passages(text) == ["one\n\ntwo\n\nthree three\n\nfour"]
+    assert split_passages("  \n\n ") == []
+
+
+def test_reference_documents_come_from_text_files(tmp_path):
+    (tmp_path / "guides").mkdir()
+    (tmp_path / "guides" / "gene_expression.md").write_text("First.\n\nSecond.")
+    (tmp_path / "notes.txt").write_text("Notes.")
+    (tmp_path / "figure.png").write_bytes(b"\x89PNG")
+    docs = load_reference_documents(tmp_path)
+    assert [(d.id, d.title, d.text) for d in docs] == [
+        ("guides/gene_expression.md#0", "Gene Expression", "First.\n\nSecond."),
+        ("notes.txt#0", "Notes", "Notes."),
+    ]
+    assert load_reference_documents(tmp_path / "missing") == []
+
+
+def test_search_matches_brute_force_cosine(tmp_path):
+    rng = np.random.default_rng(0)
+    corpus = documents([f"text {i}" for i in range(50)])
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    index = EmbeddingIndex.build(
+        corpus,
+        lambda texts: vectors[[int(t.split()[1]) for t in texts]],
+        tmp_path / "index",
+        "test-model",
+        batch_size=7,
+    )
+    queries = rng.normal(size=(5, 8))
+    ids, scores = index.search_vectors(queries, k=4)
+
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    cosine = (queries / np.linalg.norm(queries, axis=1, keepdims=True)) @ unit.T
+    expected = np.argsort(-cosine, axis=1)[:, :4]
+    assert ids.tolist() == expected.tolist()
+    np.testing.assert_allclose(
+        scores, np.take_along_axis(cosine, expected, axis=1), rtol=1e-5
+    )
+
+
+def test_search_returns_documents_best_first(tmp_path):
+    corpus = documents(["aaaa", "bbbb", "aabb"])
+    encoder = LetterEncoder()
+    index = EmbeddingIndex.build(corpus, encoder, tmp_path / "index", "letters")
+    hits = index.search("aab", encoder, k=2)
+    assert [doc.id for doc, _ in hits] == ["doc2", "doc0"]
+    assert hits[0][1] >= hits[1][1]
+    assert len(index.search("a", encoder, k=10)) == len(corpus)
+
+
+def test_index_is_embedded_once_per_corpus(tmp_path):
+    corpus = documents(["alpha", "beta"])
+    encoder = LetterEncoder()
+    first = load_or_build_embedding_index(corpus, encoder, "letters", tmp_path)
+    again = load_or_build_embedding_index(corpus, encoder, "letters", tmp_path)
+    assert encoder.batches == [["alpha", "beta"]]
+    assert again.directory == first.directory
+    assert [d.id for d in again.documents] == ["doc0", "doc1"]
+
+    changed = documents(["alpha", "gamma"])
+    assert corpus_key(changed, "letters") != corpus_key(corpus, "letters")
+    assert corpus_key(corpus, "other") != corpus_key(corpus, "letters")
+    load_or_build_embedding_index(changed, encoder, "letters", tmp_path)
+    assert encoder.batches[-1] == ["alpha", "gamma"]
+
+
+def test_empty_corpus(tmp_path):
+    index = EmbeddingIndex.build([], LetterEncoder(), tmp_path / "index", "letters")
+    assert len(index) == 0
+    ids, scores = index.search_vectors(np.ones(26), k=3)
+    assert ids.shape == scores.shape == (1, 0)
@@ -0,0 +1,87 @@
+"""Brute-force property tests for sliding-window sequence statistics."""
+
+import io
+import math
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.core import kmer_label, pack_fasta
+from genome_explorer.core.seqstats import chromosome_window_stats, genome_window_stats
+
+
+def brute_window(sequence: str):
+    bases = sequence.upper()
+    counts = Counter(base for base in bases if base in "ACGT")
+    called = sum(counts.values())
+    c, g = counts["C"], counts["G"]
+    cpg = sum(bases[i : i + 2] == "CG" for i in range(len(bases) - 1))
+    nan = float("nan")
+    entropy = (
+        -sum(n / called * math.log2(n / called) for n in counts.values() if n)
+        if called
+        else nan
+    )
+    return {
+        "gc": (c + g) / called if called else nan,
+        "gc_skew": (g - c) / (g + c) if g + c else nan,
+        "cpg_oe": cpg * called / (c * g) if c * g else nan,
+        "entropy": entropy,
+        "n_fraction": 1 - called / max(len(bases), 1),
+    }
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+    sequence=st.text("ACGTNacgtn", min_size=1, max_size=400),
+    window=st.integers(1, 60),
+    step=st.integers(1, 60),
+    k=st.integers(1, 5),
+    chunk_size=st.integers(1, 200),
+)
+def test_window_stats_match_brute_force(sequence, window, step, k, chunk_size):
+    with tempfile.TemporaryDirectory() as directory:
+        genome = pack_fasta(
+            io.BytesIO(f">chr1\n{sequence}\n".encode()), "g", Path(directory)
+        )
+        stats = chromosome_window_stats(
+            str(genome.directory), "chr1", window, step, k, chunk_size=chunk_size
+        )
+
+    starts = list(range(0, len(sequence), step))
+    assert stats.starts.tolist() == starts
+    expected = [brute_window(sequence[s : s + window]) for s in starts]
+    for name in ("gc", "gc_skew", "cpg_oe", "entropy", "n_fraction"):
+        want = np.array([row[name] for row in expected])
+        assert np.allclose(getattr(stats, name), want, equal_nan=True), name
+
+    bases = sequence.upper()
+    kmers = Counter(
+        bases[i : i + k]
+        for i in range(len(bases) - k + 1)
+        if "N" not in bases[i : i + k]
+    )
+    spectrum = {
+        kmer_label(code, k): int(count)
+        for code, count in enumerate(stats.kmer_counts)
+        if count
+    }
+    assert spectrum == dict(kmers)
+
+
+def test_genome_window_stats_covers_every_chromosome(tmp_path):
+    rng = np.random.default_rng(2)
+    acgt = np.frombuffer(b"ACGT", dtype=np.uint8)
+    fasta = b"".join(
+        b">%s\n%s\n" % (name.encode(), acgt[rng.integers(0, 4, size=length)].tobytes())
+        for name, length in (("chr1", 5000), ("chr2", 1234))
+    )
+    genome = pack_fasta(io.BytesIO(fasta), "g", tmp_path)
+    stats = genome_window_stats(genome, window=1000, k=3, num_workers=1)
+    assert sorted(stats) == ["chr1", "chr2"]
+    assert len(stats["chr2"].gc) == 2
+    assert int(stats["chr1"].kmer_counts.sum()) == 5000 - 2
@@ -0,0 +1,83 @@
+"""Property tests for the memory-mapped 2-bit sequence store."""
+
+import io
+import tempfile
+from pathlib import Path
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from genome_explorer.core import pack_fasta, scan_fasta
+from genome_explorer.core.twobit import TwoBitGenome, TwoBitWriter
+
+contig_names = st.text("abcXYZ0123_.", min_size=1, max_size=8)
+sequences = st.text("ACGTNacgtn", max_size=300)
+genomes = st.dictionaries(contig_names, sequences, min_size=1, max_size=4)
+
+
+def to_fasta(contigs: dict[str, str], width: int) -> bytes:
+    lines = []
+    for name, sequence in contigs.items():
+        lines.append(f">{name}")
+        lines += [sequence[lo : lo + width] for lo in range(0, len(sequence), width)]
+    return ("\n".join(lines) + "\n").encode()
+
+
+@settings(max_examples=100, deadline=None)
+@given(
+    contigs=genomes,
+    width=st.integers(1, 80),
+    chunk_size=st.integers(1, 64),
+    data=st.data(),
+)
+def test_two_bit_round_trip(contigs, width, chunk_size, data):
+    fasta = to_fasta(contigs, width)
+    with tempfile.TemporaryDirectory() as directory:
+        genome = pack_fasta(
+            io.BytesIO(fasta), "g", Path(directory), chunk_size=chunk_size
+        )
+        assert genome.lengths == {name: len(seq) for name, seq in contigs.items()}
+        for name, sequence in contigs.items():
+            assert genome.fetch_sequence(name, 0, len(sequence)) == sequence
+            unmasked = genome.fetch(name, 0, len(sequence), soft_mask=False)
+            assert unmasked.tobytes().decode() == sequence.upper()
+
+            start = data.draw(st.integers(-5, len(sequence) + 5))
+            end = data.draw(st.integers(start, len(sequence) + 10))
+            expected = sequence[max(start, 0) : max(end, 0)]
+            assert genome.fetch_sequence(name, start, end) == expected
+
+        stats = genome.contig_stats()
+        assert [(s.name, s.gc_count, s.n_count) for s in stats] == [
+            (
+                name,
+                sum(base in "GCgc" for base in sequence),
+                sum(base in "Nn" for base in sequence),
+            )
+            for name, sequence in contigs.items()
+        ]
+
+
+def test_packed_and_scanned_stats_agree_on_whitespace(tmp_path):
+    fasta = b">chr1\nAC GT\t\r\nGG CC \n>chr2\n\tNNAA\n"
+    packed = pack_fasta(io.BytesIO(fasta), "g", tmp_path).contig_stats()
+    scanned = scan_fasta(io.BytesIO(fasta))
+    assert [(s.name, s.length, s.gc_count, s.n_count) for s in packed] == [
+        (s.name, s.length, s.gc_count, s.n_count) for s in scanned
+    ]
+    assert [s.length for s in scanned] == [8, 4]
+
+
+def test_duplicate_names_are_rejected(tmp_path):
+    writer = TwoBitWriter(tmp_path)
+    writer.begin("chr1")
+    writer.write(b"ACGT")
+    writer.begin("chr2")
+    writer.write(b"GG")
+    with pytest.raises(ValueError, match="Duplicate"):
+        writer.begin("chr1")
+    writer.close()
+    genome = TwoBitGenome(tmp_path)
+    assert genome.fetch_sequence("chr1", 0, 4) == "ACGT"
+    assert genome.fetch_sequence("chr2", 0, 2) == "GG"
@@ -0,0 +1,154 @@
+"""Tests for streaming VCFs into memory-mapped variant columns."""
+
+import gzip
+import io
+
+import numpy as np
+import pytest
+
+from genome_explorer.core import VariantTable, load_vcf, parse_vcf
+from genome_explorer.core.vcf import DELETION, INSERTION, OTHER, SNP
+
+HEADER = (
+    "##fileformat=VCFv4.2\n"
+    "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tsample\n"
+)
+RECORDS = [
+    "chr1\t10\t.\tA\tG\t50\tPASS\tDP=12;AF=0.5\tGT\t0/1",
+    "chr1\t20\trs1\tC\tA\t.\tq10\tAF=0.25,0.75;DP=7\tGT\t1/2",
+    "chr2\t5\t.\tAT\tA\t30.5\t.\tMQ=60\tGT\t0/1",
+    "chr2\t9\t.\tG\tGTT,GA\t12\tPASS\t.\tGT\t1/1",
+    "chr10\t1\t.\tT\t<DEL>\t99\tPASS\tDP=3\tGT\t0/1",
+    "chr1\t30\t.\tC\tT\t40\tPASS\tDP=1\tGT\t0/1",
+]
+VCF = (HEADER + "\n".join(RECORDS) + "\n").encode()
+
+
+def parse(data: bytes, directory, **kwargs) -> VariantTable:
+    return parse_vcf(io.BytesIO(data), directory / "table", **kwargs)
+
+
+def test_columns_hold_typed_records(tmp_path):
+    table = parse(VCF, tmp_path)
+    assert len(table) == len(RECORDS)
+    assert table.chromosomes == ["chr1", "chr2", "chr10"]
+    assert table.column("chrom").tolist() == [0, 0, 1, 1, 2, 0]
+    assert table.column("pos").tolist() == [10, 20, 5, 9, 1, 30]
+    assert table.column("pass").tolist() == [True, False, True, True, True, True]
+    assert table.column("n_alleles").tolist() == [1, 1, 1, 2, 1, 1]
+    assert table.column("type").tolist() == [
+        SNP,
+        SNP,
+        DELETION,
+        INSERTION,
+        OTHER,
+        SNP,
+    ]
+    assert [table.allele("ref", i) for i in range(len(table))] == [
+        "A",
+        "C",
+        "AT",
+        "G",
+        "T",
+        "C",
+    ]
+    assert table.allele("alt", 3) == "GTT,GA"
+
+
+def test_missing_values_are_nan(tmp_path):
+    table = parse(VCF, tmp_path)
+    qual = table.column("qual")
+    assert np.isnan(qual[1])
+    np.testing.assert_allclose(qual[[0, 2]], [50.0, 30.5])
+    np.testing.assert_allclose(
+        table.column("info_DP"), [12, 7, np.nan, np.nan, 3, 1], equal_nan=True
+    )
+    # Only the first value of a multi-allelic field is kept
+    np.testing.assert_allclose(
+        table.column("info_AF"),
+        [0.5, 0.25, np.nan, np.nan, np.nan, np.nan],
+        equal_nan=True,
+    )
+    with pytest.raises(KeyError, match="Unknown"):
+        table.column("info_XX")
+
+
+def test_small_batches_match_one_batch(tmp_path):
+    whole = parse(VCF, tmp_path / "whole")
+    batched = parse(VCF, tmp_path / "batched", batch_size=4)
+    for name in ("chrom", "pos", "type", "ref_data", "alt_offsets", "info_DP"):
+        np.testing.assert_array_equal(batched.column(name), whole.column(name))
+    assert batched.chromosomes == whole.chromosomes
+
+
+def test_gzip_and_bgzf_input(tmp_path):
+    plain = parse(VCF, tmp_path / "plain")
+    # BGZF is a series of gzip members
+    half = len(VCF) // 2
+    bgzf = gzip.compress(VCF[:half]) + gzip.compress(VCF[half:])
+    for name, data in (("gzip", gzip.compress(VCF)), ("bgzf", bgzf)):
+        table = parse(data, tmp_path / name)
+        np.testing.assert_array_equal(table.column("pos"), plain.column("pos"))
+        assert table.allele("alt", 3) == "GTT,GA"
+
+
+def test_missing_chrom_header_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="#CHROM"):
+        parse(b"##fileformat=VCFv4.2\nchr1\t1\t.\tA\tG\t1\tPASS\t.\n", tmp_path)
+
+
+def test_mask_and_summary(tmp_path):
+    table = parse(VCF, tmp_path)
+    assert table.mask(chromosome="chr1").tolist() == [
+        True,
+        True,
+        False,
+        False,
+        False,
+        True,
+    ]
+    assert not table.mask(chromosome="chrX").any()
+    # Missing QUAL fails any threshold
+    assert table.mask(min_quality=35).tolist() == [
+        True,
+        False,
+        False,
+        False,
+        True,
+        True,
+    ]
+    assert table.mask(pass_only=True, variant_type=SNP).tolist() == [
+        True,
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+    # A>G and C>T are transitions, C>A is a transversion
+    assert table.transition_mask().tolist() == [
+        True,
+        False,
+        False,
+        False,
+        False,
+        True,
+    ]
+
+    summary = table.summary()
+    assert summary["total_variants"] == len(RECORDS)
+    assert summary["by_chromosome"] == {"chr1": 3, "chr2": 2, "chr10": 1}
+    transitions = table.transition_mask()
+    assert summary["by_type"]["SNP"] == np.count_nonzero(table.column("type") == SNP)
+    # C>A is the only transversion
+    assert summary["ts_tv_ratio"] == transitions.sum()
+    assert summary["mean_quality"] == pytest.approx((50 + 30.5 + 12 + 99 + 40) / 5)
+    assert table.summary(table.mask(chromosome="chr2"))["ts_tv_ratio"] is None
+
+
+def test_load_vcf_parses_once(tmp_path):
+    first = load_vcf(io.BytesIO(VCF), "calls", cache_dir=tmp_path)
+    # A cached table is opened without reading the stream
+    cached = load_vcf(io.BytesIO(b""), "calls", cache_dir=tmp_path)
+    assert cached.directory == first.directory
+    assert len(cached) == len(RECORDS)